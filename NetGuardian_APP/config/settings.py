@@ -29,6 +29,10 @@ class Config:
     LOCAL_STORAGE_PATH = os.getenv('LOCAL_STORAGE_PATH', './local_files')
     CLOUD_STORAGE_ENABLED = os.getenv('CLOUD_STORAGE_ENABLED', 'true').lower() == 'true'
     MAX_FILE_SIZE_MB = int(os.getenv('MAX_FILE_SIZE_MB', '100'))
+    # Files uploaded in parallel by a batch (folder / multi-select) upload
+    UPLOAD_CONCURRENCY = int(os.getenv('UPLOAD_CONCURRENCY', '4'))
+    # Batch bulk unlinks through io_uring (Linux only, requires the liburing package)
+    USE_IO_URING = os.getenv('USE_IO_URING', 'false').lower() == 'true'
 
     # CRDT / sync folder settings
     # Default to server sync folder at /opt/crdt-cluster/sync_folder (can be overridden via CRDT_SYNC_FOLDER env)
@@ -49,6 +53,23 @@ class Config:
     CRDT_SFTP_REMOTE_PATH = os.getenv('CRDT_SFTP_REMOTE_PATH', CRDT_SYNC_FOLDER)
     # SFTP connection tuning
     CRDT_SFTP_TIMEOUT = int(os.getenv('CRDT_SFTP_TIMEOUT', '30'))  # seconds
+    # Negotiate zlib compression on the SSH link (helps on slow links with compressible files)
+    CRDT_SFTP_COMPRESSION = os.getenv('CRDT_SFTP_COMPRESSION', 'false').lower() == 'true'
+    # Idle SFTP connections kept open per FileHandler and reused between operations
+    CRDT_SFTP_POOL_SIZE = int(os.getenv('CRDT_SFTP_POOL_SIZE', '4'))
+    # Parallel transfers for batch fetches (each worker uses its own SFTP connection)
+    CRDT_SFTP_CONCURRENCY = int(os.getenv('CRDT_SFTP_CONCURRENCY', '4'))
+    # Batch removals above this size use remote 'rm -f' commands instead of one SFTP remove per file
+    CRDT_SFTP_BULK_THRESHOLD = int(os.getenv('CRDT_SFTP_BULK_THRESHOLD', '32'))
+    # List subfolders of the remote CRDT folder concurrently (one SFTP channel per subfolder)
+    CRDT_PARALLEL_LIST = os.getenv('CRDT_PARALLEL_LIST', 'true').lower() == 'true'
+
+    # Defer and coalesce CRDT snapshot upserts for up to this many ms (0 = write each immediately).
+    # Events are always written immediately; a crash can only leave the snapshot behind them
+    CRDT_SNAPSHOT_FLUSH_MS = int(os.getenv('CRDT_SNAPSHOT_FLUSH_MS', '0'))
+    # Hash partitions for the internal crdt_events/crdt_snapshots tables (0 = unpartitioned).
+    # Only applies when the tables are first created
+    CRDT_TABLE_PARTITIONS = int(os.getenv('CRDT_TABLE_PARTITIONS', '0'))
 
     # Per-group CRDT SFTP ports (override per environment)
     # Example: set CRDT_SFTP_PORT_PORTO=51230 and CRDT_SFTP_PORT_LISBOA=51234 in the environment
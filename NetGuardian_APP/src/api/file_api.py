@@ -1,8 +1,14 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+import io
 import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Optional
-import io
 import tempfile
 
 # Robust import for DatabaseManager: support running as package or standalone
@@ -39,6 +45,16 @@ SFTP_PASSWORD = os.getenv('CRDT_SYNC_SFTP_PASSWORD', '')
 SFTP_KEY_PATH = os.getenv('CRDT_SYNC_SFTP_KEY_PATH', '')  # optional private key file
 SFTP_REMOTE_PATH = os.getenv('CRDT_SYNC_SFTP_REMOTE_PATH', SYNC_FOLDER)
 
+# Authenticated SFTP connections kept per (host, port) and reused across requests
+SFTP_POOL_SIZE = int(os.getenv('CRDT_SYNC_SFTP_POOL_SIZE', '4'))
+# Idle pooled connections older than this (seconds) are closed instead of reused
+SFTP_POOL_TTL = int(os.getenv('CRDT_SYNC_SFTP_POOL_TTL', '300'))
+# SSH keepalive interval (seconds) so idle pooled connections are not dropped by NAT/firewalls
+SFTP_KEEPALIVE = int(os.getenv('CRDT_SYNC_SFTP_KEEPALIVE', '30'))
+
+# Buffer size for streaming upload bodies to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
 # Per-region node overrides (useful for Porto/Lisbon)
 NODE_PORTO_HOST = os.getenv('NODE_PORTO_HOST', SFTP_HOST)
 NODE_PORTO_PORT = int(os.getenv('NODE_PORTO_PORT', '51230'))
@@ -47,6 +63,12 @@ NODE_LISBON_PORT = int(os.getenv('NODE_LISBON_PORT', '51231'))
 
 router = APIRouter()
 
+# (host, port) -> idle connections as (transport, sftp, idle_since); guarded by the lock
+_SFTP_POOL = {}
+_SFTP_POOL_LOCK = threading.Lock()
+# (host, port, remote dir) already known to exist, so uploads skip the mkdir probing
+_SFTP_DIRS_OK = set()
+
 
 def _get_port_from_session(session_token: Optional[str]) -> Optional[int]:
     """Query DB using session_token to determine user's group/region and map to port."""
@@ -109,51 +131,156 @@ def _sftp_client(host: str, port: int):
     return transport, sftp
 
 
-@router.post("/upload/")
-async def upload_file(file: UploadFile = File(...), x_client_region: Optional[str] = Header(None), x_session_token: Optional[str] = Header(None)):
+def _close_sftp(transport, sftp):
+    """Close an SFTP client and its transport, ignoring errors."""
     try:
-        content = await file.read()
+        sftp.close()
+    except Exception:
+        pass
+    try:
+        transport.close()
+    except Exception:
+        pass
 
-        if SYNC_MODE == 'sftp':
-            host, port = _select_node_for_region(x_client_region, x_session_token)
+
+def _ensure_remote_dir(sftp, host: str, port: int, remote_dir: str):
+    """Create remote_dir (mkdir -p) unless it is already known to exist on host:port."""
+    key = (host, port, remote_dir)
+    if key in _SFTP_DIRS_OK:
+        return
+    try:
+        sftp.stat(remote_dir)
+    except IOError:
+        # attempt to create directories recursively
+        parts = remote_dir.strip('/').split('/')
+        cur = ''
+        for p in parts:
+            cur = cur + '/' + p
+            try:
+                sftp.mkdir(cur)
+            except Exception:
+                pass
+    _SFTP_DIRS_OK.add(key)
+
+
+@contextmanager
+def sftp_conn(host: str, port: int):
+    """
+    Yield an SFTP client for host:port from the connection pool.
+
+    An idle pooled connection is reused when its transport is alive, it has not
+    exceeded SFTP_POOL_TTL and it answers a cheap probe; otherwise a new one is
+    opened. The connection returns to the pool afterwards unless its transport died.
+    """
+    key = (host, port)
+    conn = None
+    while conn is None:
+        with _SFTP_POOL_LOCK:
+            idle = _SFTP_POOL.get(key)
+            candidate = idle.pop() if idle else None
+        if candidate is None:
             transport, sftp = _sftp_client(host, port)
+            transport.set_keepalive(SFTP_KEEPALIVE)
+            conn = (transport, sftp)
+            break
+        transport, sftp, idle_since = candidate
+        if transport.is_active() and time.monotonic() - idle_since < SFTP_POOL_TTL:
             try:
-                # Ensure remote directory exists (try to create, ignore errors)
-                try:
-                    sftp.chdir(SFTP_REMOTE_PATH)
-                except IOError:
-                    # attempt to create directories recursively
-                    parts = SFTP_REMOTE_PATH.strip('/').split('/')
-                    cur = ''
-                    for p in parts:
-                        cur = cur + '/' + p
-                        try:
-                            sftp.mkdir(cur)
-                        except Exception:
-                            pass
-                    sftp.chdir(SFTP_REMOTE_PATH)
-
-                remote_path = os.path.join(SFTP_REMOTE_PATH, file.filename)
-                # Use putfo with BytesIO
-                bio = io.BytesIO(content)
-                sftp.putfo(bio, remote_path)
-            finally:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
-                try:
-                    transport.close()
-                except Exception:
-                    pass
+                sftp.normalize('.')
+                conn = (transport, sftp)
+                break
+            except Exception:
+                pass
+        _close_sftp(transport, sftp)
 
+    transport, sftp = conn
+    try:
+        yield sftp
+    finally:
+        # Failed operations (e.g. missing file) leave the session usable; a dead transport does not
+        if transport.is_active():
+            with _SFTP_POOL_LOCK:
+                idle = _SFTP_POOL.setdefault(key, [])
+                if len(idle) < SFTP_POOL_SIZE:
+                    idle.append((transport, sftp, time.monotonic()))
+                    conn = None
+        if conn is not None:
+            _close_sftp(transport, sftp)
+
+
+def _copy_upload_to(src, dst_path: str):
+    """
+    Write an upload body to dst_path, letting the kernel move the bytes when it can.
+
+    Bodies that Starlette spooled to a real temporary file are copied with
+    copy_file_range (or sendfile) from the current position without passing
+    through Python; small in-memory bodies fall back to a buffered copy.
+    """
+    with open(dst_path, "wb") as out:
+        if isinstance(src, tempfile.SpooledTemporaryFile):
+            # SpooledTemporaryFile.fileno() would force an in-memory body to disk, so
+            # only take the kernel path once it has rolled over. CPython keeps the
+            # buffer in the private _file attribute: a BytesIO until rollover, a real
+            # temporary file after; if it is missing, assume still in memory.
+            on_disk = not isinstance(getattr(src, '_file', None), (io.BytesIO, type(None)))
         else:
-            # local filesystem mode
-            os.makedirs(SYNC_FOLDER, exist_ok=True)
-            file_location = os.path.join(SYNC_FOLDER, file.filename)
-            with open(file_location, "wb") as f:
-                f.write(content)
+            on_disk = hasattr(src, 'fileno')
+        if on_disk:
+            start = None
+            try:
+                src.flush()
+                in_fd = src.fileno()
+                start = offset = src.tell()
+                remaining = os.fstat(in_fd).st_size - offset
+                while remaining > 0:
+                    if hasattr(os, 'copy_file_range'):
+                        sent = os.copy_file_range(in_fd, out.fileno(), remaining, offset_src=offset)
+                    else:
+                        sent = os.sendfile(out.fileno(), in_fd, offset, remaining)
+                    if not sent:
+                        break
+                    offset += sent
+                    remaining -= sent
+                src.seek(offset)
+                return
+            except (OSError, AttributeError, ValueError, io.UnsupportedOperation):
+                # Not a regular file or unsupported here: redo it in user space
+                out.seek(0)
+                out.truncate()
+                if start is not None:
+                    src.seek(start)
+        shutil.copyfileobj(src, out, COPY_BUFFER_SIZE)
+
+
+def _store_upload(file: UploadFile, region: Optional[str], session_token: Optional[str]):
+    """Copy an upload body to the sync folder (local or SFTP) without loading it into memory."""
+    # file.file is the spooled temporary file behind the request body; it is read incrementally
+    if SYNC_MODE == 'sftp':
+        host, port = _select_node_for_region(region, session_token)
+        with sftp_conn(host, port) as sftp:
+            # Ensure remote directory exists (checked once per node, then cached)
+            _ensure_remote_dir(sftp, host, port, SFTP_REMOTE_PATH)
+
+            remote_path = os.path.join(SFTP_REMOTE_PATH, file.filename)
+            try:
+                sftp.putfo(file.file, remote_path)
+            except IOError:
+                # The directory may have been removed meanwhile: re-check on the next upload
+                _SFTP_DIRS_OK.discard((host, port, SFTP_REMOTE_PATH))
+                raise
+
+    else:
+        # local filesystem mode
+        os.makedirs(SYNC_FOLDER, exist_ok=True)
+        file_location = os.path.join(SYNC_FOLDER, file.filename)
+        _copy_upload_to(file.file, file_location)
+
 
+@router.post("/upload/")
+async def upload_file(file: UploadFile = File(...), x_client_region: Optional[str] = Header(None), x_session_token: Optional[str] = Header(None)):
+    try:
+        # Blocking file/SFTP I/O runs in the threadpool so the event loop keeps serving requests
+        await run_in_threadpool(_store_upload, file, x_client_region, x_session_token)
         return {"filename": file.filename}
 
     except Exception as e:
@@ -165,19 +292,8 @@ def list_files(x_client_region: Optional[str] = Header(None), x_session_token: O
     try:
         if SYNC_MODE == 'sftp':
             host, port = _select_node_for_region(x_client_region, x_session_token)
-            transport, sftp = _sftp_client(host, port)
-            try:
-                files = sftp.listdir(SFTP_REMOTE_PATH)
-                return files
-            finally:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
-                try:
-                    transport.close()
-                except Exception:
-                    pass
+            with sftp_conn(host, port) as sftp:
+                return sftp.listdir(SFTP_REMOTE_PATH)
         else:
             return os.listdir(SYNC_FOLDER)
     except Exception as e:
@@ -189,26 +305,18 @@ def download_file(filename: str, x_client_region: Optional[str] = Header(None),
     try:
         if SYNC_MODE == 'sftp':
             host, port = _select_node_for_region(x_client_region, x_session_token)
-            transport, sftp = _sftp_client(host, port)
-            try:
+            with sftp_conn(host, port) as sftp:
                 remote_path = os.path.join(SFTP_REMOTE_PATH, filename)
-                # Download to temporary file and return
-                tmp = tempfile.NamedTemporaryFile(delete=False)
-                try:
-                    sftp.get(remote_path, tmp.name)
-                    return FileResponse(tmp.name, filename=filename)
-                finally:
-                    # do not delete tmp immediately; OS will clean up later
-                    pass
-            finally:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
-                try:
-                    transport.close()
-                except Exception:
-                    pass
+                # Download to temporary file (pipelined reads), removed once the response is sent
+                with tempfile.NamedTemporaryFile(delete=False) as tmp:
+                    try:
+                        sftp.getfo(remote_path, tmp)
+                    except Exception:
+                        tmp.close()
+                        os.remove(tmp.name)
+                        raise
+            return FileResponse(tmp.name, filename=filename,
+                                background=BackgroundTask(os.remove, tmp.name))
 
         else:
             file_path = os.path.join(SYNC_FOLDER, filename)
@@ -5,11 +5,17 @@ Manages CRDT states for distributed file operations with automatic conflict reso
 Coordinates between event store, vector clocks, and LWW registers.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+from collections import OrderedDict
+from itertools import groupby
 from datetime import datetime
 import uuid
+import hashlib
 import logging
 import json
+import time
+import atexit
+import weakref
 
 from .vector_clock import VectorClock
 from .lww_register import LWWRegister
@@ -17,6 +23,39 @@ from .event_store import EventStore, Event
 
 logger = logging.getLogger(__name__)
 
+# Default number of LWW registers kept in memory per CRDTManager
+DEFAULT_REGISTER_CACHE_SIZE = 10000
+# With write-behind snapshots, pending ones are flushed once this many entities are dirty
+SNAPSHOT_FLUSH_BATCH = 64
+
+
+class _RegisterCache(OrderedDict):
+    """
+    Bounded LRU mapping of entity_id -> LWWRegister.
+    
+    Reads and writes mark an entry as most recently used; inserting beyond
+    maxsize evicts the least recently used entry and hands it to on_evict.
+    """
+    
+    def __init__(self, maxsize: int,
+                 on_evict: Optional[Callable[[str, LWWRegister], None]] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+    
+    def __getitem__(self, key: str) -> LWWRegister:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key: str, value: LWWRegister) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            old_key, old_value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+
 
 class CRDTManager:
     """
@@ -31,20 +70,37 @@ class CRDTManager:
     Attributes:
         node_id: Unique identifier for this node/device
         event_store: EventStore instance for persistence
-        registers: Cache of active LWW registers by entity_id
+        registers: Bounded LRU cache of active LWW registers by entity_id
     """
     
-    def __init__(self, db_manager, node_id: Optional[str] = None):
+    def __init__(self, db_manager, node_id: Optional[str] = None,
+                 cache_size: int = DEFAULT_REGISTER_CACHE_SIZE,
+                 snapshot_flush_interval: float = 0.0):
         """
         Initialize CRDT Manager.
         
         Args:
             db_manager: Database manager instance
             node_id: Optional node ID (generated if not provided)
+            cache_size: Maximum number of registers kept in memory (LRU)
+            snapshot_flush_interval: Seconds snapshot writes may be deferred and
+                coalesced per entity (0 writes each snapshot immediately)
         """
         self.node_id = node_id or self._generate_node_id()
         self.event_store = EventStore(db_manager)
-        self.registers: Dict[str, LWWRegister] = {}
+        self.registers: Dict[str, LWWRegister] = _RegisterCache(cache_size, self._on_register_evicted)
+        # Entities whose in-memory register changed after its last saved snapshot
+        self._dirty: set = set()
+        self.snapshot_flush_interval = snapshot_flush_interval
+        # Monotonic time of the oldest deferred snapshot (None when nothing is pending)
+        self._pending_since: Optional[float] = None
+        # Memoized state_root() as (snapshot fingerprint, root); cleared whenever a
+        # register changes here, and ignored once the snapshots change elsewhere
+        self._state_root: Optional[Tuple[Tuple[int, int], bytes]] = None
+        if snapshot_flush_interval > 0:
+            # Write out deferred snapshots on interpreter exit without keeping self alive
+            manager_ref = weakref.ref(self)
+            atexit.register(lambda: manager_ref() is not None and manager_ref().flush_snapshots())
         self.db = db_manager
         logger.info(f"CRDTManager initialized with node_id: {self.node_id}")
     
@@ -69,7 +125,7 @@ class CRDTManager:
         try:
             # Create LWW register for this file
             register = LWWRegister(self.node_id, value=metadata)
-            self.registers[file_id] = register
+            self._put_register(file_id, register)
             
             # Create event
             event = Event(
@@ -88,7 +144,7 @@ class CRDTManager:
             
             if success:
                 # Save current state
-                self._save_current_state(file_id, register)
+                self._queue_snapshot(file_id, register)
                 logger.info(f"Created file state for {file_id}")
             
             return success
@@ -118,18 +174,19 @@ class CRDTManager:
             
             # Merge updates with existing metadata
             current_value = register.get() or {}
-            new_value = {**current_value, **updates}
+            new_value = current_value | updates
             
             # Update register
             register.set(new_value)
-            self.registers[file_id] = register
+            self._put_register(file_id, register)
             
-            # Create event
+            # Create event: full_state already carries the updated values (it is
+            # what peers merge), so only the names of the changed fields are kept
             event = Event(
                 entity_id=file_id,
                 event_type='file_updated',
                 data={
-                    'updates': updates,
+                    'updated_fields': list(updates),
                     'full_state': new_value,
                     'operation': 'update'
                 },
@@ -141,7 +198,7 @@ class CRDTManager:
             success = self.event_store.append_event(event)
             
             if success:
-                self._save_current_state(file_id, register)
+                self._queue_snapshot(file_id, register)
                 logger.info(f"Updated file state for {file_id}")
             
             return success
@@ -173,7 +230,7 @@ class CRDTManager:
             current_value['deleted_at'] = datetime.utcnow().isoformat()
             
             register.set(current_value)
-            self.registers[file_id] = register
+            self._put_register(file_id, register)
             
             # Create event
             event = Event(
@@ -190,7 +247,7 @@ class CRDTManager:
             success = self.event_store.append_event(event)
             
             if success:
-                self._save_current_state(file_id, register)
+                self._queue_snapshot(file_id, register)
                 logger.info(f"Deleted file state for {file_id}")
             
             return success
@@ -234,36 +291,57 @@ class CRDTManager:
         merged_count = 0
         
         try:
+            # Load all snapshots the batch needs up front; entities without one
+            # are still rebuilt from their events below
+            no_snapshot = self._prefetch_registers([event.entity_id for event in remote_events])
+            
+            # Group the batch by entity (in order of first appearance) so each
+            # entity's writes are merged into its register in one pass
+            by_entity: Dict[str, List[Event]] = {}
             for event in remote_events:
+                by_entity.setdefault(event.entity_id, []).append(event)
+            
+            # First pass: merge the events into the in-memory registers; each
+            # entity keeps one pending snapshot (its final state)
+            touched: Dict[str, LWWRegister] = {}
+            for entity_id, events in by_entity.items():
                 # Load local register
-                local_register = self._get_or_load_register(event.entity_id)
-                
-                # Create remote register from event
-                remote_register = LWWRegister(
-                    node_id=event.node_id,
-                    value=event.data.get('full_state') or event.data.get('metadata'),
-                    timestamp=event.timestamp,
-                    vector_clock=VectorClock.from_dict({
-                        'node_id': event.node_id,
-                        'clock': event.vector_clock
-                    })
+                local_register = self._get_or_load_register(
+                    entity_id, skip_snapshot=entity_id in no_snapshot
                 )
                 
+                writes = [
+                    (event.data.get('full_state') or event.data.get('metadata'),
+                     event.timestamp, event.node_id, event.vector_clock)
+                    for event in events
+                ]
+                
                 if local_register is None:
-                    # New file from remote
-                    self.registers[event.entity_id] = remote_register
-                    self.event_store.append_event(event)
-                    self._save_current_state(event.entity_id, remote_register)
-                    merged_count += 1
-                else:
-                    # Merge with existing
-                    local_register.merge(remote_register)
-                    self.registers[event.entity_id] = local_register
-                    self.event_store.append_event(event)
-                    self._save_current_state(event.entity_id, local_register)
-                    merged_count += 1
+                    # New file from remote: start from its first write
+                    value, timestamp, node_id, clock = writes[0]
+                    local_register = LWWRegister(
+                        node_id=node_id,
+                        value=value,
+                        timestamp=timestamp,
+                        vector_clock=VectorClock(node_id, clock)
+                    )
+                    writes = writes[1:]
                 
-                logger.debug(f"Merged event for {event.entity_id}")
+                # Merge with existing
+                local_register.merge_many(writes)
+                self._put_register(entity_id, local_register)
+                touched[entity_id] = local_register
+                merged_count += len(events)
+                
+                logger.debug("Merged %d events for %s", len(events), entity_id)
+            
+            # Second pass: persist the events and final states with a single commit
+            saved = self.event_store.append_events_with_snapshots(remote_events, [
+                (entity_id, register.get(), register.vector_clock.clock)
+                for entity_id, register in touched.items()
+            ])
+            if saved:
+                self._dirty.difference_update(touched)
             
             logger.info(f"Synced {merged_count} events from remote")
             return merged_count
@@ -272,17 +350,76 @@ class CRDTManager:
             logger.error(f"Failed to sync from remote: {e}", exc_info=True)
             return merged_count
     
-    def get_changes_since(self, since: datetime) -> List[Event]:
+    def get_changes_since(self, since: datetime, since_id: Optional[str] = None,
+                          limit: int = 1000) -> List[Event]:
         """
         Get all changes since a given timestamp (for sync).
         
         Args:
             since: Timestamp to get changes after
+            since_id: Optional event_id of the last event already seen at
+                ``since`` (keyset cursor for fetching the next page)
+            limit: Maximum number of events per page
             
         Returns:
-            List of events
+            List of events ordered by (timestamp, event_id)
         """
-        return self.event_store.get_all_events(since=since)
+        return self.event_store.get_all_events(since=since, limit=limit, since_id=since_id)
+    
+    def current_vc(self) -> Dict[str, datetime]:
+        """
+        Get this node's version vector for delta sync.
+        
+        Returns:
+            Dict of origin node_id -> timestamp of its newest stored event
+        """
+        return self.event_store.get_version_vector()
+    
+    def get_changes_for(self, peer_vc: Dict[str, datetime]) -> List[Event]:
+        """
+        Get only the events a peer is missing (delta sync).
+        
+        Args:
+            peer_vc: The peer's version vector (see current_vc)
+            
+        Returns:
+            List of events ordered by (timestamp, event_id)
+        """
+        return self.event_store.get_events_after_vector(peer_vc)
+    
+    def state_root(self) -> bytes:
+        """
+        Get a digest of the visible state of every entity.
+        
+        SHA-256 over each entity's id and canonical JSON state, fed in entity_id
+        byte order, so two nodes whose states have converged get the same root
+        and can skip a sync by comparing 32 bytes. Memoized while the snapshots'
+        server-side fingerprint is unchanged, so writes made through any path or
+        by another manager on the same database are picked up.
+        
+        Returns:
+            32-byte SHA-256 digest
+        """
+        # The digest is computed from the snapshots, so write out deferred ones first
+        flushed = self.flush_snapshots() if self._dirty else True
+        
+        fingerprint = self.event_store.snapshot_fingerprint()
+        if (fingerprint is not None and self._state_root is not None
+                and self._state_root[0] == fingerprint):
+            return self._state_root[1]
+        
+        digest = hashlib.sha256()
+        for entity_id, state in self.event_store.iter_snapshot_states():
+            digest.update(entity_id.encode())
+            digest.update(b'\0')
+            digest.update(json.dumps(state, sort_keys=True, separators=(',', ':'), default=str).encode())
+            digest.update(b'\n')
+        root = digest.digest()
+        
+        # Unsaved changes would make a cached root stale
+        if fingerprint is not None and flushed and not self._dirty:
+            self._state_root = (fingerprint, root)
+        return root
     
     def rebuild_state_from_events(self, file_id: str) -> Optional[LWWRegister]:
         """
@@ -295,79 +432,221 @@ class CRDTManager:
             Rebuilt LWWRegister or None
         """
         try:
-            events = self.event_store.get_events(file_id)
-            
-            if not events:
+            replayed = self._replay_events(self.event_store.iter_events(file_id))
+            if replayed is None:
                 return None
             
-            # Start with first event
-            first_event = events[0]
-            register = LWWRegister(
-                node_id=first_event.node_id,
-                value=first_event.data.get('metadata') or first_event.data.get('full_state'),
-                timestamp=first_event.timestamp,
-                vector_clock=VectorClock.from_dict({
-                    'node_id': first_event.node_id,
-                    'clock': first_event.vector_clock
-                })
-            )
-            
-            # Replay remaining events
-            for event in events[1:]:
-                remote_register = LWWRegister(
-                    node_id=event.node_id,
-                    value=event.data.get('full_state') or event.data.get('updates'),
-                    timestamp=event.timestamp,
-                    vector_clock=VectorClock.from_dict({
-                        'node_id': event.node_id,
-                        'clock': event.vector_clock
-                    })
-                )
-                register.merge(remote_register)
-            
-            logger.info(f"Rebuilt state for {file_id} from {len(events)} events")
+            register, event_count = replayed
+            logger.debug("Rebuilt state for %s from %d events", file_id, event_count)
             return register
             
         except Exception as e:
             logger.error(f"Failed to rebuild state: {e}", exc_info=True)
             return None
     
-    def _get_or_load_register(self, file_id: str) -> Optional[LWWRegister]:
-        """Get register from cache or load from database."""
+    def prewarm(self, file_ids: List[str]) -> int:
+        """
+        Load the registers of many entities into the cache with bulk queries.
+        
+        Snapshots are fetched with one query; entities without one are rebuilt
+        from a single streamed query over all their events, instead of one
+        snapshot lookup and one event query per entity.
+        
+        Args:
+            file_ids: File identifiers to load
+            
+        Returns:
+            Number of registers loaded
+        """
+        try:
+            before = len(self.registers)
+            no_snapshot = self._prefetch_registers(file_ids)
+            loaded = len(self.registers) - before
+            
+            # Evicting a dirty register saves its snapshot: hold evictions until the
+            # event stream is exhausted so the loop does no writes, then save them
+            evicted: List[Tuple[str, LWWRegister]] = []
+            self.registers.on_evict = lambda file_id, register: evicted.append((file_id, register))
+            try:
+                events = self.event_store.iter_events_for(sorted(no_snapshot))
+                for file_id, group in groupby(events, key=lambda event: event.entity_id):
+                    replayed = self._replay_events(group)
+                    if replayed is not None:
+                        self._put_register(file_id, replayed[0], dirty=False)
+                        loaded += 1
+            finally:
+                self.registers.on_evict = self._on_register_evicted
+                for file_id, register in evicted:
+                    self._on_register_evicted(file_id, register)
+            
+            logger.info(f"Prewarmed {loaded} registers")
+            return loaded
+            
+        except Exception as e:
+            logger.error(f"Failed to prewarm registers: {e}", exc_info=True)
+            return 0
+    
+    def _replay_events(self, events: Iterator[Event]) -> Optional[Tuple[LWWRegister, int]]:
+        """
+        Replay an entity's events (ordered by timestamp) into a register.
+        
+        Returns:
+            (register, number of events replayed), or None if there were none
+        """
+        events = iter(events)
+        first_event = next(events, None)
+        if first_event is None:
+            return None
+        
+        # Replay as a single streaming pass over the events: the LWW winner is
+        # the first event with the greatest (timestamp, node_id) and the clock is
+        # the element-wise max, so no register or clock objects are built per
+        # event and the history is never held in memory at once
+        winner = first_event
+        winner_key = (first_event.timestamp, first_event.node_id)
+        clock = dict(first_event.vector_clock)
+        event_count = 1
+        for event in events:
+            event_count += 1
+            key = (event.timestamp, event.node_id)
+            if key > winner_key:
+                winner = event
+                winner_key = key
+            for node_id, value in event.vector_clock.items():
+                current = clock.get(node_id, 0)
+                clock[node_id] = value if value > current else current
+        
+        if winner is first_event:
+            value = first_event.data.get('metadata') or first_event.data.get('full_state')
+        else:
+            # 'updates' is only present in events written by older versions
+            value = winner.data.get('full_state') or winner.data.get('updates')
+        
+        register = LWWRegister(
+            node_id=winner.node_id,
+            value=value,
+            timestamp=winner.timestamp,
+            vector_clock=VectorClock(first_event.node_id, clock)
+        )
+        return register, event_count
+    
+    def _get_or_load_register(self, file_id: str,
+                              skip_snapshot: bool = False) -> Optional[LWWRegister]:
+        """Get register from cache or load from database (skip_snapshot: known to have none)."""
         # Check cache
         if file_id in self.registers:
             return self.registers[file_id]
         
         # Try to load from snapshot
-        snapshot = self.event_store.get_snapshot(file_id)
+        snapshot = None if skip_snapshot else self.event_store.get_snapshot(file_id)
         if snapshot:
             state, vector_clock_dict, _ = snapshot
-            register = LWWRegister(
-                node_id=self.node_id,
-                value=state,
-                vector_clock=VectorClock.from_dict({
-                    'node_id': self.node_id,
-                    'clock': vector_clock_dict
-                })
-            )
-            self.registers[file_id] = register
+            register = self._register_from_snapshot(state, vector_clock_dict)
+            self._put_register(file_id, register, dirty=False)
             return register
         
         # Rebuild from events
         register = self.rebuild_state_from_events(file_id)
         if register:
-            self.registers[file_id] = register
+            self._put_register(file_id, register, dirty=False)
         
         return register
     
+    def _register_from_snapshot(self, state: Dict[str, Any],
+                                vector_clock_dict: Dict[str, int]) -> LWWRegister:
+        """Build a register for this node from a stored snapshot."""
+        return LWWRegister(
+            node_id=self.node_id,
+            value=state,
+            vector_clock=VectorClock.from_dict({
+                'node_id': self.node_id,
+                'clock': vector_clock_dict
+            })
+        )
+    
+    def _prefetch_registers(self, entity_ids: List[str]) -> set:
+        """
+        Load the snapshots of uncached entities with one query instead of one per entity.
+        
+        Returns:
+            IDs of the entities that have no snapshot
+        """
+        missing = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id not in self.registers]
+        if not missing:
+            return set()
+        snapshots = self.event_store.get_snapshots(missing)
+        for entity_id, (state, vector_clock_dict, _) in snapshots.items():
+            self._put_register(entity_id, self._register_from_snapshot(state, vector_clock_dict), dirty=False)
+        return set(missing).difference(snapshots)
+    
+    def _put_register(self, file_id: str, register: LWWRegister, dirty: bool = True) -> None:
+        """Cache a register; dirty marks it as changed since its last snapshot."""
+        self.registers[file_id] = register
+        if dirty:
+            self._dirty.add(file_id)
+            self._state_root = None
+    
+    def _on_register_evicted(self, file_id: str, register: LWWRegister) -> None:
+        """Persist a register dropped from the cache if it has unsaved changes."""
+        if file_id in self._dirty:
+            self._save_current_state(file_id, register)
+            self._dirty.discard(file_id)
+    
+    def _queue_snapshot(self, file_id: str, register: LWWRegister) -> None:
+        """
+        Save a register's snapshot now, or defer it when write-behind is enabled.
+        
+        Deferred snapshots are coalesced per entity (only the latest state is
+        written) and flushed together once snapshot_flush_interval has passed
+        or SNAPSHOT_FLUSH_BATCH entities are pending, on the next write.
+        """
+        if self.snapshot_flush_interval <= 0:
+            self._save_current_state(file_id, register)
+            return
+        
+        # The register is already cached and marked dirty by _put_register
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        if (len(self._dirty) >= SNAPSHOT_FLUSH_BATCH
+                or now - self._pending_since >= self.snapshot_flush_interval):
+            self.flush_snapshots()
+    
+    def flush_snapshots(self) -> bool:
+        """
+        Write the snapshots of all dirty cached registers in one batched upsert.
+        
+        Returns:
+            True if successful (or nothing was pending)
+        """
+        pending = []
+        for file_id in list(self._dirty):
+            # dict.get: reading for a flush should not refresh the LRU order
+            register = dict.get(self.registers, file_id)
+            if register is not None:
+                pending.append((file_id, register.get(), register.vector_clock.clock))
+        self._pending_since = None
+        if not pending:
+            return True
+        
+        saved = self.event_store.save_snapshots(pending)
+        if saved:
+            self._dirty.difference_update(file_id for file_id, _, _ in pending)
+        else:
+            # Retry with the next write
+            self._pending_since = time.monotonic()
+        return saved
+    
     def _save_current_state(self, file_id: str, register: LWWRegister) -> None:
         """Save current state as snapshot."""
+        self._state_root = None
         try:
-            self.event_store.save_snapshot(
+            if self.event_store.save_snapshot(
                 entity_id=file_id,
                 state=register.get(),
                 vector_clock=register.vector_clock.clock
-            )
+            ):
+                self._dirty.discard(file_id)
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}")
     
@@ -5,15 +5,53 @@ Implements event sourcing pattern with PostgreSQL backend.
 Stores all state changes as immutable events for audit trail and recovery.
 """
 
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 from datetime import datetime
 import json
+import sys
 import uuid
 import logging
 
+try:
+    import orjson  # optional: faster (de)serialization of event payloads
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any, default=None) -> str:
+    """
+    Serialize obj to JSON text (orjson when available).
+    
+    Text rather than orjson's bytes: psycopg2 adapts bytes as bytea, not JSONB.
+    numpy arrays/scalars in payloads are serialized natively by orjson.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        except TypeError:
+            # Types orjson does not serialize (e.g. Decimal, ints > 64 bit): use the stdlib
+            pass
+    return json.dumps(obj, default=default)
+
+
+def _loads(value: Any) -> Any:
+    """
+    Decode a JSON column value.
+    
+    The columns are JSONB (older TEXT tables are migrated by initialize_database),
+    which psycopg2 returns already parsed; text is only decoded for rows read
+    through a connection without the JSONB typecaster.
+    """
+    if isinstance(value, (str, bytes)):
+        return orjson.loads(value) if orjson is not None else json.loads(value)
+    return value
+
+
 class Event:
     """
     Represents a single event in the event store.
@@ -45,12 +83,31 @@ class Event:
             timestamp: Optional timestamp (current time if not provided)
         """
         self.event_id = event_id or str(uuid.uuid4())
-        self.entity_id = entity_id
+        # Interned: the same few ids repeat across thousands of events and are
+        # used as register/clock dict keys, so one shared string object each
+        self.entity_id = sys.intern(entity_id)
         self.event_type = event_type
         self.data = data
         self.timestamp = timestamp or datetime.utcnow()
-        self.node_id = node_id
+        self.node_id = sys.intern(node_id)
         self.vector_clock = vector_clock
+        # Serialized forms, built on first use and reused by every write path
+        self._data_json: Optional[str] = None
+        self._vector_clock_json: Optional[str] = None
+    
+    @property
+    def data_json(self) -> str:
+        """Event payload as JSON text (computed once; events are not mutated after creation)."""
+        if self._data_json is None:
+            self._data_json = _dumps(self.data)
+        return self._data_json
+    
+    @property
+    def vector_clock_json(self) -> str:
+        """Vector clock as JSON text (computed once)."""
+        if self._vector_clock_json is None:
+            self._vector_clock_json = _dumps(self.vector_clock)
+        return self._vector_clock_json
     
     def to_dict(self) -> Dict:
         """Convert event to dictionary."""
@@ -66,7 +123,20 @@ class Event:
     
     def to_json(self) -> str:
         """Convert event to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return _dumps(self.to_dict(), default=str)
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'Event':
+        """Create event from a crdt_events row (vector clock node ids interned)."""
+        return cls(
+            event_id=row['event_id'],
+            entity_id=row['entity_id'],
+            event_type=sys.intern(row['event_type']),
+            data=_loads(row['data']),
+            timestamp=row['timestamp'],
+            node_id=row['node_id'],
+            vector_clock={sys.intern(node): count for node, count in _loads(row['vector_clock']).items()}
+        )
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Event':
@@ -96,6 +166,52 @@ class EventStore:
     - Query by entity, time range, or event type
     """
     
+    # Multi-row statements for the batched writers (rows fill the VALUES %s list).
+    # Event inserts skip duplicates without naming a conflict target, since the
+    # unique key is event_id, or (entity_id, event_id) on partitioned tables.
+    _INSERT_EVENTS_SQL = """
+    INSERT INTO crdt_events (
+        event_id, entity_id, event_type, data,
+        timestamp, node_id, vector_clock
+    ) VALUES %s
+    ON CONFLICT DO NOTHING
+    """
+    
+    # Batches at least this large are loaded with COPY through a staging table
+    COPY_THRESHOLD = 50
+    
+    _EVENT_COLUMNS = ['event_id', 'entity_id', 'event_type', 'data',
+                      'timestamp', 'node_id', 'vector_clock']
+    
+    # Session-local staging table for COPY; emptied at every commit
+    _CREATE_EVENTS_STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS crdt_events_stage (
+        event_id VARCHAR(255), entity_id VARCHAR(255), event_type VARCHAR(100),
+        data JSONB, timestamp TIMESTAMP, node_id VARCHAR(255), vector_clock JSONB
+    ) ON COMMIT DELETE ROWS
+    """
+    
+    _MERGE_EVENTS_STAGE_SQL = """
+    INSERT INTO crdt_events (
+        event_id, entity_id, event_type, data,
+        timestamp, node_id, vector_clock
+    )
+    SELECT event_id, entity_id, event_type, data,
+           timestamp, node_id, vector_clock
+    FROM crdt_events_stage
+    ON CONFLICT DO NOTHING
+    """
+    
+    _UPSERT_SNAPSHOTS_SQL = """
+    INSERT INTO crdt_snapshots (entity_id, state, vector_clock, created_at)
+    VALUES %s
+    ON CONFLICT (entity_id) 
+    DO UPDATE SET 
+        state = EXCLUDED.state,
+        vector_clock = EXCLUDED.vector_clock,
+        created_at = EXCLUDED.created_at
+    """
+    
     def __init__(self, db_manager):
         """
         Initialize event store.
@@ -104,8 +220,49 @@ class EventStore:
             db_manager: Database manager instance
         """
         self.db = db_manager
+        # Connection on which the append_event statement is prepared (per session)
+        self._prepared_conn = None
+        # Set when PREPARE is not available (e.g. behind a transaction-mode pooler)
+        self._prepare_unsupported = False
         logger.info("EventStore initialized")
     
+    # Server-side prepared INSERT for append_event, parsed and planned once per session
+    _PREPARE_APPEND_SQL = """
+    PREPARE crdt_insert_event (varchar, varchar, varchar, jsonb, timestamp, varchar, jsonb) AS
+    INSERT INTO crdt_events (
+        event_id, entity_id, event_type, data,
+        timestamp, node_id, vector_clock
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7)
+    """
+    
+    def _append_statement(self) -> str:
+        """Return the SQL for append_event, preparing it on the current connection if needed."""
+        if not self._prepare_unsupported:
+            if self.db.connection is None:
+                self.db.connect()
+            if self._prepared_conn is not self.db.connection:
+                try:
+                    # Another EventStore sharing this connection may have prepared it
+                    # already; check first so PREPARE is only issued when it can succeed
+                    # (a failing statement would roll back the session's open work)
+                    prepared = self.db.execute_query(
+                        "SELECT 1 FROM pg_prepared_statements WHERE name = 'crdt_insert_event'"
+                    )
+                    if not prepared:
+                        self.db.execute_query(self._PREPARE_APPEND_SQL)
+                    self._prepared_conn = self.db.connection
+                except Exception as e:
+                    logger.warning(f"Could not prepare append statement, using plain INSERT: {e}")
+                    self._prepare_unsupported = True
+            if self._prepared_conn is self.db.connection:
+                return "EXECUTE crdt_insert_event (%s, %s, %s, %s, %s, %s, %s)"
+        return """
+            INSERT INTO crdt_events (
+                event_id, entity_id, event_type, data, 
+                timestamp, node_id, vector_clock
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+    
     def append_event(self, event: Event) -> bool:
         """
         Append a new event to the store.
@@ -117,31 +274,78 @@ class EventStore:
             True if successful, False otherwise
         """
         try:
-            query = """
-            INSERT INTO crdt_events (
-                event_id, entity_id, event_type, data, 
-                timestamp, node_id, vector_clock
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
+            query = self._append_statement()
             
             params = (
                 event.event_id,
                 event.entity_id,
                 event.event_type,
-                json.dumps(event.data),
+                event.data_json,
                 event.timestamp,
                 event.node_id,
-                json.dumps(event.vector_clock)
+                event.vector_clock_json
             )
             
             self.db.execute_query(query, params)
-            logger.info(f"Appended event: {event}")
+            logger.debug("Appended event: %s", event)
             return True
             
         except Exception as e:
             logger.error(f"Failed to append event: {e}", exc_info=True)
             return False
     
+    def append_events(self, events: List[Event]) -> int:
+        """
+        Append many events in a single batched transaction.
+        
+        Events whose event_id is already stored (e.g. replayed by a remote
+        node) are skipped instead of failing the batch.
+        
+        Args:
+            events: Events to append
+            
+        Returns:
+            Number of events inserted (0 on failure)
+        """
+        if not events:
+            return 0
+        try:
+            with self.db.transaction():
+                inserted = self._insert_events(events)
+            logger.info(f"Appended {inserted} of {len(events)} events")
+            return inserted
+            
+        except Exception as e:
+            logger.error(f"Failed to append events: {e}", exc_info=True)
+            return 0
+    
+    def append_events_with_snapshots(self, events: List[Event],
+                                     snapshots: List[Tuple[str, Dict[str, Any], Dict[str, int]]]) -> bool:
+        """
+        Append events and save the resulting snapshots with a single commit.
+        
+        Both batches are submitted in one transaction, so the database flushes its
+        log once for the whole sync instead of once per statement, and a failure
+        leaves neither the events nor the snapshots half written.
+        
+        Args:
+            events: Events to append (already stored event_ids are skipped)
+            snapshots: (entity_id, state, vector_clock) tuples, last entry per entity wins
+            
+        Returns:
+            True if successful
+        """
+        try:
+            with self.db.transaction():
+                inserted = self._insert_events(events)
+                self.db.execute_batch_values(self._UPSERT_SNAPSHOTS_SQL, self._snapshot_rows(snapshots))
+            logger.info(f"Appended {inserted} of {len(events)} events and saved {len(snapshots)} snapshots")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to append events with snapshots: {e}", exc_info=True)
+            return False
+    
     def get_events(self, entity_id: str, 
                    since: Optional[datetime] = None,
                    limit: Optional[int] = None) -> List[Event]:
@@ -177,37 +381,95 @@ class EventStore:
             
             rows = self.db.execute_query(query, tuple(params))
             
-            events = []
-            for row in rows:
-                event = Event(
-                    event_id=row['event_id'],
-                    entity_id=row['entity_id'],
-                    event_type=row['event_type'],
-                    data=json.loads(row['data']) if isinstance(row['data'], str) else row['data'],
-                    timestamp=row['timestamp'],
-                    node_id=row['node_id'],
-                    vector_clock=json.loads(row['vector_clock']) if isinstance(row['vector_clock'], str) else row['vector_clock']
-                )
-                events.append(event)
-            
-            logger.debug(f"Retrieved {len(events)} events for entity {entity_id}")
+            events = [Event.from_row(row) for row in rows]
+            
+            logger.debug("Retrieved %d events for entity %s", len(events), entity_id)
             return events
             
         except Exception as e:
             logger.error(f"Failed to get events: {e}", exc_info=True)
             return []
     
+    def iter_events(self, entity_id: str,
+                    since: Optional[datetime] = None) -> Iterator[Event]:
+        """
+        Stream the events of an entity without materializing the whole history.
+        
+        Rows come from a server-side cursor in batches, so memory stays bounded
+        by the batch size however long the entity's log is.
+        
+        Args:
+            entity_id: Entity ID to query
+            since: Optional timestamp to get events after
+            
+        Yields:
+            Event objects ordered by timestamp
+            
+        Raises:
+            Exception: Database errors (raised while iterating)
+        """
+        query = """
+        SELECT event_id, entity_id, event_type, data,
+               timestamp, node_id, vector_clock
+        FROM crdt_events
+        WHERE entity_id = %s
+        """
+        params = [entity_id]
+        
+        if since:
+            query += " AND timestamp > %s"
+            params.append(since)
+        
+        query += " ORDER BY timestamp ASC"
+        
+        for row in self.db.execute_query_iter(query, tuple(params)):
+            yield Event.from_row(row)
+    
+    def iter_events_for(self, entity_ids: List[str]) -> Iterator[Event]:
+        """
+        Stream the events of several entities with one server-side cursor.
+        
+        Args:
+            entity_ids: Entity IDs to query
+            
+        Yields:
+            Event objects ordered by entity_id, then timestamp (so each
+            entity's events are contiguous)
+            
+        Raises:
+            Exception: Database errors (raised while iterating)
+        """
+        if not entity_ids:
+            return
+        query = """
+        SELECT event_id, entity_id, event_type, data,
+               timestamp, node_id, vector_clock
+        FROM crdt_events
+        WHERE entity_id = ANY(%s)
+        ORDER BY entity_id ASC, timestamp ASC
+        """
+        
+        for row in self.db.execute_query_iter(query, (list(entity_ids),)):
+            yield Event.from_row(row)
+    
     def get_all_events(self, since: Optional[datetime] = None,
-                       limit: Optional[int] = 1000) -> List[Event]:
+                       limit: Optional[int] = 1000,
+                       since_id: Optional[str] = None) -> List[Event]:
         """
         Get all events across all entities.
         
+        Pages with a keyset on (timestamp, event_id): pass the timestamp and
+        event_id of the last event of the previous page to continue after it,
+        without OFFSET and without skipping events that share a timestamp.
+        
         Args:
             since: Optional timestamp to get events after
             limit: Maximum number of events (default 1000)
+            since_id: Optional event_id of the last event already read at
+                ``since``; events at that timestamp with a greater id are included
             
         Returns:
-            List of Event objects ordered by timestamp
+            List of Event objects ordered by (timestamp, event_id)
         """
         try:
             query = """
@@ -217,35 +479,85 @@ class EventStore:
             """
             params = []
             
-            if since:
+            if since and since_id:
+                query += " WHERE (timestamp, event_id) > (%s, %s)"
+                params.extend((since, since_id))
+            elif since:
                 query += " WHERE timestamp > %s"
                 params.append(since)
             
-            query += " ORDER BY timestamp ASC LIMIT %s"
+            query += " ORDER BY timestamp ASC, event_id ASC LIMIT %s"
             params.append(limit)
             
             rows = self.db.execute_query(query, tuple(params) if params else None)
             
-            events = []
-            for row in rows:
-                event = Event(
-                    event_id=row['event_id'],
-                    entity_id=row['entity_id'],
-                    event_type=row['event_type'],
-                    data=json.loads(row['data']) if isinstance(row['data'], str) else row['data'],
-                    timestamp=row['timestamp'],
-                    node_id=row['node_id'],
-                    vector_clock=json.loads(row['vector_clock']) if isinstance(row['vector_clock'], str) else row['vector_clock']
-                )
-                events.append(event)
-            
-            logger.debug(f"Retrieved {len(events)} events")
+            events = [Event.from_row(row) for row in rows]
+            
+            logger.debug("Retrieved %d events", len(events))
             return events
             
         except Exception as e:
             logger.error(f"Failed to get all events: {e}", exc_info=True)
             return []
     
+    def get_version_vector(self) -> Dict[str, datetime]:
+        """
+        Get the latest event timestamp stored for each origin node.
+        
+        Returns:
+            Dict of node_id -> timestamp of that node's newest event
+        """
+        try:
+            rows = self.db.execute_query(
+                "SELECT node_id, MAX(timestamp) AS timestamp FROM crdt_events GROUP BY node_id"
+            )
+            return {row['node_id']: row['timestamp'] for row in rows or []}
+            
+        except Exception as e:
+            logger.error(f"Failed to get version vector: {e}", exc_info=True)
+            return {}
+    
+    def get_events_after_vector(self, version_vector: Dict[str, datetime]) -> List[Event]:
+        """
+        Get the events a peer is missing, given its version vector.
+        
+        An event is missing when the peer has nothing from its origin node or
+        it is newer than the peer's watermark for that node.
+        
+        Args:
+            version_vector: Dict of node_id -> newest timestamp the peer has
+                from that node (as returned by get_version_vector)
+            
+        Returns:
+            List of Event objects ordered by (timestamp, event_id)
+        """
+        try:
+            query = """
+            SELECT e.event_id, e.entity_id, e.event_type, e.data,
+                   e.timestamp, e.node_id, e.vector_clock
+            FROM crdt_events e
+            """
+            params: List[Any] = []
+            if version_vector:
+                query += """
+                LEFT JOIN (VALUES {}) AS seen(node_id, timestamp) ON seen.node_id = e.node_id
+                WHERE seen.timestamp IS NULL OR e.timestamp > seen.timestamp
+                """.format(', '.join(['(%s, %s::timestamp)'] * len(version_vector)))
+                for node_id, timestamp in version_vector.items():
+                    params.extend((node_id, timestamp))
+            query += " ORDER BY e.timestamp ASC, e.event_id ASC"
+            
+            rows = self.db.execute_query(query, tuple(params) if params else None)
+            
+            events = [Event.from_row(row) for row in rows]
+            
+            logger.debug("Retrieved %d events after version vector", len(events))
+            return events
+            
+        except Exception as e:
+            logger.error(f"Failed to get events after version vector: {e}", exc_info=True)
+            return []
+    
     def save_snapshot(self, entity_id: str, state: Dict[str, Any],
                      vector_clock: Dict[str, int]) -> bool:
         """
@@ -272,19 +584,87 @@ class EventStore:
             
             params = (
                 entity_id,
-                json.dumps(state),
-                json.dumps(vector_clock),
+                _dumps(state),
+                _dumps(vector_clock),
                 datetime.utcnow()
             )
             
             self.db.execute_query(query, params)
-            logger.info(f"Saved snapshot for entity {entity_id}")
+            logger.debug("Saved snapshot for entity %s", entity_id)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}", exc_info=True)
             return False
     
+    def save_snapshots(self, snapshots: List[Tuple[str, Dict[str, Any], Dict[str, int]]]) -> bool:
+        """
+        Save several state snapshots in a single batched upsert.
+        
+        Args:
+            snapshots: (entity_id, state, vector_clock) tuples; when an entity
+                appears more than once the last entry wins
+            
+        Returns:
+            True if successful
+        """
+        if not snapshots:
+            return True
+        try:
+            rows = self._snapshot_rows(snapshots)
+            self.db.execute_batch_values(self._UPSERT_SNAPSHOTS_SQL, rows)
+            logger.info(f"Saved {len(rows)} snapshots")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save snapshots: {e}", exc_info=True)
+            return False
+    
+    def _insert_events(self, events: List[Event]) -> int:
+        """
+        Insert events, skipping already stored event_ids; call inside db.transaction().
+        
+        Small batches use a multi-row INSERT. Large ones (e.g. a new node
+        replaying the log) are streamed with COPY into a staging table and
+        merged with one INSERT ... SELECT, since COPY cannot skip conflicts.
+        
+        Returns:
+            Number of events inserted
+        """
+        rows = self._event_rows(events)
+        if len(rows) < self.COPY_THRESHOLD:
+            return self.db.execute_batch_values(self._INSERT_EVENTS_SQL, rows)
+        self.db.execute_query(self._CREATE_EVENTS_STAGE_SQL)
+        self.db.copy_rows('crdt_events_stage', self._EVENT_COLUMNS, rows)
+        return self.db.execute_query(self._MERGE_EVENTS_STAGE_SQL)
+    
+    @staticmethod
+    def _event_rows(events: List[Event]) -> List[tuple]:
+        """Parameter tuples for _INSERT_EVENTS_SQL."""
+        return [
+            (
+                event.event_id,
+                event.entity_id,
+                event.event_type,
+                event.data_json,
+                event.timestamp,
+                event.node_id,
+                event.vector_clock_json
+            )
+            for event in events
+        ]
+    
+    @staticmethod
+    def _snapshot_rows(snapshots: List[Tuple[str, Dict[str, Any], Dict[str, int]]]) -> List[tuple]:
+        """Parameter tuples for _UPSERT_SNAPSHOTS_SQL, one per entity (last entry wins)."""
+        # An upsert cannot touch the same row twice in one statement
+        latest = {entity_id: (state, vector_clock) for entity_id, state, vector_clock in snapshots}
+        now = datetime.utcnow()
+        return [
+            (entity_id, _dumps(state), _dumps(vector_clock), now)
+            for entity_id, (state, vector_clock) in latest.items()
+        ]
+    
     def get_snapshot(self, entity_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, int], datetime]]:
         """
         Get the latest snapshot for an entity.
@@ -306,9 +686,7 @@ class EventStore:
             
             if rows:
                 row = rows[0]
-                state = json.loads(row['state']) if isinstance(row['state'], str) else row['state']
-                vector_clock = json.loads(row['vector_clock']) if isinstance(row['vector_clock'], str) else row['vector_clock']
-                return (state, vector_clock, row['created_at'])
+                return (_loads(row['state']), _loads(row['vector_clock']), row['created_at'])
             
             return None
             
@@ -316,6 +694,78 @@ class EventStore:
             logger.error(f"Failed to get snapshot: {e}", exc_info=True)
             return None
     
+    def get_snapshots(self, entity_ids: List[str]) -> Dict[str, Tuple[Dict[str, Any], Dict[str, int], datetime]]:
+        """
+        Get the latest snapshots for several entities in one query.
+        
+        Args:
+            entity_ids: Entity IDs
+            
+        Returns:
+            Dict of entity_id -> (state, vector_clock, timestamp) for the
+            entities that have a snapshot
+        """
+        if not entity_ids:
+            return {}
+        try:
+            query = """
+            SELECT entity_id, state, vector_clock, created_at
+            FROM crdt_snapshots
+            WHERE entity_id = ANY(%s)
+            """
+            
+            rows = self.db.execute_query(query, (list(entity_ids),))
+            
+            return {
+                row['entity_id']: (_loads(row['state']), _loads(row['vector_clock']), row['created_at'])
+                for row in rows
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get snapshots: {e}", exc_info=True)
+            return {}
+    
+    def snapshot_fingerprint(self) -> Optional[Tuple[int, int]]:
+        """
+        Cheap server-side fingerprint of all snapshot states.
+        
+        Row count and the sum of a 64-bit hash of each (entity_id, state), so any
+        snapshot write by any node or process sharing the database changes it
+        without the states being transferred.
+        
+        Returns:
+            (count, hash sum) tuple, or None if it could not be computed
+        """
+        try:
+            rows = self.db.execute_query("""
+            SELECT COUNT(*) AS count,
+                   COALESCE(SUM(hashtextextended(entity_id || ':' || state::text, 0)), 0) AS hash_sum
+            FROM crdt_snapshots
+            """)
+            return (rows[0]['count'], int(rows[0]['hash_sum'])) if rows else None
+            
+        except Exception as e:
+            logger.error(f"Failed to get snapshot fingerprint: {e}", exc_info=True)
+            return None
+    
+    def iter_snapshot_states(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream every entity's snapshot state in entity_id byte order.
+        
+        The order uses the "C" collation so it is the same on every node,
+        whatever the database's default collation.
+        
+        Yields:
+            (entity_id, state) tuples
+        """
+        query = """
+        SELECT entity_id, state
+        FROM crdt_snapshots
+        ORDER BY entity_id COLLATE "C" ASC
+        """
+        for row in self.db.execute_query_iter(query):
+            yield row['entity_id'], _loads(row['state'])
+    
     def get_events_by_type(self, event_type: str, limit: int = 100) -> List[Event]:
         """
         Get events by type.
@@ -339,18 +789,7 @@ class EventStore:
             
             rows = self.db.execute_query(query, (event_type, limit))
             
-            events = []
-            for row in rows:
-                event = Event(
-                    event_id=row['event_id'],
-                    entity_id=row['entity_id'],
-                    event_type=row['event_type'],
-                    data=json.loads(row['data']) if isinstance(row['data'], str) else row['data'],
-                    timestamp=row['timestamp'],
-                    node_id=row['node_id'],
-                    vector_clock=json.loads(row['vector_clock']) if isinstance(row['vector_clock'], str) else row['vector_clock']
-                )
-                events.append(event)
+            events = [Event.from_row(row) for row in rows]
             
             return events
             
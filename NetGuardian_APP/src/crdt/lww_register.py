@@ -5,14 +5,30 @@ State-based CRDT that resolves conflicts using timestamps and node IDs.
 Guarantees eventual consistency in distributed file systems.
 """
 
-from typing import Any, Optional, Dict, Tuple
-from datetime import datetime
+from typing import Any, Optional, Dict, Tuple, Iterable, Union
+from datetime import datetime, timedelta, timezone
 import json
 import logging
-from .vector_clock import VectorClock
+import time
+from .vector_clock import VectorClock, _pack, _unpack
 
 logger = logging.getLogger(__name__)
 
+# Register timestamps are int nanoseconds since the Unix epoch; datetimes
+# (naive ones are UTC, as produced by utcnow and the TIMESTAMP columns) convert
+# against these references with exact integer arithmetic
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_ns(timestamp: Union[int, datetime]) -> int:
+    """Convert a datetime (or int nanoseconds) to int nanoseconds since the epoch."""
+    if isinstance(timestamp, int):
+        return timestamp
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _MICROSECOND * 1000
+
 
 class LWWRegister:
     """
@@ -23,13 +39,13 @@ class LWWRegister:
     
     Attributes:
         value: Current value stored in the register
-        timestamp: Timestamp of last write
+        timestamp: Timestamp of last write, int nanoseconds since the Unix epoch
         node_id: ID of the node that performed the last write
         vector_clock: Vector clock for causality tracking
     """
     
     def __init__(self, node_id: str, value: Any = None, 
-                 timestamp: Optional[datetime] = None,
+                 timestamp: Optional[Union[int, datetime]] = None,
                  vector_clock: Optional[VectorClock] = None):
         """
         Initialize LWW-Register.
@@ -37,14 +53,18 @@ class LWWRegister:
         Args:
             node_id: Unique identifier for this node
             value: Initial value
-            timestamp: Initial timestamp (defaults to current time)
+            timestamp: Initial timestamp as int nanoseconds or datetime
+                (defaults to current time)
             vector_clock: Optional vector clock for causality
         """
         self.node_id = node_id
         self.value = value
-        self.timestamp = timestamp or datetime.utcnow()
+        self.timestamp = time.time_ns() if timestamp is None else _to_ns(timestamp)
         self.vector_clock = vector_clock or VectorClock(node_id)
-        logger.debug(f"Created LWWRegister: {self}")
+        # Registers are created and mutated in bulk: skip the logging call
+        # (and str(self), which formats the whole value) unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created LWWRegister: %s", self)
     
     def set(self, value: Any) -> None:
         """
@@ -54,9 +74,10 @@ class LWWRegister:
             value: New value to store
         """
         self.value = value
-        self.timestamp = datetime.utcnow()
+        self.timestamp = time.time_ns()
         self.vector_clock.increment()
-        logger.info(f"LWWRegister updated: value={value}, timestamp={self.timestamp}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LWWRegister updated: value=%s, timestamp=%s", value, self.timestamp)
     
     def get(self) -> Any:
         """
@@ -77,27 +98,45 @@ class LWWRegister:
         Args:
             other: Another LWWRegister to merge with
         """
-        logger.debug(f"Merging registers: {self} with {other}")
-        
-        # Compare timestamps
-        if other.timestamp > self.timestamp:
-            # Other is newer
-            self.value = other.value
-            self.timestamp = other.timestamp
-            self.node_id = other.node_id
-            logger.info(f"Merged: adopted other's value (newer timestamp)")
-        elif other.timestamp == self.timestamp:
-            # Timestamp tie - use node_id for deterministic ordering
-            if other.node_id > self.node_id:
-                self.value = other.value
-                self.node_id = other.node_id
-                logger.info(f"Merged: adopted other's value (tie-break by node_id)")
-        else:
-            # Self is newer - keep current value
-            logger.info(f"Merged: kept current value (newer timestamp)")
-        
-        # Update vector clock
-        self.vector_clock.update(other.vector_clock)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Merging registers: %s with %s", self, other)
+        # Shares merge_many's LWW + clock-max arithmetic on the raw fields
+        self.merge_many(((other.value, other.timestamp, other.node_id, other.vector_clock.clock),))
+    
+    def merge_many(self, writes: Iterable[Tuple[Any, datetime, str, Dict[str, int]]]) -> None:
+        """
+        Merge several remote writes in one pass.
+        
+        Gives the same result as calling merge() for each write in order: the
+        winner is the first write with the greatest (timestamp, node_id) and the
+        vector clock becomes the element-wise max, without building a register
+        per write.
+        
+        Args:
+            writes: (value, timestamp, node_id, vector clock dict) tuples; the
+                timestamp may be int nanoseconds or a datetime (e.g. from Event)
+        """
+        best_key = (self.timestamp, self.node_id)
+        best = None
+        merge_clock = self.vector_clock.merge_dict
+        for write in writes:
+            timestamp = write[1]
+            key = (timestamp if type(timestamp) is int else _to_ns(timestamp), write[2])
+            if key > best_key:
+                best_key = key
+                best = write
+            merge_clock(write[3])
+        
+        if best is not None:
+            self.value, self.node_id = best[0], best[2]
+            self.timestamp = best_key[0]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Merged writes into: %s", self)
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Timestamp of last write as a naive UTC datetime (microsecond precision)."""
+        return _EPOCH + timedelta(microseconds=self.timestamp // 1000)
     
     def is_concurrent(self, other: 'LWWRegister') -> bool:
         """
@@ -135,7 +174,7 @@ class LWWRegister:
         return {
             'node_id': self.node_id,
             'value': self.value,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': self.timestamp,
             'vector_clock': self.vector_clock.to_dict()
         }
     
@@ -148,21 +187,55 @@ class LWWRegister:
         """
         return json.dumps(self.to_dict(), default=str)
     
+    def to_bytes(self) -> bytes:
+        """
+        Serialize register to compact bytes for the wire.
+        
+        Encoded as a positional [node_id, value, timestamp_ns, clock_node_id,
+        clock] array.
+        
+        Returns:
+            Encoded bytes
+        """
+        return _pack([self.node_id, self.value, self.timestamp,
+                      self.vector_clock.node_id, self.vector_clock.clock])
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'LWWRegister':
+        """
+        Deserialize register from bytes produced by to_bytes.
+        
+        Args:
+            data: Encoded bytes
+            
+        Returns:
+            LWWRegister instance
+        """
+        node_id, value, ts_ns, clock_node_id, clock = _unpack(data)
+        return cls(
+            node_id=node_id,
+            value=value,
+            timestamp=ts_ns,
+            vector_clock=VectorClock(clock_node_id, clock)
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'LWWRegister':
         """
         Deserialize register from dictionary.
         
         Args:
-            data: Dictionary containing register data
+            data: Dictionary containing register data; an ISO timestamp string
+                from older peers is still accepted
             
         Returns:
             LWWRegister instance
         """
+        timestamp = data['timestamp']
         return cls(
             node_id=data['node_id'],
             value=data['value'],
-            timestamp=datetime.fromisoformat(data['timestamp']),
+            timestamp=datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp,
             vector_clock=VectorClock.from_dict(data['vector_clock'])
         )
     
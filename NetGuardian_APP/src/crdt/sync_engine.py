@@ -8,6 +8,7 @@ Supports pull, push, and bidirectional sync strategies.
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import logging
+import time
 
 from .event_store import Event
 from .crdt_manager import CRDTManager
@@ -15,6 +16,19 @@ from .crdt_manager import CRDTManager
 logger = logging.getLogger(__name__)
 
 
+def _vc_to_wire(version_vector: Dict[str, datetime]) -> Dict[str, str]:
+    """Encode a version vector (node_id -> timestamp) with ISO timestamps."""
+    return {node_id: timestamp.isoformat() for node_id, timestamp in version_vector.items()}
+
+
+def _vc_from_wire(version_vector: Dict[str, Any]) -> Dict[str, datetime]:
+    """Decode a version vector produced by _vc_to_wire."""
+    return {
+        node_id: datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+        for node_id, timestamp in version_vector.items()
+    }
+
+
 class SyncEngine:
     """
     Synchronization engine for CRDT states.
@@ -30,6 +44,7 @@ class SyncEngine:
         db: Database manager
         node_id: This node's identifier
         last_sync: Timestamp of last successful sync
+        _peer_vcs: Last known version vector of each peer (delta sync)
     """
     
     def __init__(self, crdt_manager: CRDTManager):
@@ -43,6 +58,7 @@ class SyncEngine:
         self.db = crdt_manager.db
         self.node_id = crdt_manager.node_id
         self.last_sync: Optional[datetime] = None
+        self._peer_vcs: Dict[str, Dict[str, datetime]] = {}
         logger.info(f"SyncEngine initialized for node {self.node_id}")
     
     def pull_sync(self, remote_events: List[Event]) -> Dict[str, Any]:
@@ -56,7 +72,8 @@ class SyncEngine:
             Sync result with statistics
         """
         try:
-            start_time = datetime.utcnow()
+            # Durations use the monotonic clock; wall-clock datetimes are only for last_sync
+            start_ns = time.perf_counter_ns()
             
             if not remote_events:
                 logger.info("No remote events to sync")
@@ -73,7 +90,7 @@ class SyncEngine:
             self.last_sync = datetime.utcnow()
             self._log_sync('pull', merged_count)
             
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             result = {
                 'success': True,
@@ -141,7 +158,7 @@ class SyncEngine:
             Sync result with local events to push
         """
         try:
-            start_time = datetime.utcnow()
+            start_ns = time.perf_counter_ns()
             
             # Pull remote events
             pull_result = self.pull_sync(remote_events)
@@ -149,7 +166,7 @@ class SyncEngine:
             # Prepare local events for push
             push_result = self.push_sync(since)
             
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             result = {
                 'success': True,
@@ -174,6 +191,105 @@ class SyncEngine:
                 'error': str(e)
             }
     
+    def delta_sync(self, remote_events: List[Event],
+                   peer_vc: Optional[Dict[str, Any]] = None,
+                   peer_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Perform delta-state sync: pull remote events and return only the
+        local events the peer is missing according to its version vector.
+        
+        Args:
+            remote_events: Events from remote node (its delta for us)
+            peer_vc: Peer's version vector, node_id -> ISO timestamp of the
+                newest event it has from that node (the last one recorded for
+                peer_id if None)
+            peer_id: Optional peer identifier to remember its version vector
+            
+        Returns:
+            Sync result with local events to push and our version vector
+        """
+        try:
+            start_ns = time.perf_counter_ns()
+            
+            if peer_vc is not None:
+                peer_vector = _vc_from_wire(peer_vc)
+            else:
+                peer_vector = self._peer_vcs.get(peer_id, {})
+            
+            local_vector = self.crdt_manager.current_vc()
+            
+            # Nothing to exchange in either direction
+            if not remote_events and peer_vector == local_vector:
+                logger.info("Delta sync: peer already up to date")
+                return {
+                    'success': True,
+                    'pull': {'events_merged': 0},
+                    'push': {'events_count': 0, 'events': []},
+                    'version_vector': _vc_to_wire(local_vector),
+                    'duration_ms': (time.perf_counter_ns() - start_ns) / 1_000_000,
+                    'last_sync': self.last_sync.isoformat() if self.last_sync else None
+                }
+            
+            pull_result = self.pull_sync(remote_events)
+            if not pull_result.get('success'):
+                return {
+                    'success': False,
+                    'error': pull_result.get('error')
+                }
+            if pull_result.get('events_merged'):
+                local_vector = self.crdt_manager.current_vc()
+            
+            delta = self.crdt_manager.get_changes_for(peer_vector)
+            
+            if peer_id is not None:
+                # Record only what the peer has shown it holds: its own vector plus
+                # the events it sent and we merged. The delta we return is not
+                # assumed applied; the peer's next vector will reflect it.
+                known = dict(peer_vector)
+                for event in remote_events:
+                    seen = known.get(event.node_id)
+                    if seen is None or event.timestamp > seen:
+                        known[event.node_id] = event.timestamp
+                self._peer_vcs[peer_id] = known
+            
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+            
+            result = {
+                'success': True,
+                'pull': {
+                    'events_merged': pull_result.get('events_merged', 0)
+                },
+                'push': {
+                    'events_count': len(delta),
+                    'events': [event.to_dict() for event in delta]
+                },
+                'version_vector': _vc_to_wire(local_vector),
+                'duration_ms': duration,
+                'last_sync': self.last_sync.isoformat() if self.last_sync else None
+            }
+            
+            logger.info(f"Delta sync completed: {len(delta)} events to push in {duration:.2f}ms")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Delta sync failed: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def compute_delta(self, peer_vc: Dict[str, Any]) -> List[Event]:
+        """
+        Get the local events a peer is missing.
+        
+        Args:
+            peer_vc: Peer's version vector (node_id -> ISO timestamp)
+            
+        Returns:
+            List of events ordered by (timestamp, event_id)
+        """
+        return self.crdt_manager.get_changes_for(_vc_from_wire(peer_vc))
+    
     def auto_sync(self, remote_endpoint: Optional[str] = None,
                   interval_seconds: int = 60) -> Dict[str, Any]:
         """
@@ -234,6 +350,8 @@ class SyncEngine:
                     'is_synced': False
                 }
             
+            # Peers compare roots to skip a sync when their states already agree
+            status['root'] = self.crdt_manager.state_root().hex()
             return status
             
         except Exception as e:
@@ -284,7 +402,7 @@ class SyncEngine:
             
             if register:
                 # Save resolved state
-                self.crdt_manager.registers[entity_id] = register
+                self.crdt_manager._put_register(entity_id, register)
                 self.crdt_manager._save_current_state(entity_id, register)
                 logger.info(f"Resolved conflicts for entity {entity_id}")
                 return True
@@ -315,7 +433,7 @@ class SyncEngine:
             rows = self.db.execute_query(query, (sync_since, self.node_id))
             
             entity_ids = [row['entity_id'] for row in rows]
-            logger.debug(f"Found {len(entity_ids)} entities with pending changes")
+            logger.debug("Found %d entities with pending changes", len(entity_ids))
             
             return entity_ids
             
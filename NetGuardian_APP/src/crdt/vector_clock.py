@@ -3,12 +3,38 @@ Vector Clock Implementation for CRDT
 Tracks causality in distributed systems to ensure proper event ordering
 """
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Any
 import json
 import logging
+import sys
+import weakref
+
+try:
+    import orjson  # optional: faster compact encoding for to_bytes/from_bytes
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# compare() result indexed by self_less + 2 * self_greater
+_ORDERING = ('equal', 'before', 'after', 'concurrent')
+
+
+def _pack(obj: Any) -> bytes:
+    """Encode obj as compact JSON bytes (same format with or without orjson)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Types orjson does not serialize (e.g. ints > 64 bit): use the stdlib
+            pass
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _unpack(data: bytes) -> Any:
+    """Decode bytes produced by _pack."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 class VectorClock:
     """
@@ -28,17 +54,40 @@ class VectorClock:
         
         Args:
             node_id: Unique identifier for this node
-            clock: Optional initial clock state
+            clock: Optional initial clock state (copied)
         """
-        self.node_id = node_id
-        self.clock: Dict[str, int] = clock if clock is not None else {node_id: 0}
+        # Node ids repeat across every clock in the process: interned keys make
+        # the dict lookups in compare/update/merge hit on identity, and all
+        # clocks share one copy of each string
+        self.node_id = node_id = sys.intern(node_id)
+        # Bumped on every mutation; keys the compare() memo below. Mutate through
+        # increment/update/merge_dict (or assign .clock), not by editing the dict.
+        self._version = 0
+        self.clock = (
+            {sys.intern(key): value for key, value in clock.items()}
+            if clock is not None else {node_id: 0}
+        )
+        # (weakref to other, other._version, self._version, result) of the last compare()
+        self._last_compare: Optional[Tuple[weakref.ref, int, int, str]] = None
+    
+    @property
+    def clock(self) -> Dict[str, int]:
+        """Mapping of node_id to counter value."""
+        return self._clock
+    
+    @clock.setter
+    def clock(self, value: Dict[str, int]) -> None:
+        self._clock = value
+        self._version += 1
     
     def increment(self) -> None:
         """Increment this node's counter."""
         if self.node_id not in self.clock:
             self.clock[self.node_id] = 0
         self.clock[self.node_id] += 1
-        logger.debug(f"Incremented clock for {self.node_id}: {self.clock}")
+        self._version += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Incremented clock for %s: %s", self.node_id, self.clock)
     
     def update(self, other: 'VectorClock') -> None:
         """
@@ -47,9 +96,26 @@ class VectorClock:
         Args:
             other: Another vector clock to merge with
         """
-        for node_id, value in other.clock.items():
-            self.clock[node_id] = max(self.clock.get(node_id, 0), value)
-        logger.debug(f"Updated clock: {self.clock}")
+        self.merge_dict(other._clock)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Updated clock: %s", self._clock)
+    
+    def merge_dict(self, other_clock: Dict[str, int]) -> None:
+        """
+        Take the element-wise maximum with a raw clock dict (e.g. an Event's).
+        
+        Args:
+            other_clock: Mapping of node_id to counter value
+        """
+        clock = self._clock
+        for node_id, value in other_clock.items():
+            current = clock.get(node_id)
+            if current is None:
+                # New node: keep the key interned like the constructor does
+                clock[sys.intern(node_id)] = value
+            elif value > current:
+                clock[node_id] = value
+        self._version += 1
     
     def compare(self, other: 'VectorClock') -> str:
         """
@@ -64,28 +130,50 @@ class VectorClock:
             'concurrent': events are concurrent
             'equal': clocks are identical
         """
-        all_nodes = set(self.clock.keys()) | set(other.clock.keys())
-        
+        # happens_before/is_concurrent/__eq__ tend to be asked about the same
+        # pair back to back; reuse the answer while neither clock has changed.
+        last = self._last_compare
+        if (last is not None and last[0]() is other
+                and last[1] == other._version and last[2] == self._version):
+            return last[3]
+        result = self._compare_impl(other)
+        self._last_compare = (weakref.ref(other), other._version, self._version, result)
+        return result
+    
+    def _compare_impl(self, other: 'VectorClock') -> str:
+        """Compute compare() from scratch."""
+        mine = self.clock
+        theirs = other.clock
         self_less = False
         self_greater = False
         
-        for node in all_nodes:
-            self_val = self.clock.get(node, 0)
-            other_val = other.clock.get(node, 0)
-            
+        # Walk each dict once instead of building a key union and doing two
+        # lookups per node; stop as soon as the clocks are known to be concurrent.
+        for node, self_val in mine.items():
+            other_val = theirs.get(node, 0)
             if self_val < other_val:
                 self_less = True
             elif self_val > other_val:
                 self_greater = True
+            else:
+                continue
+            if self_less and self_greater:
+                return 'concurrent'
+        
+        # Nodes only the other clock knows about count as 0 on this side
+        for node, other_val in theirs.items():
+            if node in mine:
+                continue
+            if other_val > 0:
+                self_less = True
+            elif other_val < 0:
+                self_greater = True
+            else:
+                continue
+            if self_less and self_greater:
+                return 'concurrent'
         
-        if not self_less and not self_greater:
-            return 'equal'
-        elif self_less and not self_greater:
-            return 'before'
-        elif self_greater and not self_less:
-            return 'after'
-        else:
-            return 'concurrent'
+        return _ORDERING[self_less + 2 * self_greater]
     
     def happens_before(self, other: 'VectorClock') -> bool:
         """
@@ -113,7 +201,7 @@ class VectorClock:
     
     def copy(self) -> 'VectorClock':
         """Create a deep copy of this vector clock."""
-        return VectorClock(self.node_id, self.clock.copy())
+        return VectorClock(self.node_id, self.clock)
     
     def to_dict(self) -> Dict:
         """
@@ -136,6 +224,32 @@ class VectorClock:
         """
         return json.dumps(self.to_dict())
     
+    def to_bytes(self) -> bytes:
+        """
+        Serialize vector clock to compact bytes for the wire.
+        
+        Encoded as a positional [node_id, clock] array, without the key names
+        and whitespace of to_json.
+        
+        Returns:
+            Encoded bytes
+        """
+        return _pack([self.node_id, self.clock])
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'VectorClock':
+        """
+        Deserialize vector clock from bytes produced by to_bytes.
+        
+        Args:
+            data: Encoded bytes
+            
+        Returns:
+            VectorClock instance
+        """
+        node_id, clock = _unpack(data)
+        return cls(node_id, clock)
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'VectorClock':
         """
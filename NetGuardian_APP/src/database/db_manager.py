@@ -4,19 +4,25 @@ Handles PostgreSQL database connections
 """
 
 import os
+import io
+import csv
 import logging
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator, Tuple
 import re
+import uuid
+import threading
+from contextlib import contextmanager
 
 # Try to import PostgreSQL driver
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import RealDictCursor, execute_values
     POSTGRES_AVAILABLE = True
 except Exception:
     # make names available for static analysis; will error at runtime if used
     psycopg2 = None  # type: ignore
     RealDictCursor = None  # type: ignore
+    execute_values = None  # type: ignore
     POSTGRES_AVAILABLE = False
 
 # Try to import dotenv
@@ -72,7 +78,23 @@ class DatabaseManager:
         self.database: str = Config.DB_NAME
         self.username: str = Config.DB_USER
         self.password: str = Config.DB_PASSWORD
+        # Statements and transaction() blocks from different threads share the one
+        # connection; the lock keeps another thread's statements (and commits) out of
+        # an open block, and the block's nesting depth is tracked per thread
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        # Per-thread connections used only by execute_query_iter (see there)
+        self._stream_connections: List[Any] = []
     
+    @property
+    def _transaction_depth(self) -> int:
+        """Nesting depth of this thread's transaction() blocks; statements inside one share its commit."""
+        return getattr(self._local, 'depth', 0)
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, value: int) -> None:
+        self._local.depth = value
+
     def connect(self) -> bool:
         """
         Establish database connection to PostgreSQL.
@@ -86,22 +108,33 @@ class DatabaseManager:
                 raise RuntimeError("psycopg2 not installed, PostgreSQL required")
 
             # Attempt to connect to PostgreSQL; raise on failure
-            self.connection = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.username,
-                password=self.password,
-                cursor_factory=RealDictCursor
-            )
+            self.connection = self._open_connection()
             logger.info("PostgreSQL database connection established")
             return True
         except Exception as e:
             logger.error(f"PostgreSQL connection failed: {e}", exc_info=True)
             raise
 
+    def _open_connection(self) -> Any:
+        """Open a new PostgreSQL connection with this manager's settings."""
+        return psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.username,
+            password=self.password,
+            cursor_factory=RealDictCursor
+        )
+
     def disconnect(self) -> None:
         """Close active database connection."""
+        with self._lock:
+            stream_connections, self._stream_connections = self._stream_connections, []
+        for conn in stream_connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing streaming connection: {e}")
         if self.connection:
             try:
                 self.connection.close()
@@ -118,26 +151,231 @@ class DatabaseManager:
             params: Query parameters tuple
             
         Returns:
-            List of dicts for SELECT queries, row count for INSERT/UPDATE/DELETE
+            List of dicts for SELECT queries and statements with RETURNING,
+            row count for other INSERT/UPDATE/DELETE
             
         Raises:
             Exception: Database operation errors
         """
-        try:
+        with self._lock:
+            try:
+                if not self.connection:
+                    # connect() will raise if connection cannot be established
+                    self.connect()
+
+                # Always use PostgreSQL in production; no SQLite fallback
+                return self._execute_postgres_query(query, params)
+
+            except Exception as e:
+                logger.error(f"PostgreSQL query execution failed: {e}", exc_info=True)
+                self._rollback_unless_in_transaction()
+                raise
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the statements executed inside the block into one transaction.
+
+        Writes made through execute_query/execute_batch_values are committed once
+        when the outermost block exits (a single WAL flush for the whole group) and
+        rolled back together if it raises. A failing statement inside the block does
+        not roll back on its own (the block owns the rollback), and other threads'
+        statements wait until the block ends instead of joining or committing it.
+
+        Raises:
+            RuntimeError: If a statement failed inside the block but its error was
+                caught, so the group was rolled back instead of committed
+            Exception: Database operation errors
+        """
+        with self._lock:
             if not self.connection:
                 # connect() will raise if connection cannot be established
                 self.connect()
 
-            # Always use PostgreSQL in production; no SQLite fallback
-            return self._execute_postgres_query(query, params)
+            if not self._transaction_depth:
+                self._local.failed = False
+            self._transaction_depth += 1
+            try:
+                yield
+            except Exception:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self._rollback_connection()
+                raise
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                if self._local.failed:
+                    # A statement failed and its error was caught inside the block:
+                    # PostgreSQL has aborted the transaction, so nothing can commit
+                    self._rollback_connection()
+                    raise RuntimeError("Transaction rolled back: a statement inside it failed")
+                self.connection.commit()
+
+    def execute_batch_values(self, query: str, rows: List[tuple],
+                             page_size: int = 500) -> int:
+        """
+        Insert/upsert many rows with a multi-row VALUES statement in one transaction.
+
+        Uses psycopg2's execute_values, so N rows cost ceil(N / page_size)
+        round-trips and a single commit instead of one statement and commit each.
+
+        Args:
+            query: SQL with a single "VALUES %s" placeholder for the row list
+            rows: Parameter tuples, one per row
+            page_size: Rows sent per statement
+
+        Returns:
+            int: Number of rows affected
+
+        Raises:
+            Exception: Database operation errors
+        """
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                if not self.connection:
+                    # connect() will raise if connection cannot be established
+                    self.connect()
+
+                affected = 0
+                with self.connection.cursor() as cursor:
+                    for start in range(0, len(rows), page_size):
+                        execute_values(cursor, query, rows[start:start + page_size], page_size=page_size)
+                        affected += max(cursor.rowcount, 0)
+                if not self._transaction_depth:
+                    self.connection.commit()
+                return affected
+
+            except Exception as e:
+                logger.error(f"PostgreSQL batch execution failed: {e}", exc_info=True)
+                self._rollback_unless_in_transaction()
+                raise
+
+    def copy_rows(self, table: str, columns: List[str], rows: List[tuple]) -> int:
+        """
+        Bulk-load rows with COPY ... FROM STDIN (CSV), the fastest ingest path.
+
+        Rows are streamed in one COPY command, avoiding per-row statement
+        parsing. COPY has no ON CONFLICT clause, so callers that need one load
+        into a staging table first.
+
+        Args:
+            table: Target table name
+            columns: Column names, in the order of each row tuple
+            rows: Row tuples (None is loaded as NULL)
+
+        Returns:
+            int: Number of rows copied
+
+        Raises:
+            Exception: Database operation errors
+        """
+        if not rows:
+            return 0
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator='\n').writerows(rows)
+        buf.seek(0)
+        with self._lock:
+            try:
+                if not self.connection:
+                    # connect() will raise if connection cannot be established
+                    self.connect()
+
+                with self.connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+                    )
+                    copied = cursor.rowcount
+                if not self._transaction_depth:
+                    self.connection.commit()
+                return copied
+
+            except Exception as e:
+                logger.error(f"PostgreSQL COPY into {table} failed: {e}", exc_info=True)
+                self._rollback_unless_in_transaction()
+                raise
+
+    def execute_query_iter(self, query: str, params: Optional[tuple] = None,
+                           batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT and yield rows one at a time.
+
+        Uses a server-side (named) cursor so rows are streamed from PostgreSQL in
+        batches instead of being fetched into one list.
 
+        The cursor lives on a separate per-thread connection, not the shared one:
+        a named cursor only survives until its transaction ends, so commits made
+        by other threads (or by the caller while iterating) on the shared
+        connection cannot invalidate it, a failure here never rolls back anyone
+        else's work, and the stream's read transaction is committed once the
+        outermost stream on the thread finishes. It sees committed data only.
+
+        Args:
+            query: SQL SELECT query string
+            params: Query parameters tuple
+            batch_size: Rows transferred per network round-trip
+
+        Yields:
+            dict: One row per iteration
+
+        Raises:
+            Exception: Database operation errors
+        """
+        conn = self._stream_connection()
+        q, p = self._normalize_query(query, params)
+        # Streams nested on one thread share the read transaction; only the
+        # outermost one ends it (which would close the inner cursors)
+        self._local.stream_depth = getattr(self._local, 'stream_depth', 0) + 1
+        failed = False
+        try:
+            with conn.cursor(name=f"ng_iter_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(q, p)
+                for row in cursor:
+                    yield row
         except Exception as e:
-            logger.error(f"PostgreSQL query execution failed: {e}", exc_info=True)
-            self._rollback_connection()
+            failed = True
+            logger.error(f"PostgreSQL streaming query failed: {e}", exc_info=True)
             raise
-    
-    def _execute_postgres_query(self, query: str, params: Optional[tuple]) -> Any:
-        """Execute query on PostgreSQL connection."""
+        finally:
+            self._local.stream_depth -= 1
+            if not self._local.stream_depth:
+                try:
+                    if failed:
+                        conn.rollback()
+                    else:
+                        conn.commit()
+                except Exception as end_err:
+                    logger.error(f"Ending streaming read transaction failed: {end_err}")
+                    self._drop_stream_connection(conn)
+
+    def _stream_connection(self) -> Any:
+        """This thread's connection for execute_query_iter, opened on first use."""
+        conn = getattr(self._local, 'stream_conn', None)
+        if conn is None or conn.closed:
+            if not POSTGRES_AVAILABLE:
+                raise RuntimeError("psycopg2 not installed, PostgreSQL required")
+            conn = self._open_connection()
+            self._local.stream_conn = conn
+            with self._lock:
+                self._stream_connections.append(conn)
+        return conn
+
+    def _drop_stream_connection(self, conn: Any) -> None:
+        """Close a broken streaming connection so the next stream opens a fresh one."""
+        if getattr(self._local, 'stream_conn', None) is conn:
+            self._local.stream_conn = None
+        with self._lock:
+            if conn in self._stream_connections:
+                self._stream_connections.remove(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _normalize_query(self, query: str, params: Optional[tuple]) -> Tuple[str, Optional[tuple]]:
+        """Translate sqlite-style SQL and boolean params to PostgreSQL form."""
         # Convert sqlite-style placeholders (?) to psycopg2-style (%s)
         q = query.replace('?', '%s')
         # Normalize common boolean comparisons for PostgreSQL: replace literal 0/1 with FALSE/TRUE
@@ -165,15 +403,30 @@ class DatabaseManager:
                 p = tuple(plist)
             except Exception:
                 p = params
+        return q, p
+
+    def _execute_postgres_query(self, query: str, params: Optional[tuple]) -> Any:
+        """Execute query on PostgreSQL connection."""
+        q, p = self._normalize_query(query, params)
         with self.connection.cursor() as cursor:
             cursor.execute(q, p)
 
             if query.strip().upper().startswith('SELECT'):
                 return cursor.fetchall()
             else:
-                self.connection.commit()
-                return cursor.rowcount
+                # INSERT/UPDATE ... RETURNING: hand back the returned rows
+                returned = cursor.fetchall() if cursor.description is not None else None
+                if not self._transaction_depth:
+                    self.connection.commit()
+                return cursor.rowcount if returned is None else returned
     
+    def _rollback_unless_in_transaction(self) -> None:
+        """Roll back a failed statement, unless a transaction() block owns the rollback."""
+        if self._transaction_depth:
+            self._local.failed = True
+        else:
+            self._rollback_connection()
+
     def _rollback_connection(self) -> None:
         """Safely rollback transaction on error."""
         if self.connection:
@@ -234,36 +487,93 @@ class DatabaseManager:
             );
             """
             
-            # CRDT: Create events table for event sourcing
-            crdt_events_table = """
-            CREATE TABLE IF NOT EXISTS crdt_events (
+            # CRDT: Optionally hash-partition the CRDT tables by entity_id so each
+            # entity's events and snapshot live in one partition (takes effect only
+            # when the tables are first created)
+            partitions = Config.CRDT_TABLE_PARTITIONS
+            if partitions > 0:
+                # Unique keys of a partitioned table must include the partition key
+                events_key_columns = """
+                id BIGSERIAL,
+                event_id VARCHAR(255) NOT NULL,"""
+                events_key_constraint = ",\n                PRIMARY KEY (entity_id, event_id)"
+                partition_clause = " PARTITION BY HASH (entity_id)"
+            else:
+                events_key_columns = """
                 id SERIAL PRIMARY KEY,
-                event_id VARCHAR(255) UNIQUE NOT NULL,
+                event_id VARCHAR(255) UNIQUE NOT NULL,"""
+                events_key_constraint = ""
+                partition_clause = ""
+
+            def partitions_ddl(table: str) -> str:
+                return "".join(
+                    f"CREATE TABLE IF NOT EXISTS {table}_p{i} PARTITION OF {table} "
+                    f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i});\n"
+                    for i in range(partitions)
+                )
+
+            # CRDT: Create events table for event sourcing
+            crdt_events_table = f"""
+            CREATE TABLE IF NOT EXISTS crdt_events ({events_key_columns}
                 entity_id VARCHAR(255) NOT NULL,
                 event_type VARCHAR(100) NOT NULL,
                 data JSONB NOT NULL,
                 timestamp TIMESTAMP NOT NULL,
                 node_id VARCHAR(255) NOT NULL,
                 vector_clock JSONB NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            CREATE INDEX IF NOT EXISTS idx_crdt_events_entity ON crdt_events(entity_id);
-            CREATE INDEX IF NOT EXISTS idx_crdt_events_timestamp ON crdt_events(timestamp);
-            CREATE INDEX IF NOT EXISTS idx_crdt_events_type ON crdt_events(event_type);
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP{events_key_constraint}
+            ){partition_clause};
+            {partitions_ddl('crdt_events')}
+            -- Per-entity replay (get_events) is a range scan on (entity_id, timestamp)
+            CREATE INDEX IF NOT EXISTS idx_crdt_events_entity_ts ON crdt_events(entity_id, timestamp);
+            -- Keyset pagination over the whole log (get_all_events) on (timestamp, event_id)
+            CREATE INDEX IF NOT EXISTS idx_crdt_events_ts ON crdt_events(timestamp, event_id);
+            -- Superseded by the composite indexes above (same leading column)
+            DROP INDEX IF EXISTS idx_crdt_events_entity;
+            DROP INDEX IF EXISTS idx_crdt_events_timestamp;
+            -- get_events_by_type filters on event_type and orders by timestamp
+            CREATE INDEX IF NOT EXISTS idx_crdt_events_type_ts ON crdt_events(event_type, timestamp);
+            DROP INDEX IF EXISTS idx_crdt_events_type;
+            -- Delta sync: per-origin watermarks (get_version_vector, get_events_after_vector)
+            CREATE INDEX IF NOT EXISTS idx_crdt_events_node_ts ON crdt_events(node_id, timestamp);
             """
             
             # CRDT: Create snapshots table for fast state recovery
-            crdt_snapshots_table = """
+            crdt_snapshots_table = f"""
             CREATE TABLE IF NOT EXISTS crdt_snapshots (
                 entity_id VARCHAR(255) PRIMARY KEY,
                 state JSONB NOT NULL,
                 vector_clock JSONB NOT NULL,
                 created_at TIMESTAMP NOT NULL,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
+            ){partition_clause};
+            {partitions_ddl('crdt_snapshots')}
             CREATE INDEX IF NOT EXISTS idx_crdt_snapshots_updated ON crdt_snapshots(updated_at);
             """
             
+            # CRDT: Convert JSON columns of tables created by older versions (TEXT)
+            # to JSONB, so psycopg2 returns them already parsed
+            crdt_jsonb_migration = """
+            DO $$
+            DECLARE
+                col RECORD;
+            BEGIN
+                FOR col IN
+                    SELECT table_name, column_name
+                    FROM information_schema.columns
+                    WHERE table_schema = current_schema()
+                      AND (table_name, column_name) IN (
+                          ('crdt_events', 'data'), ('crdt_events', 'vector_clock'),
+                          ('crdt_snapshots', 'state'), ('crdt_snapshots', 'vector_clock')
+                      )
+                      AND data_type <> 'jsonb'
+                LOOP
+                    EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE jsonb USING %I::jsonb',
+                                   col.table_name, col.column_name, col.column_name);
+                END LOOP;
+            END $$;
+            """
+            
             # CRDT: Create sync log for tracking synchronization
             crdt_sync_log_table = """
             CREATE TABLE IF NOT EXISTS crdt_sync_log (
@@ -287,12 +597,29 @@ class DatabaseManager:
                 # Non-fatal: some PostgreSQL versions may error on ALTER statement parsing in this context
                 pass
             self.execute_query(files_table)
+            # Partial index so the upload duplicate check (live file by name) is a single index probe
+            try:
+                self.execute_query(
+                    "CREATE INDEX IF NOT EXISTS idx_files_user_name_live "
+                    "ON files(user_id, original_name) WHERE is_deleted = FALSE;"
+                )
+            except Exception:
+                # Non-fatal: the upload path works without the index, only slower
+                pass
+            # Listings are no longer filtered in SQL; drop the unused expression
+            # index left by older versions so uploads stop paying to maintain it
+            try:
+                self.execute_query("DROP INDEX IF EXISTS idx_files_user_ext_live;")
+            except Exception:
+                # Non-fatal: a leftover index only costs write time
+                pass
             self.execute_query(sessions_table)
 
             # Only create internal CRDT tables when configured to use internal CRDT
             if Config.APP_USE_INTERNAL_CRDT:
                 self.execute_query(crdt_events_table)
                 self.execute_query(crdt_snapshots_table)
+                self.execute_query(crdt_jsonb_migration)
                 self.execute_query(crdt_sync_log_table)
 
             logger.info("Database tables initialized successfully (PostgreSQL)")
@@ -8,10 +8,10 @@ Wraps file operations with event sourcing and conflict-free replication.
 import os
 from typing import Tuple, Dict, Any, Optional, List
 import logging
-from datetime import datetime
 
 from src.file_manager.file_handler import FileHandler
-from src.crdt import CRDTManager, SyncEngine
+from src.crdt import CRDTManager, SyncEngine, Event
+from config.settings import Config
 
 logger = logging.getLogger(__name__)
 
@@ -42,28 +42,32 @@ class CRDTFileHandler(FileHandler):
         super().__init__(db_manager, user_id)
         
         # Initialize CRDT components
-        self.crdt_manager = CRDTManager(db_manager, node_id)
+        self.crdt_manager = CRDTManager(
+            db_manager, node_id,
+            snapshot_flush_interval=Config.CRDT_SNAPSHOT_FLUSH_MS / 1000
+        )
         self.sync_engine = SyncEngine(self.crdt_manager)
         
         logger.info(f"CRDTFileHandler initialized for user {user_id}, node {self.crdt_manager.node_id}")
     
-    def upload_file(self, file_path: str) -> Tuple[bool, str]:
+    def upload_file(self, file_path: str, file_hash: Optional[str] = None) -> Tuple[bool, str]:
         """
         Upload file with CRDT state tracking.
         
         Args:
             file_path: Path to file to upload
+            file_hash: Precomputed SHA-256 hex digest (computed if None)
             
         Returns:
             (success, message) tuple
         """
         # Call parent upload
-        success, message = super().upload_file(file_path)
+        success, message = super().upload_file(file_path, file_hash=file_hash)
         
         if success:
             try:
-                # Extract file info from message or database
-                file_info = self._get_latest_file_info()
+                # Row returned by the parent's INSERT/UPDATE (no second query)
+                file_info = self.last_uploaded_row
                 
                 if file_info:
                     # Create CRDT state for this file
@@ -74,12 +78,14 @@ class CRDTFileHandler(FileHandler):
                         'original_name': file_info['original_name'],
                         'file_size': file_info['file_size'],
                         'file_hash': file_info.get('file_hash'),
-                        'upload_date': file_info['upload_date'].isoformat() if isinstance(file_info['upload_date'], datetime) else file_info['upload_date'],
+                        'upload_date': file_info['upload_date'].isoformat(),
                         'user_id': self.user_id,
                         'deleted': False
                     }
                     
-                    self.crdt_manager.create_file_state(file_id, metadata)
+                    # Same shared connection as the parent's insert (see FileHandler._db_lock)
+                    with self._db_lock:
+                        self.crdt_manager.create_file_state(file_id, metadata)
                     logger.info(f"Created CRDT state for file {file_id}")
                     
             except Exception as e:
@@ -113,24 +119,47 @@ class CRDTFileHandler(FileHandler):
         
         return success, message
     
-    def sync_with_remote(self, remote_events: List[Dict]) -> Dict[str, Any]:
+    def sync_with_remote(self, remote_events: List[Dict],
+                         peer_vc: Optional[Dict[str, str]] = None,
+                         peer_id: Optional[str] = None,
+                         root: Optional[str] = None) -> Dict[str, Any]:
         """
         Synchronize file states with remote node.
         
+        With a peer version vector (or a peer_id seen before) only the delta is
+        exchanged: remote_events should hold just the events we are missing and
+        the result's push events are just the ones the peer is missing. Without
+        one, falls back to a full bidirectional sync.
+        
         Args:
             remote_events: List of event dictionaries from remote
+            peer_vc: Peer's version vector (node_id -> ISO timestamp of the
+                newest event it has from that node)
+            peer_id: Optional peer identifier; its version vector is remembered
+            root: Peer's state root (hex, from get_sync_status); when it matches
+                ours the states already agree and nothing is exchanged
             
         Returns:
             Sync result dictionary
         """
         try:
-            from src.crdt.event_store import Event
+            if root is not None and root == self.crdt_manager.state_root().hex():
+                logger.info("Sync skipped: state roots match")
+                return {
+                    'success': True,
+                    'in_sync': True,
+                    'pull': {'events_merged': 0},
+                    'push': {'events_count': 0, 'events': []}
+                }
             
             # Convert dicts to Event objects
             events = [Event.from_dict(e) for e in remote_events]
             
-            # Perform bidirectional sync
-            result = self.sync_engine.bidirectional_sync(events)
+            if peer_vc is not None or peer_id in self.sync_engine._peer_vcs:
+                result = self.sync_engine.delta_sync(events, peer_vc, peer_id)
+            else:
+                # Perform bidirectional sync
+                result = self.sync_engine.bidirectional_sync(events)
             
             logger.info(f"Sync completed: {result}")
             return result
@@ -142,6 +171,18 @@ class CRDTFileHandler(FileHandler):
                 'error': str(e)
             }
     
+    def compute_delta(self, peer_vc: Dict[str, str]) -> List[Event]:
+        """
+        Get the events a peer is missing, given its version vector.
+        
+        Args:
+            peer_vc: Peer's version vector (node_id -> ISO timestamp)
+            
+        Returns:
+            List of events to send to the peer
+        """
+        return self.sync_engine.compute_delta(peer_vc)
+    
     def get_sync_status(self) -> Dict[str, Any]:
         """
         Get current synchronization status.
@@ -214,30 +255,3 @@ class CRDTFileHandler(FileHandler):
             'sync': sync_status,
             'user_id': self.user_id
         }
-    
-    def _get_latest_file_info(self) -> Optional[Dict[str, Any]]:
-        """
-        Get info for the most recently uploaded file.
-        
-        Returns:
-            File info dictionary or None
-        """
-        try:
-            query = """
-            SELECT id, filename, original_name, file_size, file_hash, upload_date
-            FROM files
-            WHERE user_id = %s
-            ORDER BY upload_date DESC
-            LIMIT 1
-            """
-            
-            rows = self.db_manager.execute_query(query, (self.user_id,))
-            
-            if rows:
-                return dict(rows[0])
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to get latest file info: {e}")
-            return None
@@ -4,20 +4,253 @@ Manages file upload, download, and storage operations with encryption support
 """
 
 import os
+import sys
+import errno
+import asyncio
 import shutil
 import hashlib
 import uuid
 from datetime import datetime
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, List, Dict, Any, Optional, Iterator, Iterable, Callable
 import logging
 import paramiko
 import time
+import queue
+import shlex
+import threading
+from stat import S_ISDIR
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Optional io_uring bindings (pip install liburing), only used when Config.USE_IO_URING is set
+try:
+    import liburing
+except Exception:
+    liburing = None
 
 from src.utils.encryption import FileEncryption
 from config.settings import Config, UIConstants
 
 logger = logging.getLogger(__name__)
 
+# SFTP channel flow-control window and packet size (paramiko defaults: 2 MiB / 32 KiB)
+_SFTP_WINDOW_SIZE = 2 ** 24
+_SFTP_MAX_PACKET = 32768
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)): share extents copy-on-write (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """Clone src into dst with a copy-on-write reflink. Returns False if unsupported."""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def _try_clonefile(src: str, dst: str) -> bool:
+    """Clone src to a new dst with macOS clonefile(2). Returns False if unsupported."""
+    if sys.platform != 'darwin':
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL('/usr/lib/libc.dylib', use_errno=True)
+        return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def _fmt_ts(ts: int) -> str:
+    """
+    Format a POSIX timestamp as local time 'YYYY-MM-DD HH:MM:SS'.
+
+    Avoids a datetime allocation and locale-aware strftime per file; results are
+    cached per second since files in a folder often share modification times.
+    """
+    y, mo, d, h, mi, sec = time.localtime(ts)[:6]
+    return f"{y:04d}-{mo:02d}-{d:02d} {h:02d}:{mi:02d}:{sec:02d}"
+
+
+@contextmanager
+def _open_streaming(path: str, drop_cache: bool = True):
+    """
+    Open a file for one sequential read pass, hinting the kernel accordingly.
+
+    Doubles readahead while the file is open and, when drop_cache is set, evicts
+    its pages on close so single-use upload data does not crowd the page cache.
+    posix_fadvise is Linux/Unix only; elsewhere this is a plain open().
+
+    Args:
+        path: File to open in binary read mode
+        drop_cache: Evict the file's cached pages after the pass
+    """
+    f = open(path, 'rb')
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        yield f
+    finally:
+        if drop_cache and hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+        f.close()
+
+
+# Units for FileHandler._format_file_size, one per power of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+def _sha256_file(f) -> str:
+    """
+    SHA-256 hex digest of an open binary file.
+
+    hashlib.file_digest (Python 3.11+) hashes with large reads into a reused
+    buffer and OpenSSL's SHA code (SHA-NI where available); older Pythons get
+    the same scheme with a 1 MiB readinto buffer.
+    """
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+    digest = hashlib.sha256()
+    buf = bytearray(1024 * 1024)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _copy_file_fast(src: str, dst: str) -> None:
+    """
+    Copy a file with its metadata, like shutil.copy2, using the cheapest mechanism.
+
+    Tries a copy-on-write clone first (O(1), no data moved), then the in-kernel
+    copy_file_range or sendfile, and finally a buffered user-space copy.
+
+    Args:
+        src: Source file path
+        dst: Destination file path (overwritten if it exists)
+
+    Raises:
+        OSError: If the file cannot be copied
+    """
+    if not _try_clonefile(src, dst):
+        with _open_streaming(src) as fsrc, open(dst, 'wb') as fdst:
+            if not _try_reflink(fsrc.fileno(), fdst.fileno()):
+                copied = False
+                if hasattr(os, 'copy_file_range'):
+                    try:
+                        while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                            pass
+                        copied = True
+                    except OSError:
+                        # e.g. EXDEV on older kernels: restart with a plain copy
+                        fsrc.seek(0)
+                        fdst.seek(0)
+                        fdst.truncate()
+                if not copied and hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+                    try:
+                        offset = 0
+                        while True:
+                            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 1 << 30)
+                            if not sent:
+                                break
+                            offset += sent
+                        copied = True
+                    except OSError:
+                        fdst.seek(0)
+                        fdst.truncate()
+                if not copied:
+                    shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    shutil.copystat(src, dst)
+
+
+def _io_uring_bulk_unlink(paths: List[str], removed: List[str], errors: Dict[str, str],
+                          queue_depth: int = 256) -> None:
+    """
+    Unlink many files with io_uring, submitting up to queue_depth unlink ops per syscall.
+
+    Results are recorded as they complete, so after a failure the caller can
+    finish the paths that are in neither collection.
+
+    Args:
+        paths: Local file paths to remove
+        removed: Receives the paths that were removed
+        errors: Receives {path: error message} for failures
+        queue_depth: Submission queue size (ops per io_uring_enter)
+
+    Raises:
+        Exception: If the ring cannot be set up or used
+    """
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(queue_depth, ring, 0)
+    try:
+        for start in range(0, len(paths), queue_depth):
+            batch = paths[start:start + queue_depth]
+            # The kernel reads the paths asynchronously: keep the encoded bytes
+            # referenced until every completion of the batch has been reaped
+            encoded = [os.fsencode(path) for path in batch]
+            for index, raw_path in enumerate(encoded):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_unlink(sqe, raw_path, 0)
+                sqe.user_data = index
+            liburing.io_uring_submit(ring)
+            for _ in batch:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                try:
+                    path = batch[entry.user_data]
+                    # res is the syscall result: 0, or -errno on failure
+                    res = entry.res
+                    if res >= 0:
+                        removed.append(path)
+                    elif -res == errno.ENOENT:
+                        errors[path] = "File not found on local filesystem"
+                    else:
+                        errors[path] = os.strerror(-res)
+                finally:
+                    liburing.io_uring_cqe_seen(ring, entry)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+
+def _with_sftp(func: Callable) -> Callable:
+    """
+    Run a FileHandler method on a pooled SFTP session.
+
+    The wrapped method receives (ssh, sftp) after self; callers pass only the
+    remaining arguments. Connection failures and errors the method does not
+    handle itself are logged and reported as False.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            with self._sftp_session() as (ssh, sftp):
+                return func(self, ssh, sftp, *args, **kwargs)
+        except Exception as e:
+            logger.error("%s failed: %s", func.__name__, e)
+            return False
+    return wrapper
+
+
 class FileHandler:
     """
     Handles all file operations including upload, download, delete, and storage management.
@@ -37,6 +270,12 @@ class FileHandler:
         encryption: FileEncryption instance for file encryption
         user_storage_path: User-specific storage directory
     """
+
+    # Shared background pool for mirroring uploads into the CRDT sync folder
+    _mirror_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="crdt-mirror")
+    # Shared pool that runs blocking fetch/remove calls for the asyncio wrappers
+    _io_pool = ThreadPoolExecutor(max_workers=getattr(Config, 'CRDT_SFTP_CONCURRENCY', 4),
+                                  thread_name_prefix="crdt-io")
     
     def __init__(self, db_manager, user_id: int) -> None:
         """
@@ -54,34 +293,69 @@ class FileHandler:
         self.storage_path: str = Config.LOCAL_STORAGE_PATH
         self.max_file_size: int = Config.MAX_FILE_SIZE_MB * 1024 * 1024  # Convert to bytes
         self.encryption = FileEncryption()
+        self._pending_mirrors: List[Future] = []
+        # Latest mirror job per CRDT name: jobs for one name run in submission order
+        self._mirror_tails: Dict[str, Future] = {}
+        # Guards _pending_mirrors and _mirror_tails, which parallel uploads update
+        self._mirrors_lock = threading.Lock()
+        # Serializes the database section of upload_file: upload_files_batch workers
+        # share one connection, and only hashing/copying/encrypting runs in parallel
+        self._db_lock = threading.Lock()
+        # Row written by this thread's last successful upload_file (see last_uploaded_row)
+        self._upload_local = threading.local()
+        # Read once: checked on every fetch/remove, including per-file batch loops
+        self._use_sftp: bool = bool(getattr(Config, 'CRDT_USE_SFTP', False))
+        # Local parent directories already created by _ensure_dir
+        self._ensured_dirs: set = set()
+        # Remote CRDT folders already checked/created over SFTP
+        self._ensured_remote_dirs: set = set()
+
+        # SFTP settings are fixed for the session (the group port is set on db_manager at
+        # login, before the handler is created), so resolve them once instead of per connect
+        self._sftp_params: Tuple[str, int, str, str, str, int, int] = self._resolve_sftp_params()
+        self._sftp_pkey: Optional[paramiko.PKey] = None
+        # Idle (ssh, sftp) pairs reused across operations instead of one handshake per file
+        self._sftp_pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=getattr(Config, 'CRDT_SFTP_POOL_SIZE', 4))
         
         # Ensure user storage directory exists
         self.user_storage_path: str = os.path.join(self.storage_path, f"user_{user_id}")
         try:
             if not os.path.exists(self.user_storage_path):
                 os.makedirs(self.user_storage_path, exist_ok=True)
-                logger.info(f"Created user storage directory: {self.user_storage_path}")
+                logger.info("Created user storage directory: %s", self.user_storage_path)
         except OSError as e:
-            logger.error(f"Failed to create storage directory: {e}")
+            logger.error("Failed to create storage directory: %s", e)
             raise
     
-    def _sftp_connect(self):
+    def _resolve_sftp_params(self) -> Tuple[str, int, str, str, str, int, int]:
         """
-        Create and return an active SFTP client connected to the CRDT server.
-        Caller must close both sftp and ssh when finished.
-        Returns: (ssh_client, sftp_client) or (None, None) on failure
+        Resolve CRDT SFTP connection parameters.
+
+        Returns:
+            tuple: (host, port, user, password, key_path, retries, timeout)
         """
-        host = Config.CRDT_SFTP_HOST
         # Prefer runtime-set port (db_manager.crdt_port) set at login based on user's group
         try:
             port = int(getattr(self.db_manager, 'crdt_port', Config.CRDT_SFTP_PORT))
-        except Exception:
+        except (TypeError, ValueError):
             port = Config.CRDT_SFTP_PORT
-        user = Config.CRDT_SFTP_USER
-        password = Config.CRDT_SFTP_PASSWORD
-        key_path = Config.CRDT_SFTP_KEY_PATH
-        retries = getattr(Config, 'CRDT_SFTP_RETRIES', 3)
-        timeout = getattr(Config, 'CRDT_SFTP_TIMEOUT', 30)
+        return (
+            Config.CRDT_SFTP_HOST,
+            port,
+            Config.CRDT_SFTP_USER,
+            Config.CRDT_SFTP_PASSWORD,
+            Config.CRDT_SFTP_KEY_PATH,
+            getattr(Config, 'CRDT_SFTP_RETRIES', 3),
+            getattr(Config, 'CRDT_SFTP_TIMEOUT', 30),
+        )
+
+    def _sftp_connect(self):
+        """
+        Create and return an active SFTP client connected to the CRDT server.
+        Caller must close both sftp and ssh when finished.
+        Returns: (ssh_client, sftp_client) or (None, None) on failure
+        """
+        host, port, user, password, key_path, retries, timeout = self._sftp_params
 
         for attempt in range(1, retries + 1):
             ssh = None
@@ -89,24 +363,36 @@ class FileHandler:
                 ssh = paramiko.SSHClient()
                 ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
+                # zlib compression must be negotiated during the handshake, so it is a connect option
+                compress = getattr(Config, 'CRDT_SFTP_COMPRESSION', False)
                 if key_path:
-                    pkey = paramiko.RSAKey.from_private_key_file(key_path)
-                    ssh.connect(hostname=host, port=port, username=user, pkey=pkey, timeout=timeout)
+                    # Parse the private key once; reconnects reuse it
+                    if self._sftp_pkey is None:
+                        self._sftp_pkey = paramiko.RSAKey.from_private_key_file(key_path)
+                    ssh.connect(hostname=host, port=port, username=user, pkey=self._sftp_pkey,
+                                timeout=timeout, compress=compress)
                 elif password:
-                    ssh.connect(hostname=host, port=port, username=user, password=password, timeout=timeout)
+                    ssh.connect(hostname=host, port=port, username=user, password=password,
+                                timeout=timeout, compress=compress)
                 else:
-                    ssh.connect(hostname=host, port=port, username=user, timeout=timeout)
+                    ssh.connect(hostname=host, port=port, username=user, timeout=timeout, compress=compress)
 
-                sftp = ssh.open_sftp()
+                # Larger channel window keeps more read/write requests in flight on high-RTT links;
+                # the transport default also covers extra channels (parallel listing, exec)
+                transport = ssh.get_transport()
+                transport.default_window_size = _SFTP_WINDOW_SIZE
+                sftp = paramiko.SFTPClient.from_transport(
+                    transport, window_size=_SFTP_WINDOW_SIZE, max_packet_size=_SFTP_MAX_PACKET
+                )
                 # Increment the server-side counter file via SFTP (best-effort).
                 try:
                     self._increment_crdt_counter_remote(sftp)
                 except Exception as e:
-                    logger.debug(f'Failed to increment remote CRDT counter (non-fatal): {e}')
+                    logger.debug('Failed to increment remote CRDT counter (non-fatal): %s', e)
                 return ssh, sftp
 
             except Exception as e:
-                logger.error(f"SFTP connection failed (attempt {attempt}/{retries}): {e}")
+                logger.error("SFTP connection failed (attempt %s/%s): %s", attempt, retries, e)
                 try:
                     if ssh:
                         ssh.close()
@@ -120,81 +406,142 @@ class FileHandler:
 
         return None, None
 
+    @staticmethod
+    def _close_sftp_pair(ssh, sftp) -> None:
+        """Close an (ssh, sftp) pair, ignoring errors."""
+        for client in (sftp, ssh):
+            try:
+                if client:
+                    client.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def _sftp_session(self):
+        """
+        Borrow a live (ssh, sftp) pair from the pool, connecting only if none is idle.
+
+        The pair goes back to the pool afterwards. If the body raised and the SSH
+        transport is no longer active, the pair is closed instead.
+
+        Yields:
+            tuple: (ssh_client, sftp_client)
+
+        Raises:
+            ConnectionError: If no SFTP connection could be established
+        """
+        ssh = sftp = None
+        while True:
+            try:
+                ssh, sftp = self._sftp_pool.get_nowait()
+            except queue.Empty:
+                ssh = sftp = None
+                break
+            try:
+                # Cheap round-trip to make sure the idle channel still works
+                sftp.normalize('.')
+                break
+            except Exception:
+                self._close_sftp_pair(ssh, sftp)
+
+        if sftp is None:
+            ssh, sftp = self._sftp_connect()
+            if not sftp:
+                raise ConnectionError("Could not connect to CRDT SFTP server")
+
+        try:
+            yield ssh, sftp
+        except Exception:
+            transport = ssh.get_transport()
+            if transport is None or not transport.is_active():
+                self._close_sftp_pair(ssh, sftp)
+                raise
+            self._release_sftp_pair(ssh, sftp)
+            raise
+        else:
+            self._release_sftp_pair(ssh, sftp)
+
+    def _release_sftp_pair(self, ssh, sftp) -> None:
+        """Return a pair to the idle pool, closing it if the pool is full."""
+        try:
+            self._sftp_pool.put_nowait((ssh, sftp))
+        except queue.Full:
+            self._close_sftp_pair(ssh, sftp)
+
+    def close_all(self) -> None:
+        """Close every idle pooled SFTP connection (call on logout/shutdown)."""
+        while True:
+            try:
+                ssh, sftp = self._sftp_pool.get_nowait()
+            except queue.Empty:
+                return
+            self._close_sftp_pair(ssh, sftp)
+
     def _sftp_upload_to_crdt(self, local_path: str, remote_name: str) -> bool:
         """Upload a local file to remote CRDT sync folder via SFTP."""
-        ssh, sftp = self._sftp_connect()
-        if not sftp:
-            return False
         try:
-            remote_dir = Config.CRDT_SFTP_REMOTE_PATH
-            try:
-                # ensure remote directory exists (may raise)
-                sftp.chdir(remote_dir)
-            except IOError:
-                # try to create directories recursively
-                parts = remote_dir.strip('/').split('/')
-                cur = ''
-                for p in parts:
-                    cur = cur + '/' + p
+            with self._sftp_session() as (ssh, sftp):
+                remote_dir = Config.CRDT_SFTP_REMOTE_PATH
+                if remote_dir not in self._ensured_remote_dirs:
                     try:
-                        sftp.chdir(cur)
+                        # ensure remote directory exists (may raise)
+                        sftp.stat(remote_dir)
                     except IOError:
-                        try:
-                            sftp.mkdir(cur)
-                        except Exception:
-                            pass
-                        try:
-                            sftp.chdir(cur)
-                        except Exception:
-                            pass
+                        # try to create directories recursively
+                        parts = remote_dir.strip('/').split('/')
+                        cur = ''
+                        for p in parts:
+                            cur = cur + '/' + p
+                            try:
+                                sftp.mkdir(cur)
+                            except Exception:
+                                pass
+                    # Checked once per handler instead of one stat round-trip per upload
+                    self._ensured_remote_dirs.add(remote_dir)
 
-            remote_path = remote_dir.rstrip('/') + '/' + remote_name
+                remote_path = remote_dir.rstrip('/') + '/' + remote_name
 
-            # Ensure we overwrite existing remote file (remove if present)
-            try:
-                sftp.remove(remote_path)
-            except IOError:
-                # not present --- ok
-                pass
-            except Exception as e:
-                logger.debug(f"Could not remove existing remote file before upload: {e}")
+                # Ensure we overwrite existing remote file (remove if present)
+                try:
+                    sftp.remove(remote_path)
+                except IOError:
+                    # not present --- ok
+                    pass
+                except Exception as e:
+                    logger.debug("Could not remove existing remote file before upload: %s", e)
 
-            sftp.put(local_path, remote_path)
-            logger.debug(f"Uploaded file to remote CRDT folder via SFTP: {remote_path}")
-            return True
+                with _open_streaming(local_path) as local_file:
+                    sftp.putfo(local_file, remote_path, file_size=os.fstat(local_file.fileno()).st_size)
+                logger.debug("Uploaded file to remote CRDT folder via SFTP: %s", remote_path)
+                return True
         except Exception as e:
-            logger.error(f"Failed to upload file via SFTP: {e}")
+            # Re-check the folder next time in case it was removed on the server
+            self._ensured_remote_dirs.clear()
+            logger.error("Failed to upload file via SFTP: %s", e)
             return False
-        finally:
-            try:
-                sftp.close()
-            except Exception:
-                pass
-            try:
-                ssh.close()
-            except Exception:
-                pass
 
     def _sftp_list_crdt_files(self) -> list:
         """List files in remote CRDT folder via SFTP and return metadata list similar to get_user_files."""
-        ssh, sftp = self._sftp_connect()
-        if not sftp:
-            return []
         try:
             remote_dir = Config.CRDT_SFTP_REMOTE_PATH
-            try:
-                files = sftp.listdir_attr(remote_dir)
-            except IOError:
-                return []
+            with self._sftp_session() as (ssh, sftp):
+                try:
+                    files = sftp.listdir_attr(remote_dir)
+                except IOError:
+                    return []
+
+                entries = [(remote_dir.rstrip('/'), attr) for attr in files]
+                if getattr(Config, 'CRDT_PARALLEL_LIST', False):
+                    entries = self._sftp_expand_subdirs(ssh, entries)
 
             result = []
-            for attr in files:
+            for parent, attr in entries:
                 fname = attr.filename
                 if fname.startswith('.') or fname.endswith('.swp'):
                     continue
                 size = attr.st_size
-                mtime = datetime.fromtimestamp(attr.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                fpath = remote_dir.rstrip('/') + '/' + fname
+                mtime = _fmt_ts(int(attr.st_mtime))
+                fpath = parent + '/' + fname
                 file_ext = os.path.splitext(fname)[1].lower()
                 result.append({
                     'id': None,
@@ -209,24 +556,153 @@ class FileHandler:
                 })
             return result
         except Exception as e:
-            logger.error(f"Failed to list remote CRDT files via SFTP: {e}")
+            logger.error("Failed to list remote CRDT files via SFTP: %s", e)
             return []
-        finally:
-            try:
-                sftp.close()
-            except Exception:
-                pass
+
+    def _do_crdt_mirror(self, stored_path: str, original_name: str) -> bool:
+        """
+        Mirror a stored file into the CRDT sync folder (SFTP or local copy).
+
+        Safe to run on the background mirror pool: errors are logged, never raised.
+
+        Args:
+            stored_path: Path of the plaintext file to mirror
+            original_name: Name to use inside the CRDT folder
+
+        Returns:
+            bool: True if the file was mirrored
+        """
+        try:
+            # If configured to use SFTP, upload to remote CRDT folder (overwrite existing)
+            if self._use_sftp:
+                uploaded = self._sftp_upload_to_crdt(stored_path, original_name)
+                if not uploaded:
+                    logger.warning("SFTP mirror to CRDT failed")
+                return uploaded
+
+            crdt_base = Config.CRDT_SYNC_FOLDER
+            if os.path.basename(os.path.normpath(crdt_base)) == 'lww':
+                dest_dir = crdt_base
+            else:
+                dest_dir = os.path.join(crdt_base, 'lww')
+            os.makedirs(dest_dir, exist_ok=True)
+            crdt_dest = os.path.join(dest_dir, original_name)
+            # Overwrite existing file instead of creating a suffixed copy
+            _copy_file_fast(stored_path, crdt_dest)
+            logger.debug("Mirrored file to CRDT sync folder (overwrite): %s", crdt_dest)
+            return True
+        except Exception as crdt_err:
+            # Non-fatal if mirroring fails
+            logger.error("Failed to mirror '%s' to CRDT folder: %s", original_name, crdt_err)
+            return False
+
+    def _queue_crdt_mirror(self, stored_path: str, original_name: str) -> Future:
+        """
+        Mirror a stored file on the background pool, after earlier jobs for the same name.
+
+        Jobs for one CRDT name are chained, so an older upload can never finish
+        last and overwrite lww/<name> (or the SFTP target) with stale content.
+        """
+        with self._mirrors_lock:
+            previous = self._mirror_tails.get(original_name)
+            future = self._mirror_pool.submit(self._chained_crdt_mirror, previous,
+                                              stored_path, original_name)
+            self._mirror_tails[original_name] = future
+            self._pending_mirrors = [f for f in self._pending_mirrors if not f.done()]
+            self._pending_mirrors.append(future)
+        future.add_done_callback(lambda done: self._forget_mirror(original_name, done))
+        return future
+
+    def _chained_crdt_mirror(self, previous: Optional[Future], stored_path: str,
+                             original_name: str) -> bool:
+        """Run _do_crdt_mirror once the previous job for the same name has finished."""
+        # previous was submitted first, so it is already running or done (no deadlock)
+        if previous is not None:
+            wait([previous])
+        return self._do_crdt_mirror(stored_path, original_name)
+
+    def _forget_mirror(self, original_name: str, future: Future) -> None:
+        """Drop a finished job from _mirror_tails unless a newer one replaced it."""
+        with self._mirrors_lock:
+            if self._mirror_tails.get(original_name) is future:
+                del self._mirror_tails[original_name]
+
+    def _after_crdt_mirrors(self, original_name: str, action: Callable[[], None]) -> None:
+        """Run action once all queued mirror jobs for original_name have finished (now if none)."""
+        with self._mirrors_lock:
+            tail = self._mirror_tails.get(original_name)
+        if tail is None:
+            action()
+        else:
+            # Runs immediately if the job has finished in the meantime
+            tail.add_done_callback(lambda _done: action())
+
+    def flush_crdt_mirrors(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for background CRDT mirror jobs started by this handler.
+
+        Call before listing the CRDT folder so freshly uploaded files show up.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits for all)
+
+        Returns:
+            int: Number of mirror jobs still running after the wait
+        """
+        with self._mirrors_lock:
+            pending = list(self._pending_mirrors)
+        if not pending:
+            return 0
+        _, not_done = wait(pending, timeout=timeout)
+        with self._mirrors_lock:
+            # Keep jobs submitted while we were waiting
+            self._pending_mirrors = [f for f in self._pending_mirrors if not f.done()]
+        return len(not_done)
+
+    def _sftp_expand_subdirs(self, ssh, entries: list) -> list:
+        """
+        Replace directory entries of a remote listing with their contents.
+
+        Subdirectories are listed concurrently, each on its own SFTP channel
+        multiplexed over the already-open SSH transport (one level deep).
+
+        Args:
+            ssh: Connected SSHClient whose transport is shared
+            entries: List of (parent_path, SFTPAttributes) tuples
+
+        Returns:
+            list: (parent_path, SFTPAttributes) tuples for non-directory entries
+        """
+        subdirs = [parent + '/' + attr.filename for parent, attr in entries
+                   if S_ISDIR(attr.st_mode or 0) and not attr.filename.startswith('.')]
+        if not subdirs:
+            return entries
+
+        transport = ssh.get_transport()
+
+        def list_subdir(path):
+            channel_sftp = paramiko.SFTPClient.from_transport(transport)
             try:
-                ssh.close()
-            except Exception:
-                pass
+                return [(path, attr) for attr in channel_sftp.listdir_attr(path)]
+            except IOError as e:
+                logger.warning("Could not list remote CRDT subfolder %s: %s", path, e)
+                return []
+            finally:
+                channel_sftp.close()
 
-    def upload_file(self, file_path: str) -> Tuple[bool, str]:
+        expanded = [(parent, attr) for parent, attr in entries if not S_ISDIR(attr.st_mode or 0)]
+        with ThreadPoolExecutor(max_workers=min(4, len(subdirs))) as pool:
+            for listing in pool.map(list_subdir, subdirs):
+                expanded.extend(listing)
+        return expanded
+
+    def upload_file(self, file_path: str, file_hash: Optional[str] = None) -> Tuple[bool, str]:
         """
         Upload a file to user's storage with validation and duplicate detection.
         
         Args:
             file_path: Absolute path to the file to upload
+            file_hash: Precomputed SHA-256 hex digest (computed here if None)
             
         Returns:
             tuple: (success: bool, message: str)
@@ -235,16 +711,17 @@ class FileHandler:
         1. Validates file existence, size, and emptiness
         2. Generates unique filename with UUID
         3. Calculates SHA-256 hash for duplicate detection
-        4. Copies file to user storage
-        5. Optionally encrypts the file
+        4. Copies file to user storage (encrypting it on the way if enabled)
+        5. Mirrors the file to the CRDT sync folder
         6. Saves metadata to database
         """
         stored_path: Optional[str] = None
+        self._upload_local.row = None
         
         try:
             # Validate file existence
             if not os.path.exists(file_path):
-                logger.warning(f"Upload attempted for non-existent file: {file_path}")
+                logger.warning("Upload attempted for non-existent file: %s", file_path)
                 return False, "File does not exist"
             
             if not os.path.isfile(file_path):
@@ -253,7 +730,7 @@ class FileHandler:
             # Validate file size
             file_size = os.path.getsize(file_path)
             if file_size > self.max_file_size:
-                logger.warning(f"File too large: {file_size} bytes (limit: {self.max_file_size})")
+                logger.warning("File too large: %s bytes (limit: %s)", file_size, self.max_file_size)
                 return False, UIConstants.ERROR_FILE_SIZE
             
             if file_size == 0:
@@ -265,125 +742,200 @@ class FileHandler:
             file_extension = os.path.splitext(original_name)[1].lower()
             stored_filename = f"{unique_id}{file_extension}"
             stored_path = os.path.join(self.user_storage_path, stored_filename)
-            
+
             # Calculate file hash for duplicate detection
-            file_hash = self._calculate_file_hash(file_path)
+            file_hash = file_hash or self._calculate_file_hash(file_path)
             if not file_hash:
                 return False, "Failed to calculate file hash"
 
-            # First, check if a file with the same original name already exists for this user
-            existing_by_name = self.db_manager.execute_query(
-                "SELECT id, filename, original_name, file_path FROM files WHERE user_id = ? AND original_name = ? AND is_deleted = 0",
-                (self.user_id, original_name)
-            )
-
-            if existing_by_name:
-                # Overwrite existing file: reuse stored filename/path and update DB record later
-                existing = existing_by_name[0]
-                stored_filename = existing['filename']
-                stored_path = existing['file_path']
-                logger.info(f"Overwriting existing file record id={existing['id']} original_name={original_name}")
-                overwriting_id = existing['id']
-            else:
-                # No existing file with same name -> create new unique filename
-                unique_id = str(uuid.uuid4())
-                file_extension = os.path.splitext(original_name)[1].lower()
-                stored_filename = f"{unique_id}{file_extension}"
-                stored_path = os.path.join(self.user_storage_path, stored_filename)
-                overwriting_id = None
-
-            # If there's still no stored_path (should not happen), ensure it's set
-            if not stored_path:
-                stored_path = os.path.join(self.user_storage_path, stored_filename)
-
-            # Copy file to storage (overwrite if exists)
-            try:
-                shutil.copy2(file_path, stored_path)
-                logger.debug(f"File copied to storage: {stored_path}")
-            except Exception as copy_err:
-                logger.error(f"Failed to copy file to storage: {copy_err}")
-                return False, UIConstants.ERROR_UPLOAD
-
-            # Mirror to CRDT sync folder if configured (copy before optional encryption)
-            try:
-                if hasattr(Config, 'SYNC_TO_CRDT') and Config.SYNC_TO_CRDT:
-                    # If configured to use SFTP, upload to remote CRDT folder (overwrite existing)
-                    if getattr(Config, 'CRDT_USE_SFTP', False):
-                        try:
-                            uploaded = self._sftp_upload_to_crdt(stored_path, original_name)  # pass stored_path to upload file content
-                            if not uploaded:
-                                logger.warning("SFTP mirror to CRDT failed")
-                        except Exception as crdt_err:
-                            logger.error(f"SFTP mirror failed: {crdt_err}")
-                    else:
-                        crdt_base = Config.CRDT_SYNC_FOLDER
-                        if os.path.basename(os.path.normpath(crdt_base)) == 'lww':
-                            dest_dir = crdt_base
-                        else:
-                            dest_dir = os.path.join(crdt_base, 'lww')
-                        os.makedirs(dest_dir, exist_ok=True)
-                        crdt_dest = os.path.join(dest_dir, original_name)
-                        try:
-                            # Overwrite existing file instead of creating a suffixed copy
-                            shutil.copy2(stored_path, crdt_dest)
-                            logger.debug(f"Mirrored file to CRDT sync folder (overwrite): {crdt_dest}")
-                        except Exception as crdt_err:
-                            logger.error(f"Failed to copy file to CRDT folder: {crdt_err}")
-            except Exception:
-                # Non-fatal if mirroring fails
-                pass
-
-            # Encrypt file if enabled
-            if hasattr(Config, 'ENCRYPT_FILES') and Config.ENCRYPT_FILES:
+            # Store the file. With encryption enabled the source is encrypted straight into
+            # storage in one streaming pass, so no plaintext copy is written and removed.
+            encrypt = hasattr(Config, 'ENCRYPT_FILES') and Config.ENCRYPT_FILES
+            if encrypt:
                 encrypted_path = stored_path + '.enc'
-                try:
-                    self.encryption.encrypt_file(stored_path, encrypted_path)
-                    os.remove(stored_path)  # Remove unencrypted file
+                if self.encryption.encrypt_file(file_path, encrypted_path):
                     stored_path = encrypted_path
                     stored_filename += '.enc'
-                    logger.debug(f"File encrypted: {encrypted_path}")
-                except Exception as enc_error:
-                    logger.error(f"Encryption failed: {enc_error}")
+                    logger.debug("File encrypted into storage: %s", encrypted_path)
+                else:
                     # Continue without encryption
+                    logger.error("Encryption failed, storing file unencrypted")
+                    encrypt = False
 
-            # Save or update file metadata to database
-            if overwriting_id:
-                # Update existing record
+            if not encrypt:
+                # Copy file to storage (overwrite if exists)
                 try:
-                    self.db_manager.execute_query(
-                        """UPDATE files SET filename = ?, file_path = ?, file_size = ?, file_hash = ?, upload_date = ? WHERE id = ?""",
-                        (stored_filename, stored_path, file_size, file_hash, datetime.now(), overwriting_id)
-                    )
-                    logger.info(f"File metadata updated for id={overwriting_id}")
-                except Exception as upd_err:
-                    logger.error(f"Failed to update file record: {upd_err}")
+                    _copy_file_fast(file_path, stored_path)
+                    logger.debug("File copied to storage: %s", stored_path)
+                except Exception as copy_err:
+                    logger.error("Failed to copy file to storage: %s", copy_err)
                     return False, UIConstants.ERROR_UPLOAD
-            else:
-                # Insert new record
-                self.db_manager.execute_query(
-                    """INSERT INTO files (user_id, filename, original_name, file_path, 
-                       file_size, file_hash, upload_date) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+
+            # Mirror the plaintext to the CRDT sync folder if configured. The mirror runs on
+            # the background pool so a slow SFTP transfer does not stall the upload. Encrypted
+            # uploads have no plaintext copy in storage, so they mirror the source file inline
+            # while it is still guaranteed to exist.
+            if hasattr(Config, 'SYNC_TO_CRDT') and Config.SYNC_TO_CRDT:
+                if encrypt:
+                    # Let queued jobs for this name land first so they cannot overwrite it
+                    with self._mirrors_lock:
+                        previous = self._mirror_tails.get(original_name)
+                    if previous is not None:
+                        wait([previous])
+                    self._do_crdt_mirror(file_path, original_name)
+                else:
+                    self._queue_crdt_mirror(stored_path, original_name)
+
+            # The check-then-insert and the overwrite must not interleave with another
+            # upload_files_batch worker on the shared connection (two same-named files
+            # would both insert, and one worker's failure rolls back the other's write)
+            with self._db_lock:
+                # Insert new record unless a live file with the same original name exists
+                # (single round-trip in the common, non-duplicate case)
+                upload_date = datetime.now()
+                inserted = self.db_manager.execute_query(
+                    """INSERT INTO files (user_id, filename, original_name, file_path,
+                       file_size, file_hash, upload_date)
+                       SELECT ?, ?, ?, ?, ?, ?, ?
+                       WHERE NOT EXISTS (
+                           SELECT 1 FROM files WHERE user_id = ? AND original_name = ? AND is_deleted = 0
+                       )
+                       RETURNING id, filename, original_name, file_size, file_hash, upload_date""",
                     (self.user_id, stored_filename, original_name, stored_path,
-                     file_size, file_hash, datetime.now())
+                     file_size, file_hash, upload_date, self.user_id, original_name)
                 )
 
-            logger.info(f"File uploaded: '{original_name}' ({self._format_file_size(file_size)}) -> {stored_filename}")
+                if not inserted:
+                    # Overwrite existing record: point it at the new stored file and drop the old one
+                    existing_by_name = self.db_manager.execute_query(
+                        "SELECT id, file_path FROM files WHERE user_id = ? AND original_name = ? AND is_deleted = 0",
+                        (self.user_id, original_name)
+                    )
+                    if not existing_by_name:
+                        logger.error("Duplicate record for '%s' vanished during upload", original_name)
+                        self._cleanup_file(stored_path)
+                        return False, UIConstants.ERROR_UPLOAD
+
+                    existing = existing_by_name[0]
+                    logger.info("Overwriting existing file record id=%s original_name=%s", existing['id'], original_name)
+                    try:
+                        inserted = self.db_manager.execute_query(
+                            """UPDATE files SET filename = ?, file_path = ?, file_size = ?, file_hash = ?, upload_date = ? WHERE id = ?
+                               RETURNING id, filename, original_name, file_size, file_hash, upload_date""",
+                            (stored_filename, stored_path, file_size, file_hash, upload_date, existing['id'])
+                        )
+                        logger.info("File metadata updated for id=%s", existing['id'])
+                    except Exception as upd_err:
+                        logger.error("Failed to update file record: %s", upd_err)
+                        self._cleanup_file(stored_path)
+                        return False, UIConstants.ERROR_UPLOAD
+
+                    if existing['file_path'] != stored_path:
+                        # A queued mirror may still read the superseded file: delete it
+                        # only once the mirror jobs for this name have finished
+                        superseded_path = existing['file_path']
+                        self._after_crdt_mirrors(
+                            original_name, lambda: self._cleanup_file(superseded_path)
+                        )
+
+            self._upload_local.row = dict(inserted[0]) if inserted else None
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("File uploaded: '%s' (%s) -> %s",
+                            original_name, self._format_file_size(file_size), stored_filename)
             return True, UIConstants.SUCCESS_UPLOAD
 
         except PermissionError as e:
-            logger.error(f"Permission denied during file upload: {e}")
+            logger.error("Permission denied during file upload: %s", e)
             self._cleanup_file(stored_path)
             return False, "Permission denied - cannot access file"
         except OSError as e:
-            logger.error(f"OS error during file upload: {e}")
+            logger.error("OS error during file upload: %s", e)
             self._cleanup_file(stored_path)
             return False, "Storage error - disk may be full"
         except Exception as e:
-            logger.error(f"Unexpected error during file upload: {e}", exc_info=True)
+            logger.error("Unexpected error during file upload: %s", e, exc_info=True)
             self._cleanup_file(stored_path)
             return False, UIConstants.ERROR_UPLOAD
     
+    @property
+    def last_uploaded_row(self) -> Optional[Dict[str, Any]]:
+        """
+        The files row written by this thread's last successful upload_file.
+
+        Comes from the INSERT/UPDATE ... RETURNING of that upload, so it needs no
+        extra query and is not confused by concurrent uploads on other threads.
+
+        Returns:
+            Dict with id, filename, original_name, file_size, file_hash and
+            upload_date, or None if the last upload failed
+        """
+        return getattr(self._upload_local, 'row', None)
+    
+    def upload_files_batch(self, file_paths: Iterable[str],
+                           progress_callback: Optional[Callable[[int, str, bool, str], None]] = None,
+                           max_workers: Optional[int] = None
+                           ) -> List[Tuple[bool, str]]:
+        """
+        Upload several files, overlapping hashing, storing and mirroring.
+
+        With one worker and a list of paths, hashes are computed concurrently by
+        _calculate_many_hashes while earlier files are being stored. With several
+        workers, whole uploads run in parallel and the callback fires in completion
+        order. file_paths may be a lazy iterator (e.g. a folder walk): paths are
+        pulled as workers free up, so uploads start before the walk finishes.
+
+        Args:
+            file_paths: Files to upload (list or iterator)
+            progress_callback: Optional callable(index, file_path, success, message)
+                invoked after each file, on the calling thread
+            max_workers: Parallel uploads (defaults to Config.UPLOAD_CONCURRENCY)
+
+        Returns:
+            list: (success, message) per file, in input order
+        """
+        workers = max_workers or getattr(Config, 'UPLOAD_CONCURRENCY', 4)
+        if isinstance(file_paths, list):
+            workers = min(workers, len(file_paths))
+        workers = max(1, workers)
+
+        if workers == 1 and isinstance(file_paths, list):
+            results: List[Tuple[bool, str]] = []
+            hashes = self._calculate_many_hashes(file_paths)
+            for index, (file_path, file_hash) in enumerate(zip(file_paths, hashes)):
+                success, message = self.upload_file(file_path, file_hash=file_hash)
+                results.append((success, message))
+                if progress_callback:
+                    progress_callback(index, file_path, success, message)
+            return results
+
+        by_index: Dict[int, Tuple[bool, str]] = {}
+        pending: Dict[Future, Tuple[int, str]] = {}
+
+        def collect(done):
+            for future in done:
+                index, path = pending.pop(future)
+                try:
+                    success, message = future.result()
+                except Exception as e:
+                    logger.error("Upload worker failed for %s: %s", path, e, exc_info=True)
+                    success, message = False, UIConstants.ERROR_UPLOAD
+                by_index[index] = (success, message)
+                if progress_callback:
+                    progress_callback(index, path, success, message)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload") as pool:
+            for index, path in enumerate(file_paths):
+                # Bound the queue so a huge walk never holds every path/future at once
+                if len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending[pool.submit(self.upload_file, path)] = (index, path)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        return [by_index[index] for index in range(len(by_index))]
+
     def download_file(self, file_id: int, destination_path: str) -> Tuple[bool, str]:
         """
         Download a file from storage to destination path.
@@ -408,7 +960,7 @@ class FileHandler:
             )
             
             if not file_data:
-                logger.warning(f"Download attempted for non-existent file ID: {file_id}")
+                logger.warning("Download attempted for non-existent file ID: %s", file_id)
                 return False, "File not found or access denied"
             
             file_data = file_data[0]
@@ -416,7 +968,7 @@ class FileHandler:
             original_name = file_data['original_name']
             
             if not os.path.exists(stored_path):
-                logger.error(f"File exists in DB but not on disk: {stored_path}")
+                logger.error("File exists in DB but not on disk: %s", stored_path)
                 return False, "File not found in storage"
             
             # Handle encrypted files
@@ -427,34 +979,34 @@ class FileHandler:
                     self.encryption.decrypt_file(stored_path, temp_path)
                     source_path = temp_path
                     cleanup_temp = True
-                    logger.debug(f"File decrypted for download: {temp_path}")
+                    logger.debug("File decrypted for download: %s", temp_path)
                 except Exception as dec_error:
-                    logger.error(f"Decryption failed: {dec_error}")
+                    logger.error("Decryption failed: %s", dec_error)
                     return False, "Failed to decrypt file"
             else:
                 source_path = stored_path
                 cleanup_temp = False
             
-            # Copy file to destination
-            shutil.copy2(source_path, destination_path)
+            # Copy file to destination (kernel-side copy / 1 MiB buffers, metadata preserved)
+            _copy_file_fast(source_path, destination_path)
             
             # Cleanup temporary decrypted file
             if cleanup_temp and temp_path and os.path.exists(temp_path):
                 try:
                     os.remove(temp_path)
-                    logger.debug(f"Cleaned up temporary file: {temp_path}")
+                    logger.debug("Cleaned up temporary file: %s", temp_path)
                 except Exception:
                     pass  # Non-critical error
             
-            logger.info(f"File downloaded: '{original_name}' to {destination_path}")
+            logger.info("File downloaded: '%s' to %s", original_name, destination_path)
             return True, "File downloaded successfully"
             
         except PermissionError as e:
-            logger.error(f"Permission denied during download: {e}")
+            logger.error("Permission denied during download: %s", e)
             self._cleanup_file(temp_path)
             return False, "Permission denied - cannot write to destination"
         except Exception as e:
-            logger.error(f"Unexpected error during download: {e}", exc_info=True)
+            logger.error("Unexpected error during download: %s", e, exc_info=True)
             self._cleanup_file(temp_path)
             return False, "Download failed"
     
@@ -479,7 +1031,7 @@ class FileHandler:
             )
             
             if not file_data:
-                logger.warning(f"Delete attempted for non-existent file ID: {file_id}")
+                logger.warning("Delete attempted for non-existent file ID: %s", file_id)
                 return False, "File not found or access denied"
             
             file_data = file_data[0]
@@ -493,18 +1045,19 @@ class FileHandler:
             )
 
             # Remove physical file (hard delete)
-            if os.path.exists(stored_path):
-                try:
-                    os.remove(stored_path)
-                    logger.debug(f"Physical file removed: {stored_path}")
-                except OSError as e:
-                    logger.warning(f"Could not remove physical file: {e}")
-                    # Database already marked as deleted, so continue
+            try:
+                os.remove(stored_path)
+                logger.debug("Physical file removed: %s", stored_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove physical file: %s", e)
+                # Database already marked as deleted, so continue
 
             # Also attempt to remove mirrored copy from CRDT sync folder (local or SFTP)
             try:
                 if hasattr(Config, 'SYNC_TO_CRDT') and Config.SYNC_TO_CRDT:
-                    if getattr(Config, 'CRDT_USE_SFTP', False):
+                    if self._use_sftp:
                         remote_dir = Config.CRDT_SFTP_REMOTE_PATH
                     else:
                         crdt_base = Config.CRDT_SYNC_FOLDER
@@ -513,17 +1066,17 @@ class FileHandler:
                     remote_path = os.path.join(remote_dir, original_name)
                     ok, msg = self.remove_remote_file(remote_path)
                     if ok:
-                        logger.debug(f"Removed mirrored CRDT file: {remote_path}")
+                        logger.debug("Removed mirrored CRDT file: %s", remote_path)
                     else:
-                        logger.debug(f"Mirror removal returned: {msg}")
+                        logger.debug("Mirror removal returned: %s", msg)
             except Exception as e:
-                logger.error(f"Failed to remove mirrored CRDT file: {e}")
+                logger.error("Failed to remove mirrored CRDT file: %s", e)
 
-            logger.info(f"File deleted: '{original_name}' (ID: {file_id})")
+            logger.info("File deleted: '%s' (ID: %s)", original_name, file_id)
             return True, UIConstants.SUCCESS_DELETE
 
         except Exception as e:
-            logger.error(f"File deletion failed for ID {file_id}: {e}", exc_info=True)
+            logger.error("File deletion failed for ID %s: %s", file_id, e, exc_info=True)
             return False, UIConstants.ERROR_DELETE
     
     def get_user_files(self) -> List[Dict[str, Any]]:
@@ -531,91 +1084,150 @@ class FileHandler:
         Get all non-deleted files for the current user.
 
         Returns:
-            list: List of file dictionaries with metadata
+            list: List of file dictionaries with metadata (empty if the listing
+            failed part-way, never a truncated list)
+        """
+        try:
+            return list(self.iter_user_files())
+        except Exception as e:
+            logger.error("Failed to get user files: %s", e, exc_info=True)
+            return []
+
+    def iter_user_files(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield non-deleted files for the current user one at a time.
+
+        Entries are produced while the CRDT folder is scanned or database rows
+        are streamed, so callers can start rendering before the listing is done.
+
+        Yields:
+            dict: File metadata (same keys as get_user_files entries)
+
+        Raises:
+            Exception: If the listing fails after entries were yielded (errors
+                before the first entry are logged and end an empty listing)
         """
+        count = 0
         try:
             # If configured to use CRDT sync folder as main source, enumerate files there
             if hasattr(Config, 'USE_CRDT_AS_MAIN') and Config.USE_CRDT_AS_MAIN:
                 # If using SFTP, list remote CRDT folder
-                if getattr(Config, 'CRDT_USE_SFTP', False):
-                    result = self._sftp_list_crdt_files()
-                    logger.debug(f"Retrieved {len(result)} files from remote CRDT folder via SFTP")
-                    return result
+                if self._use_sftp:
+                    for entry in self._sftp_list_crdt_files():
+                        count += 1
+                        yield entry
+                    logger.debug("Retrieved %d files from remote CRDT folder via SFTP", count)
+                    return
                 else:
                     crdt_base = Config.CRDT_SYNC_FOLDER
                     crdt_lww = os.path.join(crdt_base, 'lww')
                     scan_dir = crdt_lww if os.path.exists(crdt_lww) else crdt_base
 
                     if os.path.exists(scan_dir):
-                        result = []
-                        for root, dirs, files in os.walk(scan_dir):
-                            for fname in files:
-                                if fname.startswith('.') or fname.endswith('.swp'):
-                                    continue
-                                fpath = os.path.join(root, fname)
-                                try:
-                                    stat = os.stat(fpath)
-                                    size = stat.st_size
-                                    date_str = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                                except Exception:
-                                    size = 0
-                                    date_str = ''
-
-                                file_ext = os.path.splitext(fname)[1].lower()
-
-                                result.append({
-                                    'id': None,
-                                    'filename': fname,
-                                    'original_name': fname,
-                                    'file_size': size,
-                                    'file_size_formatted': self._format_file_size(size),
-                                    'file_hash': None,
-                                    'upload_date': date_str,
-                                    'file_extension': file_ext,
-                                    'file_path': fpath
-                                })
-                        logger.debug(f"Retrieved {len(result)} files from CRDT sync folder: {scan_dir}")
-                        return result
+                        for entry in self._iter_crdt_folder(scan_dir):
+                            count += 1
+                            yield entry
+                        logger.debug("Retrieved %d files from CRDT sync folder: %s", count, scan_dir)
+                        return
                 # Fall through to DB if CRDT folder missing
 
-            files = self.db_manager.execute_query(
-                """SELECT id, filename, original_name, file_size, file_hash, upload_date 
+            query = """SELECT id, filename, original_name, file_size, file_hash, upload_date 
                    FROM files WHERE user_id = ? AND is_deleted = 0 
-                   ORDER BY upload_date DESC""",
-                (self.user_id,)
-            )
-            
-            # Convert to enhanced list of dictionaries
-            result = []
-            for file_data in files:
-                # Format upload date
-                upload_date = file_data['upload_date']
-                if hasattr(upload_date, 'strftime'):
-                    date_str = upload_date.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    date_str = str(upload_date)
-                
-                # Get file extension
-                file_ext = os.path.splitext(file_data['original_name'])[1].lower()
-                
-                result.append({
-                    'id': file_data['id'],
-                    'filename': file_data['filename'],
-                    'original_name': file_data['original_name'],
-                    'file_size': file_data['file_size'],
-                    'file_size_formatted': self._format_file_size(file_data['file_size']),
-                    'file_hash': file_data['file_hash'],
-                    'upload_date': date_str,
-                    'file_extension': file_ext
-                })
-            
-            logger.debug(f"Retrieved {len(result)} files for user {self.user_id}")
-            return result
-            
+                   ORDER BY upload_date DESC"""
+            params = (self.user_id,)
+
+            seen_ids = set()
+            try:
+                for file_data in self.db_manager.execute_query_iter(query, params):
+                    seen_ids.add(file_data['id'])
+                    count += 1
+                    yield self._file_entry(file_data)
+            except Exception as stream_err:
+                # The stream's connection failed mid-way (e.g. dropped by the server):
+                # finish from a buffered query instead of ending the listing early as
+                # if it were complete
+                logger.warning("Streaming file listing failed after %d rows, re-reading: %s",
+                               count, stream_err)
+                for file_data in self.db_manager.execute_query(query, params):
+                    if file_data['id'] not in seen_ids:
+                        count += 1
+                        yield self._file_entry(file_data)
+
+            logger.debug("Retrieved %d files for user %s", count, self.user_id)
+
         except Exception as e:
-            logger.error(f"Failed to get user files: {e}", exc_info=True)
-            return []
-    
+            if count:
+                # Entries were already yielded: a partial listing must not pass as complete
+                raise
+            if isinstance(e, OSError):
+                # Storage or network unavailable: expected at runtime, no traceback needed
+                logger.error("Failed to get user files: %s", e)
+            else:
+                logger.error("Failed to get user files: %s", e, exc_info=True)
+
+    def _file_entry(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an iter_user_files entry from a files row."""
+        # Format upload date
+        upload_date = file_data['upload_date']
+        if hasattr(upload_date, 'strftime'):
+            date_str = upload_date.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            date_str = str(upload_date)
+
+        # Get file extension
+        file_ext = os.path.splitext(file_data['original_name'])[1].lower()
+
+        return {
+            'id': file_data['id'],
+            'filename': file_data['filename'],
+            'original_name': file_data['original_name'],
+            'file_size': file_data['file_size'],
+            'file_size_formatted': self._format_file_size(file_data['file_size']),
+            'file_hash': file_data['file_hash'],
+            'upload_date': date_str,
+            'file_extension': file_ext
+        }
+
+    def _iter_crdt_folder(self, scan_dir: str) -> Iterator[Dict[str, Any]]:
+        """Walk the local CRDT folder with os.scandir, yielding one metadata dict per file."""
+        pending = [scan_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                it = os.scandir(current)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    fname = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    if fname.startswith('.') or fname.endswith('.swp'):
+                        continue
+                    try:
+                        st = entry.stat()
+                        size = st.st_size
+                        date_str = _fmt_ts(int(st.st_mtime))
+                    except OSError:
+                        size = 0
+                        date_str = ''
+
+                    yield {
+                        'id': None,
+                        'filename': fname,
+                        'original_name': fname,
+                        'file_size': size,
+                        'file_size_formatted': self._format_file_size(size),
+                        'file_hash': None,
+                        'upload_date': date_str,
+                        'file_extension': os.path.splitext(fname)[1].lower(),
+                        'file_path': entry.path
+                    }
+
     def get_file_info(self, file_id):
         """Get detailed information about a file"""
         try:
@@ -647,7 +1259,7 @@ class FileHandler:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get file info: {e}")
+            logger.error("Failed to get file info: %s", e)
             return None
     
     def get_storage_stats(self):
@@ -681,7 +1293,7 @@ class FileHandler:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get storage stats: {e}")
+            logger.error("Failed to get storage stats: %s", e)
             return None
     
     def _calculate_file_hash(self, file_path: str) -> Optional[str]:
@@ -695,19 +1307,35 @@ class FileHandler:
             str or None: Hex digest of SHA-256 hash, or None on error
         """
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                # Read in 64KB chunks for efficiency
-                for chunk in iter(lambda: f.read(65536), b""):
-                    sha256_hash.update(chunk)
-            return sha256_hash.hexdigest()
+            # Keep the pages cached: upload_file reads the file again right after hashing
+            with _open_streaming(file_path, drop_cache=False) as f:
+                return _sha256_file(f)
         except IOError as e:
-            logger.error(f"IO error calculating file hash: {e}")
+            logger.error("IO error calculating file hash: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error calculating file hash: {e}")
+            logger.error("Unexpected error calculating file hash: %s", e)
             return None
     
+    def _calculate_many_hashes(self, file_paths: List[str]) -> Iterator[Optional[str]]:
+        """
+        Hash several files concurrently, yielding digests in input order.
+
+        hashlib releases the GIL while digesting large buffers, so the worker
+        threads hash on separate cores.
+
+        Args:
+            file_paths: Paths of files to hash
+
+        Yields:
+            str or None: Hex digest per file, as produced by _calculate_file_hash
+        """
+        if not file_paths:
+            return
+        workers = max(1, min(len(file_paths), os.cpu_count() or 1, 8))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload-hash") as pool:
+            yield from pool.map(self._calculate_file_hash, file_paths)
+    
     def _cleanup_file(self, file_path: Optional[str]) -> None:
         """
         Safely remove a file, ignoring errors.
@@ -715,12 +1343,14 @@ class FileHandler:
         Args:
             file_path: Path to file to remove
         """
-        if file_path and os.path.exists(file_path):
+        if file_path:
             try:
                 os.remove(file_path)
-                logger.debug(f"Cleaned up file: {file_path}")
+                logger.debug("Cleaned up file: %s", file_path)
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                logger.warning(f"Could not cleanup file {file_path}: {e}")
+                logger.warning("Could not cleanup file %s: %s", file_path, e)
     
     def _format_file_size(self, size_bytes: int) -> str:
         """
@@ -732,11 +1362,9 @@ class FileHandler:
         Returns:
             str: Formatted size (e.g., "1.5 MB", "234 KB")
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        # Unit index straight from the bit length (1024 = 2**10 per step), then one division
+        index = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
     
     def cleanup_orphaned_files(self):
         """Clean up files that exist on disk but not in database"""
@@ -745,7 +1373,9 @@ class FileHandler:
             if not os.path.exists(self.user_storage_path):
                 return
             
-            disk_files = set(os.listdir(self.user_storage_path))
+            # scandir exposes the entry type without an extra stat per file
+            with os.scandir(self.user_storage_path) as entries:
+                disk_files = {entry.name for entry in entries if entry.is_file(follow_symlinks=False)}
             
             # Get all files in database
             db_files = self.db_manager.execute_query(
@@ -756,119 +1386,300 @@ class FileHandler:
             db_filenames = set(file_data['filename'] for file_data in db_files)
             
             # Find orphaned files
-            orphaned_files = disk_files - db_filenames
-            
-            # Remove orphaned files
-            for filename in orphaned_files:
-                file_path = os.path.join(self.user_storage_path, filename)
-                try:
-                    os.remove(file_path)
-                    logger.info(f"Removed orphaned file: {filename}")
-                except Exception as e:
-                    logger.error(f"Failed to remove orphaned file {filename}: {e}")
-            
+            orphaned_files = [os.path.join(self.user_storage_path, name) for name in disk_files - db_filenames]
+
+            # Remove all orphans in one batch (user storage is always local)
+            removed, errors = self._unlink_many(orphaned_files)
+            for path in removed:
+                logger.debug("Removed orphaned file: %s", os.path.basename(path))
+            if removed:
+                logger.info("Removed %d orphaned files from %s", len(removed), self.user_storage_path)
+            for path, err in errors.items():
+                logger.error("Failed to remove orphaned file %s: %s", os.path.basename(path), err)
+
             return len(orphaned_files)
             
         except Exception as e:
-            logger.error(f"Cleanup failed: {e}")
+            logger.error("Cleanup failed: %s", e)
             return 0
 
-    def _sftp_download_from_crdt(self, remote_path: str, local_path: str) -> bool:
+    @_with_sftp
+    def _sftp_download_from_crdt(self, ssh, sftp, remote_path: str, local_path: str) -> bool:
         """Download a file from remote CRDT folder via SFTP to local path."""
-        ssh, sftp = self._sftp_connect()
-        if not sftp:
-            return False
+        # Download next to the target and rename, so an interrupted transfer never
+        # leaves a truncated file under the final name
+        tmp_path = local_path + '.part'
         try:
-            # Ensure local dir exists
-            local_dir = os.path.dirname(local_path)
-            if local_dir and not os.path.exists(local_dir):
-                os.makedirs(local_dir, exist_ok=True)
-
-            sftp.get(remote_path, local_path)
-            logger.debug(f"Downloaded remote CRDT file via SFTP: {remote_path} -> {local_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to download file via SFTP: {e}")
-            return False
-        finally:
-            try:
-                sftp.close()
-            except Exception:
-                pass
-            try:
-                ssh.close()
-            except Exception:
-                pass
+            # prefetch() pipelines the read requests instead of waiting on each 32 KB reply
+            with sftp.open(remote_path, 'rb') as remote_file:
+                remote_file.prefetch()
+                with open(tmp_path, 'wb') as local_file:
+                    shutil.copyfileobj(remote_file, local_file, 1024 * 1024)
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            self._cleanup_file(tmp_path)
+            raise
+        logger.debug("Downloaded remote CRDT file via SFTP: %s -> %s", remote_path, local_path)
+        return True
 
-    def _sftp_delete_from_crdt(self, remote_path: str) -> bool:
+    @_with_sftp
+    def _sftp_delete_from_crdt(self, ssh, sftp, remote_path: str) -> bool:
         """Delete a file from remote CRDT folder via SFTP."""
-        ssh, sftp = self._sftp_connect()
-        if not sftp:
-            return False
         try:
             sftp.remove(remote_path)
-            logger.debug(f"Removed remote CRDT file via SFTP: {remote_path}")
-            return True
         except IOError as e:
-            logger.warning(f"Remote file not found or cannot remove via SFTP: {e}")
+            logger.warning("Remote file not found or cannot remove via SFTP: %s", e)
             return False
+        logger.debug("Removed remote CRDT file via SFTP: %s", remote_path)
+        return True
+
+    @staticmethod
+    def _unlink_many(paths: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Unlink local files, overlapping the I/O across a few threads.
+
+        With Config.USE_IO_URING and the liburing bindings installed, the unlinks
+        are batched through io_uring instead.
+
+        Args:
+            paths: Local file paths to remove
+
+        Returns:
+            tuple: (removed paths, {path: error message} for failures)
+        """
+        removed: List[str] = []
+        errors: Dict[str, str] = {}
+
+        if (paths and liburing is not None and getattr(Config, 'USE_IO_URING', False)
+                and sys.platform.startswith('linux')):
+            try:
+                _io_uring_bulk_unlink(paths, removed, errors)
+                return removed, errors
+            except Exception as e:
+                logger.debug("io_uring unlink unavailable, using os.unlink: %s", e)
+                done = set(removed).union(errors)
+                paths = [p for p in paths if p not in done]
+
+        def unlink(path):
+            try:
+                os.unlink(path)
+                removed.append(path)
+            except FileNotFoundError:
+                errors[path] = "File not found on local filesystem"
+            except OSError as e:
+                errors[path] = str(e)
+
+        if len(paths) == 1:
+            unlink(paths[0])
+        elif paths:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                list(pool.map(unlink, paths))
+        return removed, errors
+
+    def remove_remote_files(self, remote_paths: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Remove several CRDT files in one go (local filesystem or SFTP depending on config).
+
+        In SFTP mode every remove runs on a single pooled session. Batches larger
+        than Config.CRDT_SFTP_BULK_THRESHOLD are removed with remote 'rm -f'
+        commands instead, in which case paths that were already gone count as removed.
+
+        Args:
+            remote_paths: Paths to remove
+
+        Returns:
+            tuple: (removed paths, {path: error message} for failures)
+        """
+        if not remote_paths:
+            return [], {}
+        if not self._use_sftp:
+            return self._unlink_many(list(remote_paths))
+
+        removed: List[str] = []
+        errors: Dict[str, str] = {}
+        try:
+            with self._sftp_session() as (ssh, sftp):
+                pending = list(remote_paths)
+                if len(pending) > getattr(Config, 'CRDT_SFTP_BULK_THRESHOLD', 32):
+                    pending = self._sftp_bulk_delete(ssh, pending, removed)
+                for path in pending:
+                    try:
+                        sftp.remove(path)
+                        removed.append(path)
+                    except IOError as e:
+                        errors[path] = str(e)
         except Exception as e:
-            logger.error(f"Failed to delete remote file via SFTP: {e}")
-            return False
-        finally:
+            logger.error("Batch SFTP delete failed: %s", e)
+            for path in remote_paths:
+                if path not in removed:
+                    errors.setdefault(path, str(e))
+        logger.debug("Removed %d/%d remote CRDT files via SFTP", len(removed), len(remote_paths))
+        return removed, errors
+
+    @staticmethod
+    def _sftp_bulk_delete(ssh, remote_paths: List[str], removed: List[str],
+                          max_command_bytes: int = 100 * 1024) -> List[str]:
+        """
+        Remove remote files with 'rm -f' commands, one round-trip per ~100 KB of paths.
+
+        Args:
+            ssh: Connected SSH client (shares the pooled transport)
+            remote_paths: Remote paths to remove
+            removed: Receives the paths removed by successful commands
+            max_command_bytes: Upper bound on one command line (stays below ARG_MAX)
+
+        Returns:
+            list: Paths still to be removed (commands that failed or exec unsupported)
+        """
+        chunks: List[List[str]] = [[]]
+        size = 0
+        for path in remote_paths:
+            quoted_len = len(shlex.quote(path)) + 1
+            if chunks[-1] and size + quoted_len > max_command_bytes:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(path)
+            size += quoted_len
+
+        leftover: List[str] = []
+        for index, chunk in enumerate(chunks):
             try:
-                sftp.close()
-            except Exception:
-                pass
+                _, stdout, stderr = ssh.exec_command("rm -f -- " + " ".join(shlex.quote(p) for p in chunk))
+                status = stdout.channel.recv_exit_status()
+            except Exception as e:
+                # e.g. SFTP-only account without shell access: let the caller use sftp.remove
+                logger.debug("Remote rm unavailable, falling back to SFTP remove: %s", e)
+                for rest in chunks[index:]:
+                    leftover.extend(rest)
+                return leftover
+            if status == 0:
+                removed.extend(chunk)
+            else:
+                logger.debug("Remote rm exited with %s: %s", status, stderr.read().decode(errors='replace').strip())
+                leftover.extend(chunk)
+        return leftover
+
+    def _ensure_dir(self, path: str) -> None:
+        """Create a local directory once per handler; later calls for the same path are free."""
+        if path and path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+
+    def _ensure_dirs(self, dest_paths: Iterable[str]) -> None:
+        """
+        Create the distinct parent folders of dest_paths.
+
+        Failures are ignored here: the affected fetches then fail individually
+        and report the error for their own destination.
+        """
+        for parent in {os.path.dirname(path) for path in dest_paths}:
             try:
-                ssh.close()
-            except Exception:
+                self._ensure_dir(parent)
+            except OSError:
                 pass
 
+    def invalidate_dir_cache(self) -> None:
+        """Forget directories created by _ensure_dir (call after removing directory trees)."""
+        self._ensured_dirs.clear()
+
     def fetch_remote_file(self, remote_path: str, local_dest: str) -> (bool, str):
         """Fetch a file either from local filesystem or via SFTP depending on config.
         Returns (success, error_message_or_empty).
         """
+        return self._fetch_remote_file(remote_path, local_dest, ensure_parent=True)
+
+    def _fetch_remote_file(self, remote_path: str, local_dest: str, ensure_parent: bool) -> Tuple[bool, str]:
+        """fetch_remote_file body; ensure_parent=False when the caller already created the parent."""
+        tmp_dest = local_dest + '.part'
         try:
-            if getattr(Config, 'CRDT_USE_SFTP', False):
+            if ensure_parent:
+                self._ensure_dir(os.path.dirname(local_dest))
+
+            if self._use_sftp:
+                # The SFTP helper logs and reports its own failures
                 ok = self._sftp_download_from_crdt(remote_path, local_dest)
                 return (ok, "" if ok else "SFTP download failed")
-            else:
-                # local copy
-                try:
-                    # Ensure parent exists
-                    parent = os.path.dirname(local_dest)
-                    if parent and not os.path.exists(parent):
-                        os.makedirs(parent, exist_ok=True)
-                    shutil.copy2(remote_path, local_dest)
-                    return (True, "")
-                except Exception as e:
-                    logger.error(f"Local copy from CRDT path failed: {e}")
-                    return (False, str(e))
-        except Exception as e:
-            logger.error(f"fetch_remote_file failed: {e}")
+
+            # local copy
+            try:
+                _copy_file_fast(remote_path, tmp_dest)
+            except OSError:
+                # Kernel copy paths unavailable for this pair of files
+                shutil.copy2(remote_path, tmp_dest)
+            # Atomic within the filesystem: readers see the old file or the complete copy
+            os.replace(tmp_dest, local_dest)
+            return (True, "")
+        except (OSError, shutil.SameFileError) as e:
+            self._cleanup_file(tmp_dest)
+            logger.error("Fetch from CRDT path failed: %s", e)
             return (False, str(e))
 
+    def fetch_remote_files(self, pairs: List[Tuple[str, str]],
+                           concurrency: Optional[int] = None) -> List[Tuple[bool, str]]:
+        """
+        Fetch several remote files concurrently.
+
+        Each worker borrows its own pooled SFTP session, so transfers run on
+        separate connections instead of queueing behind one another.
+
+        Args:
+            pairs: (remote_path, local_dest) tuples
+            concurrency: Worker threads (defaults to Config.CRDT_SFTP_CONCURRENCY)
+
+        Returns:
+            list: (success, error_message_or_empty) per pair, in input order
+        """
+        if not pairs:
+            return []
+        workers = concurrency or getattr(Config, 'CRDT_SFTP_CONCURRENCY', 4)
+        workers = max(1, min(workers, len(pairs)))
+        # Create each distinct destination folder once up front instead of per file
+        self._ensure_dirs(local for _, local in pairs)
+        if workers == 1:
+            return [self._fetch_remote_file(remote, local, False) for remote, local in pairs]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crdt-fetch") as pool:
+            return list(pool.map(lambda pair: self._fetch_remote_file(pair[0], pair[1], False), pairs))
+
+    async def fetch_remote_file_async(self, remote_path: str, local_dest: str) -> Tuple[bool, str]:
+        """Awaitable fetch_remote_file; the blocking transfer runs on the shared I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, self.fetch_remote_file, remote_path, local_dest)
+
+    async def remove_remote_file_async(self, remote_path: str) -> Tuple[bool, str]:
+        """Awaitable remove_remote_file; the blocking call runs on the shared I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, self.remove_remote_file, remote_path)
+
+    async def fetch_many(self, pairs: List[Tuple[str, str]]) -> List[Tuple[bool, str]]:
+        """
+        Fetch several remote files concurrently from an event loop.
+
+        Args:
+            pairs: (remote_path, local_dest) tuples
+
+        Returns:
+            list: (success, error_message_or_empty) per pair, in input order
+        """
+        return list(await asyncio.gather(
+            *(self.fetch_remote_file_async(remote, local) for remote, local in pairs)
+        ))
+
     def remove_remote_file(self, remote_path: str) -> (bool, str):
         """Remove a file either from local filesystem or via SFTP depending on config.
         Returns (success, error_message_or_empty).
         """
+        if self._use_sftp:
+            # The SFTP helper logs and reports its own failures
+            ok = self._sftp_delete_from_crdt(remote_path)
+            return (ok, "" if ok else "SFTP delete failed")
+
         try:
-            if getattr(Config, 'CRDT_USE_SFTP', False):
-                ok = self._sftp_delete_from_crdt(remote_path)
-                return (ok, "" if ok else "SFTP delete failed")
-            else:
-                try:
-                    if os.path.exists(remote_path):
-                        os.remove(remote_path)
-                        return (True, "")
-                    else:
-                        return (False, "File not found on local filesystem")
-                except Exception as e:
-                    logger.error(f"Local delete from CRDT path failed: {e}")
-                    return (False, str(e))
-        except Exception as e:
-            logger.error(f"remove_remote_file failed: {e}")
+            os.unlink(remote_path)
+            return (True, "")
+        except FileNotFoundError:
+            return (False, "File not found on local filesystem")
+        except OSError as e:
+            logger.error("Local delete from CRDT path failed: %s", e)
             return (False, str(e))
 
     def _increment_crdt_counter_remote(self, sftp) -> int:
@@ -900,7 +1711,7 @@ class FileHandler:
                 # file does not exist remotely; we'll create it
                 current = 0
             except Exception as e:
-                logger.debug(f'Could not read remote counter file: {e}')
+                logger.debug('Could not read remote counter file: %s', e)
                 current = 0
 
             new_val = current + 1
@@ -922,17 +1733,17 @@ class FileHandler:
                     try:
                         sftp.rename(tmp_remote, remote_path)
                     except Exception as e:
-                        logger.warning(f'Failed to move temp counter file into place: {e}')
+                        logger.warning('Failed to move temp counter file into place: %s', e)
                         try:
                             sftp.remove(tmp_remote)
                         except Exception:
                             pass
                         return -1
 
-                logger.debug(f'Remote CRDT g_counter incremented: {current} -> {new_val} ({remote_path})')
+                logger.debug('Remote CRDT g_counter incremented: %s -> %s (%s)', current, new_val, remote_path)
                 return new_val
             except Exception as e:
-                logger.warning(f'Failed to write remote CRDT counter file: {e}')
+                logger.warning('Failed to write remote CRDT counter file: %s', e)
                 try:
                     # attempt to cleanup tmp
                     sftp.remove(tmp_remote)
@@ -941,5 +1752,5 @@ class FileHandler:
                 return -1
 
         except Exception as e:
-            logger.warning(f'Unexpected error incrementing remote CRDT counter: {e}')
+            logger.warning('Unexpected error incrementing remote CRDT counter: %s', e)
             return -1
\ No newline at end of file
@@ -4,16 +4,73 @@ Main application interface after login - Adobe Creative Cloud inspired design
 """
 
 import customtkinter as ctk
-from tkinter import messagebox, filedialog, Toplevel, Text, END
+from tkinter import messagebox, filedialog, Toplevel, Text, END, Frame
 import logging
 import os
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import MappingProxyType
 
 from ..file_manager.file_handler import FileHandler
+from ..utils.helpers import format_file_size
 
 logger = logging.getLogger(__name__)
 
+# File grid virtualization: cards per row, rows rendered beyond the viewport on
+# each side, and the row height (card + grid padding) assumed until measured
+_GRID_COLUMNS = 3
+_CARD_BUFFER_ROWS = 2
+_DEFAULT_CARD_ROW_HEIGHT = 200
+
+# Longest a refresh waits for in-flight CRDT mirror uploads (seconds); slower
+# mirrors show up on a later refresh instead of stalling the list
+_MIRROR_FLUSH_TIMEOUT = 0.5
+
+# Emoji icon per file extension (built once, shared by every card)
+_FILE_ICONS = MappingProxyType({
+    'pdf': '📄',
+    'doc': '📝', 'docx': '📝',
+    'xls': '📊', 'xlsx': '📊',
+    'ppt': '📊', 'pptx': '📊',
+    'txt': '📃',
+    'jpg': '🖼️', 'jpeg': '🖼️', 'png': '🖼️', 'gif': '🖼️', 'bmp': '🖼️',
+    'zip': '📦', 'rar': '📦', '7z': '📦', 'tar': '📦', 'gz': '📦',
+    'mp3': '🎵', 'wav': '🎵', 'mp4': '🎬', 'avi': '🎬',
+    'py': '🐍', 'js': '📜', 'html': '🌐', 'css': '🎨',
+})
+
+# Extensions (without dot) for the sidebar category filters
+_DOC_EXTS = frozenset({'pdf', 'doc', 'docx', 'txt', 'xls', 'xlsx', 'ppt', 'pptx'})
+_IMG_EXTS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'svg', 'webp'})
+_ARC_EXTS = frozenset({'zip', 'rar', '7z', 'tar', 'gz'})
+_FILTER_EXTS = MappingProxyType({
+    "documents": _DOC_EXTS,
+    "images": _IMG_EXTS,
+    "archives": _ARC_EXTS,
+})
+
+
+def _iter_files(folder):
+    """Yield every regular file below folder (depth-first, os.scandir based)"""
+    try:
+        entries = os.scandir(folder)
+    except OSError as e:
+        logger.warning(f"Cannot read folder {folder}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+            except OSError:
+                continue
+
+
 class Dashboard:
     def __init__(self, parent, auth_manager, db_manager, logout_callback, colors):
         self.parent = parent
@@ -23,9 +80,55 @@ class Dashboard:
         self.colors = colors
         self.file_handler = FileHandler(db_manager, auth_manager.get_current_user()['id'])
         
+        # Shared fonts (one CTkFont per size/weight), keyed like '13' or '20_bold'
+        self._fonts = {
+            '10_bold': ctk.CTkFont(size=10, weight="bold"),
+            '12': ctk.CTkFont(size=12),
+            '13': ctk.CTkFont(size=13),
+            '13_bold': ctk.CTkFont(size=13, weight="bold"),
+            '14': ctk.CTkFont(size=14),
+            '14_bold': ctk.CTkFont(size=14, weight="bold"),
+            '16': ctk.CTkFont(size=16),
+            '18_bold': ctk.CTkFont(size=18, weight="bold"),
+            '20_bold': ctk.CTkFont(size=20, weight="bold"),
+            '28_bold': ctk.CTkFont(size=28, weight="bold"),
+            '48': ctk.CTkFont(size=48),
+        }
+
         # Current view filter
         self.current_filter = "all"  # all, documents, images, archives
 
+        # File cards built so far; refreshes reconfigure them instead of rebuilding widgets
+        self._card_pool = []
+        self._empty_state = None
+
+        # Virtualized grid: only cards for rows near the viewport exist in the grid;
+        # spacer frames above and below stand in for the others
+        self._view_files = []
+        self._rendered_window = None
+        self._card_row_height = None
+        self._sized_rows = (0, 0)   # (card rows with a fixed minsize, that minsize)
+        self._top_spacer = None
+        self._bottom_spacer = None
+        self._render_after_id = None
+
+        # File options dialog, built on first use and reused (see show_file_options)
+        self._options_dialog = None
+        self._options_file = None
+
+        # Pending debounced search refresh (Tk after id)
+        self._search_after_id = None
+
+        # Last fetched file list; filters and searches run over it in memory.
+        # Reset to None whenever files are uploaded or deleted.
+        self._files_cache = None
+
+        # Fetching/filtering for the file view runs on this worker; results are applied on
+        # the Tk thread only if no newer refresh was requested meanwhile
+        self._view_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-view")
+        self._view_future = None
+        self._view_generation = 0
+
         # Create main container
         self.main_frame = ctk.CTkFrame(parent, fg_color=colors['dark'])
         self.main_frame.pack(fill="both", expand=True)
@@ -50,7 +153,7 @@ class Dashboard:
         app_title = ctk.CTkLabel(
             sidebar,
             text="NetGuardian",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self._fonts['20_bold'],
             text_color=self.colors['primary']
         )
         app_title.pack(pady=(30, 10), padx=20)
@@ -62,7 +165,7 @@ class Dashboard:
         user_label = ctk.CTkLabel(
             user_frame,
             text=f"  👤  {self.auth_manager.get_current_user()['username']}",
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             text_color=self.colors['light'],
             anchor="w"
         )
@@ -76,7 +179,7 @@ class Dashboard:
         nav_label = ctk.CTkLabel(
             sidebar,
             text="NAVIGATION",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=self._fonts['10_bold'],
             text_color=self.colors['secondary'],
             anchor="w"
         )
@@ -89,7 +192,7 @@ class Dashboard:
             command=lambda: self.switch_filter("all"),
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color=self.colors['primary'],
             hover_color=self.colors['secondary'],
             anchor="w",
@@ -97,6 +200,8 @@ class Dashboard:
             text_color=self.colors['light']
         )
         self.nav_all_btn.pack(padx=20, pady=5, anchor="w")
+        # Highlighted category button; switch_filter restyles only it and the new one
+        self._active_filter_btn = self.nav_all_btn
 
         # Upload button
         self.nav_upload_btn = ctk.CTkButton(
@@ -105,7 +210,7 @@ class Dashboard:
             command=self.upload_files,
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color=self.colors['gray'],
             anchor="w",
@@ -122,7 +227,7 @@ class Dashboard:
             command=self.create_text_document,
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color=self.colors['gray'],
             anchor="w",
@@ -140,7 +245,7 @@ class Dashboard:
         cat_label = ctk.CTkLabel(
             sidebar,
             text="CATEGORIES",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=self._fonts['10_bold'],
             text_color="#808080",
             anchor="w"
         )
@@ -153,7 +258,7 @@ class Dashboard:
             command=lambda: self.switch_filter("documents"),
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             anchor="w",
@@ -170,7 +275,7 @@ class Dashboard:
             command=lambda: self.switch_filter("images"),
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             anchor="w",
@@ -187,7 +292,7 @@ class Dashboard:
             command=lambda: self.switch_filter("archives"),
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             anchor="w",
@@ -209,7 +314,7 @@ class Dashboard:
         settings_label = ctk.CTkLabel(
             sidebar,
             text="SETTINGS",
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=self._fonts['10_bold'],
             text_color="#808080",
             anchor="w"
         )
@@ -222,7 +327,7 @@ class Dashboard:
             command=self.logout_callback,
             width=180,
             height=40,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#FF6B6B",
             text_color="#CCCCCC",
@@ -257,52 +362,46 @@ class Dashboard:
         top_bar.pack_propagate(False)
         
         # Search bar
-        search_frame = ctk.CTkFrame(top_bar, fg_color="transparent")
-        search_frame.pack(side="left", padx=20, pady=15)
-        
         self.search_entry = ctk.CTkEntry(
-            search_frame,
+            top_bar,
             placeholder_text="🔍 Search files...",
             width=300,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="#1A1A1A",
             border_color="#404040"
         )
-        self.search_entry.pack(side="left")
+        self.search_entry.pack(side="left", padx=20, pady=15)
         self.search_entry.bind('<KeyRelease>', self.on_search)
         
-        # Right side actions
-        actions_frame = ctk.CTkFrame(top_bar, fg_color="transparent")
-        actions_frame.pack(side="right", padx=20, pady=15)
-        
+        # Right side actions (packed right to left)
         # Refresh button
         refresh_btn = ctk.CTkButton(
-            actions_frame,
+            top_bar,
             text="🔄",
-            command=self.refresh_file_list,
+            command=self.reload_file_list,
             width=35,
             height=35,
-            font=ctk.CTkFont(size=16),
+            font=self._fonts['16'],
             fg_color="#1A1A1A",
             hover_color="#3A3A3A",
             corner_radius=6
         )
-        refresh_btn.pack(side="right", padx=5)
+        refresh_btn.pack(side="right", padx=(5, 25), pady=15)
         
         # Settings icon
         settings_btn = ctk.CTkButton(
-            actions_frame,
+            top_bar,
             text="⚙️",
             command=self.show_settings,
             width=35,
             height=35,
-            font=ctk.CTkFont(size=16),
+            font=self._fonts['16'],
             fg_color="#1A1A1A",
             hover_color="#3A3A3A",
             corner_radius=6
         )
-        settings_btn.pack(side="right", padx=5)
+        settings_btn.pack(side="right", padx=5, pady=15)
     
     def create_tab_navigation(self, parent):
         """Create tab navigation (All Apps/Desktop/Mobile/Web style)"""
@@ -321,7 +420,7 @@ class Dashboard:
             command=lambda: self.switch_view_tab("all"),
             width=100,
             height=30,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             border_width=0,
@@ -336,7 +435,7 @@ class Dashboard:
             command=lambda: self.switch_view_tab("recent"),
             width=100,
             height=30,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             border_width=0,
@@ -351,7 +450,7 @@ class Dashboard:
             command=lambda: self.switch_view_tab("shared"),
             width=100,
             height=30,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             border_width=0,
@@ -361,6 +460,7 @@ class Dashboard:
         
         # Highlight current tab
         self.highlight_tab(self.tab_all)
+        self._active_tab = self.tab_all
     
     def create_hero_banner(self, parent):
         """Create hero banner similar to Adobe CC"""
@@ -385,7 +485,7 @@ class Dashboard:
         welcome_title = ctk.CTkLabel(
             content_frame,
             text="Welcome to NetGuardian",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self._fonts['28_bold'],
             text_color="white"
         )
         welcome_title.pack(anchor="w", pady=(10, 5))
@@ -393,7 +493,7 @@ class Dashboard:
         subtitle = ctk.CTkLabel(
             content_frame,
             text="Secure cloud storage for all your files. Upload, manage and share with ease.",
-            font=ctk.CTkFont(size=14),
+            font=self._fonts['14'],
             text_color="#CCCCCC"
         )
         subtitle.pack(anchor="w", pady=(0, 20))
@@ -405,7 +505,7 @@ class Dashboard:
             command=self.upload_files,
             width=140,
             height=40,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._fonts['14_bold'],
             fg_color="white",
             text_color="#1A1A1A",
             hover_color="#E0E0E0",
@@ -426,7 +526,7 @@ class Dashboard:
         self.section_title = ctk.CTkLabel(
             header_frame,
             text="All Files",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self._fonts['20_bold'],
             text_color="white",
             anchor="w"
         )
@@ -439,7 +539,7 @@ class Dashboard:
             command=self.upload_folder,
             width=140,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="#3A3A3A",
             hover_color="#4A4A4A",
             corner_radius=8
@@ -458,6 +558,9 @@ class Dashboard:
         self.files_scrollable.grid_columnconfigure(0, weight=1)
         self.files_scrollable.grid_columnconfigure(1, weight=1)
         self.files_scrollable.grid_columnconfigure(2, weight=1)
+
+        # Re-render the visible cards whenever the view moves (wheel, scrollbar drag, resize)
+        self.files_scrollable._parent_canvas.configure(yscrollcommand=self._on_files_yscroll)
     
     def upload_files(self):
         """Handle file upload"""
@@ -486,65 +589,72 @@ class Dashboard:
             folder_path = filedialog.askdirectory(title="Select folder to upload")
             
             if folder_path:
-                # Get all files in folder and subfolders
-                file_paths = []
-                for root, dirs, files in os.walk(folder_path):
-                    for file in files:
-                        file_paths.append(os.path.join(root, file))
-                
-                if file_paths:
-                    self.process_uploads(file_paths)
-                else:
-                    messagebox.showinfo("Info", "Selected folder is empty")
+                # Files in folder and subfolders are walked lazily while uploading
+                self.process_uploads(_iter_files(folder_path))
                     
         except Exception as e:
             logger.error(f"Folder upload error: {e}")
             messagebox.showerror("Error", "Failed to upload folder")
     
     def process_uploads(self, file_paths):
-        """Process multiple file uploads"""
+        """
+        Process multiple file uploads in the background, keeping the UI responsive
+
+        Args:
+            file_paths: Sequence of paths, or an iterator (e.g. a folder walk)
+                        whose length is unknown until it is exhausted
+        """
+        total = len(file_paths) if hasattr(file_paths, '__len__') else None
         try:
             # Create progress dialog
-            progress_dialog = UploadProgressDialog(self.parent, len(file_paths), self.colors)
-            
-            uploaded = 0
-            failed = 0
-            
-            for i, file_path in enumerate(file_paths):
-                try:
-                    success, message = self.file_handler.upload_file(file_path)
-                    if success:
-                        uploaded += 1
-                    else:
-                        failed += 1
-                        logger.warning(f"Failed to upload {file_path}: {message}")
-                    
-                    # Update progress
-                    progress_dialog.update_progress(i + 1, os.path.basename(file_path))
-                    
-                except Exception as e:
-                    failed += 1
-                    logger.error(f"Upload error for {file_path}: {e}")
-            
+            progress_dialog = UploadProgressDialog(self.parent, total, self.colors)
+        except Exception as e:
+            logger.error(f"Upload process error: {e}")
+            messagebox.showerror("Error", "Upload process failed")
+            return
+
+        counts = {'done': 0, 'uploaded': 0, 'failed': 0}
+
+        def on_file_done(index, file_path, success, message):
+            # Runs on the upload thread; Tk widgets are only touched via after()
+            counts['done'] += 1
+            if success:
+                counts['uploaded'] += 1
+            else:
+                counts['failed'] += 1
+                logger.warning(f"Failed to upload {file_path}: {message}")
+            self.parent.after(0, progress_dialog.update_progress, counts['done'], os.path.basename(file_path))
+
+        def finish(error=None):
             progress_dialog.close()
-            
-            # Show result
-            if uploaded > 0:
+            if error is not None:
+                messagebox.showerror("Error", "Upload process failed")
+            elif counts['done'] == 0:
+                messagebox.showinfo("Info", "Selected folder is empty")
+            elif counts['uploaded'] > 0:
                 messagebox.showinfo("Upload Complete", 
-                                  f"Successfully uploaded {uploaded} files.\n"
-                                  f"Failed: {failed} files.")
+                                  f"Successfully uploaded {counts['uploaded']} files.\n"
+                                  f"Failed: {counts['failed']} files.")
+                self._files_cache = None
                 self.refresh_file_list()
             else:
                 messagebox.showerror("Upload Failed", "No files were uploaded successfully.")
-                
-        except Exception as e:
-            logger.error(f"Upload process error: {e}")
-            messagebox.showerror("Error", "Upload process failed")
+
+        def run():
+            try:
+                # Files are hashed, stored and mirrored by several workers at once
+                paths = list(file_paths) if total is not None else file_paths
+                self.file_handler.upload_files_batch(paths, progress_callback=on_file_done)
+            except Exception as e:
+                logger.error(f"Upload process error: {e}")
+                self.parent.after(0, finish, e)
+                return
+            self.parent.after(0, finish)
+
+        threading.Thread(target=run, name="upload-batch", daemon=True).start()
     
     def switch_filter(self, filter_type):
         """Switch file category filter"""
-        self.current_filter = filter_type
-        
         # Update sidebar button colors
         buttons = {
             "all": self.nav_all_btn,
@@ -552,29 +662,34 @@ class Dashboard:
             "images": self.nav_images_btn,
             "archives": self.nav_archives_btn
         }
-        
-        for key, btn in buttons.items():
-            if key == filter_type:
-                btn.configure(fg_color=self.colors['primary'])
-            else:
-                btn.configure(fg_color="transparent")
+        new_btn = buttons.get(filter_type)
+        if new_btn is None or new_btn is self._active_filter_btn:
+            return
+
+        self.current_filter = filter_type
+
+        # Only the previously active and the newly active button change style
+        self._active_filter_btn.configure(fg_color="transparent")
+        new_btn.configure(fg_color=self.colors['primary'])
+        self._active_filter_btn = new_btn
         
         self.refresh_file_list()
     
     def switch_view_tab(self, tab_name):
         """Switch between view tabs"""
-        # Reset all tabs
-        self.tab_all.configure(fg_color="transparent", text_color="white")
-        self.tab_recent.configure(fg_color="transparent", text_color="white")
-        self.tab_shared.configure(fg_color="transparent", text_color="white")
-        
-        # Highlight selected tab
-        if tab_name == "all":
-            self.highlight_tab(self.tab_all)
-        elif tab_name == "recent":
-            self.highlight_tab(self.tab_recent)
-        elif tab_name == "shared":
-            self.highlight_tab(self.tab_shared)
+        tabs = {
+            "all": self.tab_all,
+            "recent": self.tab_recent,
+            "shared": self.tab_shared
+        }
+        new_tab = tabs.get(tab_name)
+        if new_tab is None or new_tab is self._active_tab:
+            return
+
+        # Reset the previous tab, highlight selected tab
+        self._active_tab.configure(fg_color="transparent", text_color="white")
+        self.highlight_tab(new_tab)
+        self._active_tab = new_tab
         
         self.refresh_file_list()
     
@@ -583,92 +698,284 @@ class Dashboard:
         tab_button.configure(text_color=self.colors['primary'])
     
     def on_search(self, event):
-        """Handle search input"""
-        search_term = self.search_entry.get().lower()
-        self.refresh_file_list(search_term)
+        """Handle search input (debounced: refresh once typing pauses)"""
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent.after(200, self._run_search)
+
+    def _run_search(self):
+        """Apply the current search box text to the file list"""
+        self._search_after_id = None
+        self.refresh_file_list(self.search_entry.get().lower())
     
     def show_settings(self):
         """Show settings dialog"""
         messagebox.showinfo("Settings", "Settings functionality coming soon!")
     
+    def reload_file_list(self):
+        """Drop the cached file list and show a freshly fetched one (refresh button)"""
+        self._files_cache = None
+        self.refresh_file_list(self.search_entry.get().lower())
+
     def refresh_file_list(self, search_term=""):
-        """Refresh the file list display with card layout"""
+        """
+        Refresh the file list display with card layout
+
+        The list is fetched (when not cached) and filtered on a worker thread;
+        the cards are updated once the result is posted back to the Tk thread.
+
+        Args:
+            search_term: Lowercased text the display name must contain
+        """
+        # Update section title
+        filter_names = {
+            "all": "All Files",
+            "documents": "Documents",
+            "images": "Images",
+            "archives": "Archives"
+        }
+        self.section_title.configure(text=filter_names.get(self.current_filter, "All Files"))
+
+        # Supersede any refresh still queued or running
+        self._view_generation += 1
+        generation = self._view_generation
+        if self._view_future is not None:
+            self._view_future.cancel()
+
         try:
-            # Clear current list
-            for widget in self.files_scrollable.winfo_children():
-                widget.destroy()
-            
-            # Get user files
-            files = self.file_handler.get_user_files()
-            
-            # Filter by category
-            if self.current_filter != "all":
-                files = self.filter_files_by_type(files, self.current_filter)
-            
-            # Filter by search term
-            if search_term:
-                files = [f for f in files if search_term in self._get_display_name(f).lower()]
-
-            # Update section title
-            filter_names = {
-                "all": "All Files",
-                "documents": "Documents",
-                "images": "Images",
-                "archives": "Archives"
-            }
-            self.section_title.configure(text=filter_names.get(self.current_filter, "All Files"))
-            
-            if not files:
-                # Empty state
-                empty_frame = ctk.CTkFrame(self.files_scrollable, fg_color="transparent")
-                empty_frame.grid(row=0, column=0, columnspan=3, pady=50)
-                
-                no_files_label = ctk.CTkLabel(
-                    empty_frame,
-                    text="📁 No files found" if search_term else "📁 No files uploaded yet",
-                    font=ctk.CTkFont(size=18, weight="bold"),
-                    text_color="#666666"
-                )
-                no_files_label.pack(pady=10)
-                
-                hint_label = ctk.CTkLabel(
-                    empty_frame,
-                    text="Upload files to get started!" if not search_term else "Try a different search term",
-                    font=ctk.CTkFont(size=13),
-                    text_color="#888888"
-                )
-                hint_label.pack()
-                return
-            
-            # Display files in card grid (3 columns)
-            row = 0
-            col = 0
-            for file_data in files:
-                self.create_file_card(file_data, row, col)
-                col += 1
-                if col >= 3:
-                    col = 0
-                    row += 1
-                
+            future = self._view_executor.submit(
+                self._compute_view, self._files_cache, self.current_filter, search_term
+            )
+        except RuntimeError as e:
+            # Executor already shut down (dashboard destroyed)
+            logger.debug(f"File list refresh skipped: {e}")
+            return
+        future.add_done_callback(lambda fut: self._post_view(fut, generation, search_term))
+        self._view_future = future
+
+    def _compute_view(self, files, filter_type, search_term):
+        """
+        Build the file view off the Tk thread
+
+        Args:
+            files: Cached file list, or None to fetch it
+            filter_type: Category filter ("all", "documents", ...)
+            search_term: Lowercased text the display name must contain
+
+        Returns:
+            tuple: (all files, files to display)
+        """
+        if files is None:
+            files = self._fetch_files()
+        view = files
+
+        # Filter by category
+        if filter_type != "all":
+            view = self.filter_files_by_type(view, filter_type)
+
+        # Filter by search term
+        if search_term:
+            view = [f for f in view if search_term in f['_name_lower']]
+
+        return files, view
+
+    def _post_view(self, future, generation, search_term):
+        """Done-callback of a view computation (worker thread): hand the result to the Tk thread"""
+        if future.cancelled() or generation != self._view_generation:
+            return
+        try:
+            self.parent.after(0, self._apply_view, future, generation, search_term)
+        except RuntimeError:
+            pass  # Tk main loop already gone
+
+    def _apply_view(self, future, generation, search_term):
+        """Show a computed file view unless a newer refresh superseded it"""
+        if generation != self._view_generation:
+            return
+        try:
+            files, view = future.result()
+            if self._files_cache is None:
+                self._files_cache = files
+
+            # Unmap the grid while cards are rearranged so the scroll area is laid out
+            # (and its scroll region recomputed) once when it is shown again
+            self.files_scrollable.pack_forget()
+            try:
+                self._layout_file_cards(view, search_term)
+            finally:
+                self.files_scrollable.pack(fill="both", expand=True)
+
         except Exception as e:
             logger.error(f"Failed to refresh file list: {e}")
     
+    def _layout_file_cards(self, files, search_term):
+        """Show the empty state, or the cards for the rows currently in view"""
+        self._view_files = files
+        self._rendered_window = None
+
+        if not files:
+            for card in self._card_pool:
+                self._hide_card(card)
+            for spacer in (self._top_spacer, self._bottom_spacer):
+                if spacer is not None:
+                    spacer.grid_remove()
+            self.show_empty_state(search_term)
+            return
+
+        if self._empty_state is not None:
+            self._empty_state['frame'].grid_remove()
+
+        self._render_visible_cards()
+
+    def _on_files_yscroll(self, first, last):
+        """yscrollcommand of the file canvas: move the scrollbar, then schedule a re-render"""
+        self.files_scrollable._scrollbar.set(first, last)
+        if self._render_after_id is None and self._view_files:
+            self._render_after_id = self.parent.after_idle(self._render_visible_cards)
+
+    def _render_visible_cards(self):
+        """Point pooled cards at the files in (and just around) the viewport"""
+        self._render_after_id = None
+        files = self._view_files
+        if not files:
+            return
+
+        canvas = self.files_scrollable._parent_canvas
+        row_height = self._measure_card_row_height()
+        total_rows = -(-len(files) // _GRID_COLUMNS)
+        view_top = max(0, int(canvas.canvasy(0)))
+        view_height = max(canvas.winfo_height(), row_height)
+
+        first_row = max(0, view_top // row_height - _CARD_BUFFER_ROWS)
+        last_row = min(total_rows, (view_top + view_height) // row_height + 1 + _CARD_BUFFER_ROWS)
+        first_row = min(first_row, last_row)
+
+        window = (id(files), first_row, last_row, row_height)
+        if window == self._rendered_window:
+            return
+        self._rendered_window = window
+
+        # Grid row 0 holds the top spacer; rendered card rows start at grid row 1
+        self._set_spacer('_top_spacer', 0, first_row * row_height)
+        if self._card_row_height is not None:
+            self._size_card_rows(last_row - first_row, row_height)
+        wanted = files[first_row * _GRID_COLUMNS:last_row * _GRID_COLUMNS]
+
+        # A file that already has a card keeps it (filter/tab switches then only move cards);
+        # cards showing files outside the window are repointed, extra ones are hidden
+        wanted_ids = {id(f) for f in wanted}
+        by_file = {id(card['file']): card for card in self._card_pool if card['file'] is not None}
+        spare = [card for card in self._card_pool
+                 if card['file'] is None or id(card['file']) not in wanted_ids]
+        spare.reverse()
+        for slot, file_data in enumerate(wanted):
+            row, col = divmod(slot, _GRID_COLUMNS)
+            card = by_file.get(id(file_data)) or (spare.pop() if spare else None)
+            if card is None:
+                self._card_pool.append(self.create_file_card(file_data, row + 1, col))
+            else:
+                self.update_file_card(card, file_data, row + 1, col)
+
+        # Hide pooled cards that are not needed for this window (kept for reuse)
+        for card in spare:
+            self._hide_card(card)
+        self._set_spacer('_bottom_spacer', last_row - first_row + 1, (total_rows - last_row) * row_height)
+
+    def _measure_card_row_height(self):
+        """Height in pixels of one card row (card + padding), measured once the grid is laid out"""
+        if self._card_row_height is None:
+            bbox = self.files_scrollable.grid_bbox(0, 1)
+            if bbox and bbox[3] > 1:
+                self._card_row_height = bbox[3]
+        return self._card_row_height or _DEFAULT_CARD_ROW_HEIGHT
+
+    def _size_card_rows(self, rows, row_height):
+        """Give card grid rows 1..rows a fixed minimum height so Tk need not size each from its cards"""
+        old_rows, old_height = self._sized_rows
+        if (rows, row_height) == (old_rows, old_height):
+            return
+        for r in range(1, rows + 1):
+            if r > old_rows or row_height != old_height:
+                self.files_scrollable.grid_rowconfigure(r, minsize=row_height)
+        # Rows no longer holding cards (e.g. now the bottom spacer) must collapse again
+        for r in range(rows + 1, old_rows + 1):
+            self.files_scrollable.grid_rowconfigure(r, minsize=0)
+        self._sized_rows = (rows, row_height)
+
+    def _set_spacer(self, attr, row, height):
+        """Show an empty full-width frame of the given pixel height at row (hidden when 0)"""
+        spacer = getattr(self, attr)
+        if height <= 0:
+            if spacer is not None:
+                spacer.grid_remove()
+            return
+        if spacer is None:
+            spacer = Frame(self.files_scrollable, width=1, highlightthickness=0, bd=0,
+                           bg=self.files_scrollable._parent_canvas.cget('bg'))
+            setattr(self, attr, spacer)
+        spacer.configure(height=height)
+        spacer.grid(row=row, column=0, columnspan=_GRID_COLUMNS, sticky="ew")
+
+    def _fetch_files(self):
+        """Fetch the user's files with precomputed filter keys (called on the view worker)"""
+        # Give in-flight CRDT mirrors a moment to land so new uploads are listed (only
+        # the CRDT-folder listing depends on them), then get user files
+        self.file_handler.flush_crdt_mirrors(timeout=_MIRROR_FLUSH_TIMEOUT)
+        files = self.file_handler.get_user_files()
+        for f in files:
+            display_lower = self._get_display_name(f).lower()
+            f['_name_lower'] = display_lower
+            # Extension without dot ('' when there is none); shared by the filters and card icons
+            f['_ext'] = os.path.splitext(display_lower)[1][1:]
+            # Cards show this text as-is; format it once per fetch, not per render
+            if 'file_size_formatted' not in f:
+                f['file_size_formatted'] = format_file_size(f.get('file_size') or 0)
+        return files
+
+    def show_empty_state(self, search_term=""):
+        """Show the 'no files' placeholder, building it on first use"""
+        if self._empty_state is None:
+            empty_frame = ctk.CTkFrame(self.files_scrollable, fg_color="transparent")
+
+            no_files_label = ctk.CTkLabel(
+                empty_frame,
+                text="",
+                font=self._fonts['18_bold'],
+                text_color="#666666"
+            )
+            no_files_label.pack(pady=10)
+
+            hint_label = ctk.CTkLabel(
+                empty_frame,
+                text="",
+                font=self._fonts['13'],
+                text_color="#888888"
+            )
+            hint_label.pack()
+            self._empty_state = {'frame': empty_frame, 'title': no_files_label, 'hint': hint_label}
+
+        self._empty_state['title'].configure(
+            text="📁 No files found" if search_term else "📁 No files uploaded yet"
+        )
+        self._empty_state['hint'].configure(
+            text="Upload files to get started!" if not search_term else "Try a different search term"
+        )
+        self._empty_state['frame'].grid(row=0, column=0, columnspan=3, pady=50)
+
     def filter_files_by_type(self, files, filter_type):
         """Filter files by type"""
-        extensions = {
-            "documents": ['.pdf', '.doc', '.docx', '.txt', '.xls', '.xlsx', '.ppt', '.pptx'],
-            "images": ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp'],
-            "archives": ['.zip', '.rar', '.7z', '.tar', '.gz']
-        }
-        
-        if filter_type not in extensions:
+        valid_extensions = _FILTER_EXTS.get(filter_type)
+        if valid_extensions is None:
             return files
-        
-        valid_extensions = extensions[filter_type]
-        return [f for f in files if any(f['original_name'].lower().endswith(ext) for ext in valid_extensions)]
+        return [f for f in files if f['_ext'] in valid_extensions]
     
     def create_file_card(self, file_data, row, col):
-        """Create a file card widget (Adobe CC inspired)"""
+        """
+        Create a file card widget (Adobe CC inspired)
+
+        Returns:
+            dict: Widget handles, so the card can be reused via update_file_card
+        """
         # Card frame
         card_frame = ctk.CTkFrame(
             self.files_scrollable,
@@ -677,87 +984,64 @@ class Dashboard:
             width=280,
             height=180
         )
-        card_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        card_frame.grid_propagate(False)
-        
-        # File icon/preview area
-        icon_frame = ctk.CTkFrame(card_frame, fg_color="#3A3A3A", height=100, corner_radius=8)
-        icon_frame.pack(fill="x", padx=10, pady=(10, 5))
-        icon_frame.pack_propagate(False)
-        
-        # File type icon
-        file_extension = os.path.splitext(self._get_display_name(file_data))[1].lstrip('.').lower()
-        icon_emoji = self.get_file_icon(file_extension)
+        # Children are gridded straight into the card (no wrapper frames): icon row,
+        # name, size, then the action buttons; column 2 takes the spare width
+        card_frame.grid_columnconfigure(2, weight=1)
+        card_frame.grid_rowconfigure(2, weight=1)
         
+        # File type icon on the preview area
         icon_label = ctk.CTkLabel(
-            icon_frame,
-            text=icon_emoji,
-            font=ctk.CTkFont(size=48),
-            text_color="#B0B0B0"
+            card_frame,
+            text="",
+            font=self._fonts['48'],
+            text_color="#B0B0B0",
+            fg_color="#3A3A3A",
+            height=100,
+            corner_radius=8
         )
-        icon_label.place(relx=0.5, rely=0.5, anchor="center")
-        
-        # File info area
-        info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-        info_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        
-        # File name (use display-friendly name and truncate if too long)
-        file_name = self._get_display_name(file_data)
-        if len(file_name) > 28:
-            file_name = file_name[:25] + "..."
+        icon_label.grid(row=0, column=0, columnspan=3, sticky="ew", padx=10, pady=(10, 5))
         
+        # File name
         name_label = ctk.CTkLabel(
-            info_frame,
-            text=file_name,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            card_frame,
+            text="",
+            font=self._fonts['13_bold'],
             text_color="#FFFFFF",
             anchor="w"
         )
-        name_label.pack(anchor="w", pady=(5, 3))
-        
-        # File size - use formatted size if available
-        if 'file_size_formatted' in file_data:
-            size_text = file_data['file_size_formatted']
-        else:
-            size_mb = file_data['file_size'] / (1024 * 1024)
-            size_text = f"{size_mb:.2f} MB" if size_mb >= 0.01 else f"{file_data['file_size'] / 1024:.2f} KB"
+        name_label.grid(row=1, column=0, columnspan=3, sticky="w", padx=10, pady=(10, 3))
         
+        # File size
         size_label = ctk.CTkLabel(
-            info_frame,
-            text=size_text,
-            font=ctk.CTkFont(size=12),
+            card_frame,
+            text="",
+            font=self._fonts['12'],
             text_color="#909090",
             anchor="w"
         )
-        size_label.pack(anchor="w")
-        
-        # Action buttons area
-        actions_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-        actions_frame.pack(fill="x", padx=10, pady=(0, 10))
+        size_label.grid(row=2, column=0, columnspan=3, sticky="nw", padx=10, pady=(0, 5))
         
         # Download button (styled like Adobe CC "Open" button)
         download_btn = ctk.CTkButton(
-            actions_frame,
+            card_frame,
             text="Open",
-            command=lambda f=file_data: self.download_file(f),
             width=110,
             height=34,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self._fonts['13_bold'],
             fg_color="#FFFFFF",
             text_color="#1A1A1A",
             hover_color="#E0E0E0",
             corner_radius=17
         )
-        download_btn.pack(side="left", padx=(0, 8))
+        download_btn.grid(row=3, column=0, sticky="w", padx=(10, 8), pady=(0, 10))
         
         # More options button (three dots)
         more_btn = ctk.CTkButton(
-            actions_frame,
+            card_frame,
             text="⋯",
-            command=lambda f=file_data: self.show_file_options(f),
             width=34,
             height=34,
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self._fonts['20_bold'],
             fg_color="transparent",
             hover_color="#3A3A3A",
             corner_radius=17,
@@ -765,16 +1049,15 @@ class Dashboard:
             border_color="#505050",
             text_color="#B0B0B0"
         )
-        more_btn.pack(side="left", padx=(0, 8))
+        more_btn.grid(row=3, column=1, sticky="w", padx=(0, 8), pady=(0, 10))
         
         # Delete button (icon)
         delete_btn = ctk.CTkButton(
-            actions_frame,
+            card_frame,
             text="🗑️",
-            command=lambda f=file_data: self.delete_file(f),
             width=34,
             height=34,
-            font=ctk.CTkFont(size=16),
+            font=self._fonts['16'],
             fg_color="transparent",
             hover_color="#FF6B6B",
             corner_radius=17,
@@ -782,23 +1065,69 @@ class Dashboard:
             border_color="#505050",
             text_color="#FF6B6B"
         )
-        delete_btn.pack(side="right")
+        delete_btn.grid(row=3, column=2, sticky="e", padx=(0, 10), pady=(0, 10))
+
+        card = {
+            'frame': card_frame,
+            'icon_label': icon_label,
+            'name_label': name_label,
+            'size_label': size_label,
+            'download_btn': download_btn,
+            'more_btn': more_btn,
+            'delete_btn': delete_btn,
+            'file': None,   # file_data currently shown
+            'cell': None,   # (row, col) while gridded
+        }
+
+        # Bound once per card: each click acts on whichever file the card shows at that time
+        download_btn.configure(command=partial(self._on_card_action, card, self.download_file))
+        more_btn.configure(command=partial(self._on_card_action, card, self.show_file_options))
+        delete_btn.configure(command=partial(self._on_card_action, card, self.delete_file))
+
+        self.update_file_card(card, file_data, row, col)
+        return card
+
+    def update_file_card(self, card, file_data, row, col):
+        """Point an existing file card at file_data and place it in the grid"""
+        # Only touch the labels when the card switches to another file
+        if card['file'] is not file_data:
+            display_name = self._get_display_name(file_data)
+
+            # File type icon
+            file_extension = file_data.get('_ext')
+            if file_extension is None:
+                file_extension = os.path.splitext(display_name)[1].lstrip('.').lower()
+            card['icon_label'].configure(text=self.get_file_icon(file_extension))
+
+            # File name (truncate if too long)
+            if len(display_name) > 28:
+                display_name = display_name[:25] + "..."
+            card['name_label'].configure(text=display_name)
+
+            # File size (formatted when the list was fetched)
+            card['size_label'].configure(text=file_data['file_size_formatted'])
+            card['file'] = file_data
+
+        # Only re-grid when the card moves (or was hidden)
+        if card['cell'] != (row, col):
+            card['frame'].grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+            card['cell'] = (row, col)
+
+    def _on_card_action(self, card, action):
+        """Run a card button action on the file the card currently shows"""
+        if card['file'] is not None:
+            action(card['file'])
+
+    def _hide_card(self, card):
+        """Take a pooled card out of the grid, keeping it for reuse"""
+        if card['cell'] is not None:
+            card['frame'].grid_remove()
+            card['cell'] = None
     
     def get_file_icon(self, extension):
         """Get emoji icon for file type"""
-        icons = {
-            'pdf': '📄',
-            'doc': '📝', 'docx': '📝',
-            'xls': '📊', 'xlsx': '📊',
-            'ppt': '📊', 'pptx': '📊',
-            'txt': '📃',
-            'jpg': '🖼️', 'jpeg': '🖼️', 'png': '🖼️', 'gif': '🖼️', 'bmp': '🖼️',
-            'zip': '📦', 'rar': '📦', '7z': '📦', 'tar': '📦', 'gz': '📦',
-            'mp3': '🎵', 'wav': '🎵', 'mp4': '🎬', 'avi': '🎬',
-            'py': '🐍', 'js': '📜', 'html': '🌐', 'css': '🎨',
-        }
-        return icons.get(extension, '📁')
-    
+        return _FILE_ICONS.get(extension, '📁')
+
     def _get_display_name(self, file_data: dict) -> str:
         """Return a human-friendly filename to display (strip encryption suffix if present)."""
         name = None
@@ -817,32 +1146,49 @@ class Dashboard:
         return name
 
     def show_file_options(self, file_data):
-        """Show file options menu"""
+        """Show file options menu (the dialog is built once, then hidden and reshown)"""
+        if self._options_dialog is None:
+            self._options_dialog = self._create_file_options_dialog()
+        dialog = self._options_dialog['window']
+        self._options_file = file_data
+
+        # File name label
+        self._options_dialog['name_label'].configure(text=self._get_display_name(file_data))
+
+        # Center dialog and make modal
+        x = (dialog.winfo_screenwidth() // 2) - 150
+        y = (dialog.winfo_screenheight() // 2) - 100
+        dialog.geometry(f'300x200+{x}+{y}')
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+
+    def _create_file_options_dialog(self):
+        """
+        Build the (initially hidden) file options dialog
+
+        Returns:
+            dict: Dialog window and the widgets reconfigured per file
+        """
         # Create a simple options dialog
         dialog = ctk.CTkToplevel(self.parent)
+        dialog.withdraw()
         dialog.title("File Options")
         dialog.geometry("300x200")
         dialog.resizable(False, False)
+        # Closing the window only hides it for reuse
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_file_options)
         
-        # Make modal
         try:
             dialog.transient(self.parent)
         except:
             pass  # transient may not work with all window types
-        dialog.grab_set()
-        
-        # Center dialog
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - 150
-        y = (dialog.winfo_screenheight() // 2) - 100
-        dialog.geometry(f'300x200+{x}+{y}')
         
         # File name label
-        display_name = self._get_display_name(file_data)
         name_label = ctk.CTkLabel(
             dialog,
-            text=display_name,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            text="",
+            font=self._fonts['14_bold'],
             text_color="white"
         )
         name_label.pack(pady=20)
@@ -851,10 +1197,10 @@ class Dashboard:
         download_opt_btn = ctk.CTkButton(
             dialog,
             text="📥 Download",
-            command=lambda: [self.download_file(file_data), dialog.destroy()],
+            command=self._download_from_options,
             width=200,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color=self.colors['primary'],
             hover_color=self.colors['secondary']
         )
@@ -867,7 +1213,7 @@ class Dashboard:
             command=lambda: messagebox.showinfo("Share", "Share functionality coming soon!"),
             width=200,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="#3A3A3A",
             hover_color="#4A4A4A"
         )
@@ -877,14 +1223,30 @@ class Dashboard:
         close_btn = ctk.CTkButton(
             dialog,
             text="Close",
-            command=dialog.destroy,
+            command=self._hide_file_options,
             width=200,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self._fonts['13'],
             fg_color="transparent",
             hover_color="#3A3A3A"
         )
         close_btn.pack(pady=5)
+
+        return {'window': dialog, 'name_label': name_label}
+
+    def _hide_file_options(self):
+        """Hide the file options dialog, keeping it for the next file"""
+        dialog = self._options_dialog['window']
+        dialog.grab_release()
+        dialog.withdraw()
+        self._options_file = None
+
+    def _download_from_options(self):
+        """Download button of the options dialog"""
+        file_data = self._options_file
+        self._hide_file_options()
+        if file_data is not None:
+            self.download_file(file_data)
     
     def download_file(self, file_data):
         """Download a file"""
@@ -897,29 +1259,38 @@ class Dashboard:
             )
             
             if save_path:
-                # If file comes from CRDT sync folder it may not have a DB id; copy directly from path
-                if not file_data.get('id') and file_data.get('file_path'):
-                    try:
-                        # Use FileHandler to fetch remote file (supports SFTP)
-                        ok, err = self.file_handler.fetch_remote_file(file_data['file_path'], save_path)
-                        if ok:
-                            messagebox.showinfo("Success", "File downloaded successfully!")
-                        else:
-                            logger.error(f"CRDT file fetch failed: {err}")
-                            messagebox.showerror("Error", f"Download failed: {err}")
-                    except Exception as e:
-                        logger.error(f"CRDT file copy failed: {e}")
-                        messagebox.showerror("Error", f"Download failed: {e}")
-                else:
-                    success, message = self.file_handler.download_file(file_data['id'], save_path)
-                    if success:
-                        messagebox.showinfo("Success", "File downloaded successfully!")
-                    else:
-                        messagebox.showerror("Error", f"Download failed: {message}")
+                # Copy off the Tk main thread so large files do not freeze the window
+                threading.Thread(target=self._do_download, args=(file_data, save_path), daemon=True).start()
 
         except Exception as e:
             logger.error(f"Download error: {e}")
             messagebox.showerror("Error", "Failed to download file")
+
+    def _do_download(self, file_data, save_path):
+        """
+        Fetch a file to save_path on a worker thread and report the result on the main thread
+
+        Args:
+            file_data: File record from the dashboard list
+            save_path: Destination chosen by the user
+        """
+        try:
+            # If file comes from CRDT sync folder it may not have a DB id; copy directly from path
+            if not file_data.get('id') and file_data.get('file_path'):
+                # Use FileHandler to fetch remote file (supports SFTP)
+                success, message = self.file_handler.fetch_remote_file(file_data['file_path'], save_path)
+                if not success:
+                    logger.error(f"CRDT file fetch failed: {message}")
+            else:
+                success, message = self.file_handler.download_file(file_data['id'], save_path)
+        except Exception as e:
+            logger.error(f"Download error: {e}")
+            success, message = False, str(e)
+
+        if success:
+            self.parent.after(0, lambda: messagebox.showinfo("Success", "File downloaded successfully!"))
+        else:
+            self.parent.after(0, lambda: messagebox.showerror("Error", f"Download failed: {message}"))
     
     def delete_file(self, file_data):
         """Delete a file"""
@@ -943,6 +1314,7 @@ class Dashboard:
                         # If remote delete failed, inform user
                         logger.error(f"Failed to delete CRDT file: {err}")
                         messagebox.showerror("Error", f"Delete failed: {err}")
+                    self._files_cache = None
                     self.refresh_file_list()
                 except Exception as e:
                     logger.error(f"Failed to delete CRDT file: {e}")
@@ -951,6 +1323,7 @@ class Dashboard:
                 success, message = self.file_handler.delete_file(file_data['id'])
                 if success:
                     messagebox.showinfo("Success", f"'{display_name}' deleted successfully!")
+                    self._files_cache = None
                     self.refresh_file_list()
                 else:
                     messagebox.showerror("Error", f"Delete failed: {message}")
@@ -961,6 +1334,19 @@ class Dashboard:
 
     def destroy(self):
         """Clean up the dashboard"""
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        if self._render_after_id is not None:
+            self.parent.after_cancel(self._render_after_id)
+            self._render_after_id = None
+        # Drop any file view still being computed
+        self._view_generation += 1
+        self._view_executor.shutdown(wait=False, cancel_futures=True)
+        if self._options_dialog is not None:
+            self._options_dialog['window'].destroy()
+            self._options_dialog = None
+        self.file_handler.close_all()
         self.main_frame.destroy()
 
 
@@ -1031,6 +1417,7 @@ class Dashboard:
                 if success:
                     messagebox.showinfo("Saved", "Document uploaded successfully.")
                     win.destroy()
+                    self._files_cache = None
                     self.refresh_file_list()
                 else:
                     messagebox.showerror("Upload failed", str(msg))
@@ -1090,12 +1477,17 @@ class UploadProgressDialog:
             progress_color=colors['primary']
         )
         self.progress_bar.pack(pady=10)
-        self.progress_bar.set(0)
+        if total_files is None:
+            # Total unknown while a folder is still being walked
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.set(0)
         
         # Status label
         self.status_label = ctk.CTkLabel(
             self.dialog,
-            text="0 / " + str(total_files),
+            text="0 / " + str(total_files) if total_files is not None else "0 files",
             font=ctk.CTkFont(size=12),
             text_color=colors['light']
         )
@@ -1103,12 +1495,16 @@ class UploadProgressDialog:
     
     def update_progress(self, current, filename):
         """Update progress display"""
+        self.progress_label.configure(text=f"Uploading: {filename}")
+        if self.total_files is None:
+            self.status_label.configure(text=f"{current} files")
+            return
         progress = current / self.total_files
         self.progress_bar.set(progress)
-        self.progress_label.configure(text=f"Uploading: {filename}")
         self.status_label.configure(text=f"{current} / {self.total_files}")
-        self.dialog.update()
     
     def close(self):
         """Close the progress dialog"""
+        if self.total_files is None:
+            self.progress_bar.stop()
         self.dialog.destroy()
\ No newline at end of file
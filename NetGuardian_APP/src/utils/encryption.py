@@ -4,44 +4,66 @@ Handles file encryption and decryption for secure storage
 """
 
 import os
+import struct
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Streaming AES-GCM file format: magic header, then one record per chunk of
+# 12-byte nonce + 4-byte big-endian ciphertext length + ciphertext (incl. tag).
+# The chunk index and a final-chunk flag are bound as associated data so chunks
+# cannot be reordered, dropped or truncated without failing authentication.
+STREAM_MAGIC = b'NGAEAD1\n'
+STREAM_CHUNK_SIZE = 1024 * 1024
+_NONCE_SIZE = 12
+_RECORD_HEADER = struct.Struct('>12sI')
+
+# PBKDF2-HMAC-SHA256 work factor shared by key derivation and PasswordManager.
+# Stored password hashes do not record it, so changing it invalidates them.
+PBKDF2_ITERATIONS = 100000
+
+# encrypt_data output: 1-byte version tag, 12-byte nonce, AES-GCM ciphertext + tag.
+# Fernet tokens are base64 text (starting with 'gAAAAA'), so the tag byte
+# cannot collide with data encrypted before AES-GCM was introduced.
+DATA_VERSION_AEAD = b'\x01'
+
+
 class FileEncryption:
     def __init__(self, password=None):
         """Initialize encryption with password or default key"""
+        # self.key holds the raw 32-byte key
         if password:
             self.key = self._derive_key_from_password(password)
         else:
             # Use default key for development (in production, use proper key management)
             self.key = self._get_or_create_default_key()
         
+        # Fernet is only needed to read data written before AES-GCM; built on first use
+        self._fernet = None
         try:
-            self.fernet = Fernet(self.key)
+            if len(self.key) != 32:
+                raise ValueError("encryption key must be 32 bytes")
+            # AES-256-GCM (OpenSSL picks AES-NI when present)
+            self.aead = AESGCM(self.key)
         except Exception as e:
             logger.error(f"Failed to initialize encryption: {e}")
             # Fallback to simple XOR encryption
-            self.fernet = None
+            self.aead = None
             self.xor_key = b"NetGuardianDefaultKey2024"
+            self._xor_keystream = None
     
     def _derive_key_from_password(self, password):
         """Derive encryption key from password"""
         try:
             password_bytes = password.encode()
             salt = b'NetGuardianSalt2024'  # In production, use random salt per user
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
-            return key
+            return hashlib.pbkdf2_hmac('sha256', password_bytes, salt, PBKDF2_ITERATIONS)
         except Exception as e:
             logger.error(f"Key derivation failed: {e}")
             return self._get_fallback_key()
@@ -51,58 +73,70 @@ class FileEncryption:
         key_file = "encryption.key"
         
         try:
+            # The file keeps the urlsafe-base64 form (as written by Fernet.generate_key)
             if os.path.exists(key_file):
                 with open(key_file, 'rb') as f:
-                    return f.read()
+                    return base64.urlsafe_b64decode(f.read())
             else:
                 # Generate new key
-                key = Fernet.generate_key()
+                key = os.urandom(32)
                 with open(key_file, 'wb') as f:
-                    f.write(key)
+                    f.write(base64.urlsafe_b64encode(key))
                 logger.info("Generated new encryption key")
                 return key
         except Exception as e:
             logger.error(f"Key file handling failed: {e}")
             return self._get_fallback_key()
     
+    def _legacy_fernet(self):
+        """Fernet for data encrypted before AES-GCM (same key material, base64-encoded)"""
+        if self._fernet is None:
+            self._fernet = Fernet(base64.urlsafe_b64encode(self.key))
+        return self._fernet
+    
     def _get_fallback_key(self):
         """Get fallback key when Fernet is not available"""
         fallback_key = "NetGuardianDefaultEncryptionKey2024!@#"
-        return base64.urlsafe_b64encode(fallback_key.encode()[:32].ljust(32, b'0'))
+        return fallback_key.encode()[:32].ljust(32, b'0')
     
     def encrypt_file(self, input_path, output_path):
         """Encrypt a file"""
         try:
-            with open(input_path, 'rb') as infile:
-                data = infile.read()
-            
-            if self.fernet:
-                encrypted_data = self.fernet.encrypt(data)
+            if self.aead:
+                self._aead_encrypt_file(input_path, output_path)
             else:
                 # Fallback XOR encryption
-                encrypted_data = self._xor_encrypt_decrypt(data)
-            
-            with open(output_path, 'wb') as outfile:
-                outfile.write(encrypted_data)
+                with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+                    self._xor_stream(infile, outfile)
             
             logger.info(f"File encrypted: {input_path} -> {output_path}")
             return True
             
         except Exception as e:
             logger.error(f"File encryption failed: {e}")
+            self._remove_partial(output_path)
             return False
     
     def decrypt_file(self, input_path, output_path):
         """Decrypt a file"""
         try:
             with open(input_path, 'rb') as infile:
-                encrypted_data = infile.read()
+                header = infile.read(len(STREAM_MAGIC))
+                if self.aead and header == STREAM_MAGIC:
+                    self._aead_decrypt_stream(infile, output_path)
+                    logger.info(f"File decrypted: {input_path} -> {output_path}")
+                    return True
+                if not self.aead:
+                    # Fallback XOR decryption
+                    with open(output_path, 'wb') as outfile:
+                        self._xor_stream(infile, outfile, prefix=header)
+                    logger.info(f"File decrypted: {input_path} -> {output_path}")
+                    return True
+                # A Fernet token is authenticated as a whole, so it is read in one piece
+                encrypted_data = header + infile.read()
             
-            if self.fernet:
-                decrypted_data = self.fernet.decrypt(encrypted_data)
-            else:
-                # Fallback XOR decryption
-                decrypted_data = self._xor_encrypt_decrypt(encrypted_data)
+            # Files written before streaming AES-GCM was introduced
+            decrypted_data = self._legacy_fernet().decrypt(encrypted_data)
             
             with open(output_path, 'wb') as outfile:
                 outfile.write(decrypted_data)
@@ -112,7 +146,99 @@ class FileEncryption:
             
         except Exception as e:
             logger.error(f"File decryption failed: {e}")
+            self._remove_partial(output_path)
             return False
+
+    def encrypt_files(self, pairs, max_workers=None):
+        """
+        Encrypt several files concurrently.
+
+        AES-GCM runs in OpenSSL with the GIL released and the AESGCM object is
+        stateless, so one instance serves all worker threads.
+
+        Args:
+            pairs: Iterable of (input_path, output_path)
+            max_workers: Worker threads (default: CPU count)
+
+        Returns:
+            list: encrypt_file result (bool) per pair, in input order
+        """
+        return self._map_files(self.encrypt_file, pairs, max_workers)
+
+    def decrypt_files(self, pairs, max_workers=None):
+        """
+        Decrypt several files concurrently (see encrypt_files).
+
+        Args:
+            pairs: Iterable of (input_path, output_path)
+            max_workers: Worker threads (default: CPU count)
+
+        Returns:
+            list: decrypt_file result (bool) per pair, in input order
+        """
+        return self._map_files(self.decrypt_file, pairs, max_workers)
+
+    @staticmethod
+    def _map_files(func, pairs, max_workers):
+        """Run func(input_path, output_path) for each pair on a thread pool."""
+        pairs = list(pairs)
+        if len(pairs) <= 1:
+            return [func(src, dst) for src, dst in pairs]
+        workers = min(max_workers or os.cpu_count() or 1, len(pairs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crypto") as pool:
+            return list(pool.map(lambda pair: func(*pair), pairs))
+
+    def _aead_encrypt_file(self, input_path, output_path):
+        """Encrypt a file with AES-GCM in fixed-size chunks, reading it once."""
+        with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+            outfile.write(STREAM_MAGIC)
+            index = 0
+            chunk = infile.read(STREAM_CHUNK_SIZE)
+            while True:
+                # Look one chunk ahead so the last record can be flagged as final
+                next_chunk = infile.read(STREAM_CHUNK_SIZE) if chunk else b''
+                is_final = not next_chunk
+                nonce = os.urandom(_NONCE_SIZE)
+                ciphertext = self.aead.encrypt(nonce, chunk, self._chunk_aad(index, is_final))
+                outfile.write(_RECORD_HEADER.pack(nonce, len(ciphertext)))
+                outfile.write(ciphertext)
+                if is_final:
+                    break
+                chunk = next_chunk
+                index += 1
+
+    def _aead_decrypt_stream(self, infile, output_path):
+        """Decrypt AES-GCM chunk records from an open file positioned after the magic."""
+        with open(output_path, 'wb') as outfile:
+            index = 0
+            while True:
+                header = infile.read(_RECORD_HEADER.size)
+                if len(header) != _RECORD_HEADER.size:
+                    raise ValueError("Encrypted file is truncated")
+                nonce, length = _RECORD_HEADER.unpack(header)
+                ciphertext = infile.read(length)
+                if len(ciphertext) != length:
+                    raise ValueError("Encrypted file is truncated")
+                # Peek for a following record to know whether this one must be final
+                is_final = not infile.peek(1)
+                outfile.write(self.aead.decrypt(nonce, ciphertext, self._chunk_aad(index, is_final)))
+                if is_final:
+                    break
+                index += 1
+
+    @staticmethod
+    def _chunk_aad(index, is_final):
+        """Associated data binding a chunk to its position in the stream."""
+        return struct.pack('>Q?', index, is_final)
+
+    @staticmethod
+    def _remove_partial(path):
+        """Remove a partially written output file, ignoring errors."""
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
     
     def encrypt_data(self, data):
         """Encrypt raw data"""
@@ -120,8 +246,9 @@ class FileEncryption:
             if isinstance(data, str):
                 data = data.encode()
             
-            if self.fernet:
-                return self.fernet.encrypt(data)
+            if self.aead:
+                nonce = os.urandom(_NONCE_SIZE)
+                return DATA_VERSION_AEAD + nonce + self.aead.encrypt(nonce, data, None)
             else:
                 return self._xor_encrypt_decrypt(data)
                 
@@ -132,8 +259,13 @@ class FileEncryption:
     def decrypt_data(self, encrypted_data):
         """Decrypt raw data"""
         try:
-            if self.fernet:
-                return self.fernet.decrypt(encrypted_data)
+            if self.aead and encrypted_data[:1] == DATA_VERSION_AEAD:
+                start = len(DATA_VERSION_AEAD)
+                nonce = encrypted_data[start:start + _NONCE_SIZE]
+                return self.aead.decrypt(nonce, encrypted_data[start + _NONCE_SIZE:], None)
+            elif self.aead:
+                # Tokens written before AES-GCM was introduced
+                return self._legacy_fernet().decrypt(encrypted_data)
             else:
                 return self._xor_encrypt_decrypt(encrypted_data)
                 
@@ -144,21 +276,53 @@ class FileEncryption:
     def _xor_encrypt_decrypt(self, data):
         """Simple XOR encryption/decryption fallback"""
         try:
-            result = bytearray()
-            key_len = len(self.xor_key)
-            
-            for i, byte in enumerate(data):
-                result.append(byte ^ self.xor_key[i % key_len])
-            
-            return bytes(result)
+            block = self._xor_block_size()
+            if len(data) <= block:
+                return self._xor_chunk(data)
+            return b''.join(
+                self._xor_chunk(data[pos:pos + block])
+                for pos in range(0, len(data), block)
+            )
             
         except Exception as e:
             logger.error(f"XOR encryption failed: {e}")
             return data
+
+    def _xor_stream(self, infile, outfile, prefix=b''):
+        """XOR fallback over a file in key-aligned blocks (prefix: bytes already read)."""
+        block = self._xor_block_size()
+        chunk = prefix + infile.read(block - len(prefix))
+        while chunk:
+            outfile.write(self._xor_chunk(chunk))
+            chunk = infile.read(block)
+
+    def _xor_block_size(self):
+        """Largest multiple of the XOR key length that fits in STREAM_CHUNK_SIZE."""
+        key_len = len(self.xor_key)
+        return max(key_len, STREAM_CHUNK_SIZE - STREAM_CHUNK_SIZE % key_len)
+
+    def _xor_chunk(self, chunk):
+        """
+        XOR up to one block of bytes that starts on a key boundary of the plaintext.
+
+        The XOR is a single big-integer operation, which CPython runs a machine
+        word at a time. Callers split data into key-aligned blocks, so every block
+        uses the same keystream: it is converted to an integer once per instance and
+        shorter (final) blocks take its leading bytes with a shift.
+        """
+        block = self._xor_block_size()
+        if self._xor_keystream is None:
+            key_len = len(self.xor_key)
+            self._xor_keystream = int.from_bytes(self.xor_key * (block // key_len), 'big')
+        size = len(chunk)
+        keystream = self._xor_keystream
+        if size < block:
+            keystream >>= 8 * (block - size)
+        return (int.from_bytes(chunk, 'big') ^ keystream).to_bytes(size, 'big')
     
     def is_encryption_available(self):
         """Check if strong encryption is available"""
-        return self.fernet is not None
+        return self.aead is not None
 
 
 class PasswordManager:
@@ -168,39 +332,36 @@ class PasswordManager:
     def hash_password(password):
         """Hash a password (fallback implementation)"""
         try:
-            import hashlib
             import secrets
             
             salt = secrets.token_hex(16)
             password_hash = hashlib.pbkdf2_hmac('sha256', 
                                                password.encode(), 
                                                salt.encode(), 
-                                               100000)
+                                               PBKDF2_ITERATIONS)
             return salt + ':' + password_hash.hex()
             
         except Exception as e:
             logger.error(f"Password hashing failed: {e}")
             # Simple fallback
-            import hashlib
             return hashlib.sha256(password.encode()).hexdigest()
     
     @staticmethod
     def verify_password(password, hashed_password):
         """Verify a password against its hash"""
         try:
+            # Digests are compared in constant time so timing does not leak how much matched
             if ':' in hashed_password:
                 # PBKDF2 format
-                import hashlib
                 salt, stored_hash = hashed_password.split(':')
                 password_hash = hashlib.pbkdf2_hmac('sha256',
                                                    password.encode(),
                                                    salt.encode(),
-                                                   100000)
-                return stored_hash == password_hash.hex()
+                                                   PBKDF2_ITERATIONS)
+                return hmac.compare_digest(stored_hash, password_hash.hex())
             else:
                 # Simple SHA256 fallback
-                import hashlib
-                return hashlib.sha256(password.encode()).hexdigest() == hashed_password
+                return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hashed_password)
                 
         except Exception as e:
             logger.error(f"Password verification failed: {e}")
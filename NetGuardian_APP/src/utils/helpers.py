@@ -6,25 +6,41 @@ Common helper functions used across the application
 import os
 import logging
 import hashlib
+import time
 from datetime import datetime
 import json
 
+try:
+    import orjson  # optional: faster JSON parse/serialize for the file helpers
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Default allowed extensions for is_allowed_file_type (built once at import)
+DEFAULT_ALLOWED_EXTENSIONS = frozenset({
+    '.txt', '.doc', '.docx', '.pdf', '.rtf',  # Documents
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',  # Images
+    '.mp3', '.wav', '.m4a', '.flac',  # Audio
+    '.mp4', '.avi', '.mkv', '.mov', '.wmv',  # Video
+    '.zip', '.rar', '.7z', '.tar', '.gz',  # Archives
+    '.xlsx', '.xls', '.csv', '.ppt', '.pptx',  # Office
+    '.py', '.js', '.html', '.css', '.json', '.xml'  # Code
+})
+
+# Characters not allowed in stored filenames, each mapped to '_'
+_FILENAME_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
+
 def format_file_size(size_bytes):
     """Format file size in human readable format"""
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    size_index = 0
-    size = float(size_bytes)
-    
-    while size >= 1024.0 and size_index < len(size_names) - 1:
-        size /= 1024.0
-        size_index += 1
-    
-    return f"{size:.1f} {size_names[size_index]}"
+    # Unit index straight from the bit length (1024 = 2**10 per step), then one division
+    size_index = min(max(int(abs(size_bytes)).bit_length() - 1, 0) // 10, len(_SIZE_NAMES) - 1)
+    return f"{size_bytes / (1 << (10 * size_index)):.1f} {_SIZE_NAMES[size_index]}"
 
 def validate_email(email):
     """Simple email validation"""
@@ -35,10 +51,11 @@ def validate_username(username):
     if not username:
         return False, "Username cannot be empty"
     
-    if len(username) < 3:
+    length = len(username)
+    if length < 3:
         return False, "Username must be at least 3 characters"
     
-    if len(username) > 50:
+    if length > 50:
         return False, "Username must be less than 50 characters"
     
     # Check for valid characters (alphanumeric and underscore)
@@ -52,15 +69,23 @@ def validate_password(password):
     if not password:
         return False, "Password cannot be empty"
     
-    if len(password) < 6:
+    length = len(password)
+    if length < 6:
         return False, "Password must be at least 6 characters"
     
-    if len(password) > 128:
+    if length > 128:
         return False, "Password must be less than 128 characters"
     
-    # Check for at least one letter and one number
-    has_letter = any(c.isalpha() for c in password)
-    has_number = any(c.isdigit() for c in password)
+    # Check for at least one letter and one number in a single pass,
+    # stopping as soon as both have been seen
+    has_letter = has_number = False
+    for c in password:
+        if c.isalpha():
+            has_letter = True
+        elif c.isdigit():
+            has_number = True
+        if has_letter and has_number:
+            break
     
     if not (has_letter and has_number):
         return False, "Password must contain at least one letter and one number"
@@ -75,10 +100,18 @@ def generate_session_token():
 def calculate_file_hash(file_path):
     """Calculate SHA-256 hash of a file"""
     try:
-        sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: large reads into one reused buffer, hashed by OpenSSL
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            sha256_hash = hashlib.sha256()
+            buf = bytearray(1024 * 1024)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                sha256_hash.update(view[:n])
         return sha256_hash.hexdigest()
     except Exception as e:
         logger.error(f"Failed to calculate file hash: {e}")
@@ -86,10 +119,8 @@ def calculate_file_hash(file_path):
 
 def sanitize_filename(filename):
     """Sanitize filename for safe storage"""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    # Remove or replace invalid characters (one pass over the string)
+    filename = filename.translate(_FILENAME_TRANS)
     
     # Limit length
     if len(filename) > 255:
@@ -116,16 +147,7 @@ def get_file_extension(filename):
 def is_allowed_file_type(filename, allowed_extensions=None):
     """Check if file type is allowed"""
     if allowed_extensions is None:
-        # Default allowed extensions
-        allowed_extensions = {
-            '.txt', '.doc', '.docx', '.pdf', '.rtf',  # Documents
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',  # Images
-            '.mp3', '.wav', '.m4a', '.flac',  # Audio
-            '.mp4', '.avi', '.mkv', '.mov', '.wmv',  # Video
-            '.zip', '.rar', '.7z', '.tar', '.gz',  # Archives
-            '.xlsx', '.xls', '.csv', '.ppt', '.pptx',  # Office
-            '.py', '.js', '.html', '.css', '.json', '.xml'  # Code
-        }
+        allowed_extensions = DEFAULT_ALLOWED_EXTENSIONS
     
     file_ext = get_file_extension(filename)
     return file_ext in allowed_extensions
@@ -146,6 +168,10 @@ def format_datetime(dt):
 def load_json_file(file_path):
     """Load JSON data from file"""
     try:
+        if orjson is not None:
+            # orjson parses the raw UTF-8 bytes, no intermediate str
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
@@ -156,6 +182,16 @@ def save_json_file(data, file_path):
     """Save data to JSON file"""
     try:
         ensure_directory_exists(os.path.dirname(file_path))
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # Types orjson does not serialize (e.g. Decimal, ints > 64 bit): use the stdlib
+                payload = None
+            if payload is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(payload)
+                return True
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         return True
@@ -175,7 +211,9 @@ def get_system_info():
     }
 
 class Timer:
-    """Simple timer for performance measurement"""
+    """Simple timer for performance measurement (monotonic, nanosecond counter)"""
+    
+    __slots__ = ('start_time', 'end_time')
     
     def __init__(self):
         self.start_time = None
@@ -183,18 +221,18 @@ class Timer:
     
     def start(self):
         """Start the timer"""
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter_ns()
     
     def stop(self):
         """Stop the timer"""
-        self.end_time = datetime.now()
+        self.end_time = time.perf_counter_ns()
     
     def elapsed(self):
         """Get elapsed time in seconds"""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
-        elif self.start_time:
-            return (datetime.now() - self.start_time).total_seconds()
+        if self.start_time is not None and self.end_time is not None:
+            return (self.end_time - self.start_time) / 1e9
+        elif self.start_time is not None:
+            return (time.perf_counter_ns() - self.start_time) / 1e9
         return 0
 
 def log_function_call(func):